@@ -0,0 +1,24 @@
+from django.contrib import admin
+
+from .models import QueryStat, Task
+
+
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'name', 'status', 'attempts', 'run_at', 'created',)
+    list_filter = ('status', 'name',)
+    search_fields = ('name', 'idempotency_key',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(Task, TaskAdmin)
+
+
+class QueryStatAdmin(admin.ModelAdmin):
+    list_display = ('view', 'fingerprint', 'calls', 'total_time',
+                    'max_time', 'updated',)
+    list_filter = ('view',)
+    search_fields = ('fingerprint',)
+    empty_value_display = '-пусто-'
+
+
+admin.site.register(QueryStat, QueryStatAdmin)
@@ -0,0 +1,28 @@
+import time
+
+from django.core.cache import cache
+
+
+def version_key(scope):
+    return f'version:{scope}'
+
+
+def get_version(scope):
+    # The version of a scope is the time of its last change. Cached data
+    # keyed by it goes stale on its own when the scope is bumped.
+    key = version_key(scope)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time()), None)
+        version = cache.get(key, int(time.time()))
+    return version
+
+
+def bump_version(*scopes):
+    now = int(time.time())
+    versions = {}
+    for scope in scopes:
+        # Two changes within one second must still produce a new version.
+        current = cache.get(version_key(scope)) or 0
+        versions[version_key(scope)] = max(now, current + 1)
+    cache.set_many(versions, None)
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import connections
+
+
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def _sqlite_estimate(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+        "AND name = 'sqlite_stat1'"
+    )
+    if cursor.fetchone() is None:
+        return None
+    # The first number of every index stat is the row count of the table.
+    cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s', [table])
+    counts = [int(stat.split()[0]) for stat, in cursor.fetchall()]
+    return max(counts) if counts else None
+
+
+def _postgresql_estimate(cursor, table):
+    cursor.execute(
+        'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+        [table],
+    )
+    row = cursor.fetchone()
+    return row[0] if row and row[0] >= 0 else None
+
+
+ESTIMATORS = {
+    'sqlite': _sqlite_estimate,
+    'postgresql': _postgresql_estimate,
+}
+
+
+def estimate_count(queryset):
+    # Approximate row count of a whole table from the statistics the
+    # database keeps for its planner (ANALYZE). Filtered querysets and
+    # tables without statistics give None.
+    query = queryset.query
+    if query.where or query.distinct or query.low_mark or query.high_mark:
+        return None
+    connection = connections[queryset.db]
+    estimator = ESTIMATORS.get(connection.vendor)
+    if estimator is None:
+        return None
+    with connection.cursor() as cursor:
+        return estimator(cursor, queryset.model._meta.db_table)
@@ -0,0 +1,71 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$')
+SCRIPT = (
+    'import django\n'
+    'django.setup()\n'
+    'import importlib\n'
+    'for name in {modules!r}:\n'
+    '    importlib.import_module(name)\n'
+)
+
+
+def measure(modules=(), env=None):
+    # Imports Django and the given modules in a fresh interpreter with
+    # -X importtime and returns the raw report from stderr.
+    environment = dict(os.environ, **(env or {}))
+    environment.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+    # Production settings need a key; any value will do for a measurement.
+    environment.setdefault('YATUBE_SECRET_KEY', 'importtime')
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c',
+         SCRIPT.format(modules=list(modules))],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        env=environment,
+        check=True,
+        universal_newlines=True,
+    )
+    return completed.stderr
+
+
+def parse(report):
+    # Cumulative microseconds of every module imported at the top level,
+    # i.e. not on behalf of another module.
+    modules = {}
+    for line in report.splitlines():
+        match = LINE.match(line)
+        if match is None or match.group(3):
+            continue
+        name = match.group(4)
+        modules[name] = modules.get(name, 0) + int(match.group(2))
+    return {'total': sum(modules.values()), 'modules': modules}
+
+
+def regressions(current, baseline, min_us=2000, ratio=1.2):
+    # Modules (and the total) that got slower than the baseline by more
+    # than both the absolute and the relative margin.
+    found = []
+    pairs = [('total', current['total'], baseline.get('total', 0))]
+    pairs += [
+        (name, cumulative, baseline.get('modules', {}).get(name, 0))
+        for name, cumulative in current['modules'].items()
+    ]
+    for name, now, before in pairs:
+        if now - before > min_us and now > before * ratio:
+            found.append((name, before, now))
+    return found
+
+
+def load(path):
+    with open(path, encoding='utf-8') as baseline:
+        return json.load(baseline)
+
+
+def save(path, result):
+    with open(path, 'w', encoding='utf-8') as baseline:
+        json.dump(result, baseline, indent=1, sort_keys=True)
@@ -0,0 +1,161 @@
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    # Messages are written to the outbox table and delivered later by the
+    # core.tasks.deliver_outbox task, so sending never waits on a mail sink.
+    def send_messages(self, email_messages):
+        outgoing = [
+            OutgoingEmail(
+                from_email=message.from_email,
+                recipients=json.dumps(message.recipients()),
+                message=message.message().as_bytes(),
+            )
+            for message in email_messages
+            if message.recipients()
+        ]
+        OutgoingEmail.objects.bulk_create(outgoing)
+        if outgoing:
+            schedule_delivery()
+        return len(outgoing)
+
+
+def schedule_delivery():
+    from .tasks import deliver_outbox
+
+    window = settings.EMAIL_BATCH_WINDOW
+    bucket = int(time.time() // window) if window else uuid.uuid4().hex
+    deliver_outbox.enqueue(
+        idempotency_key=f'deliver_outbox:{bucket}',
+        delay=window,
+    )
+
+
+class _RawMessage:
+    def __init__(self, data):
+        self.data = data
+
+    def as_bytes(self, unixfrom=False, linesep='\n'):
+        lines = self.data.splitlines()
+        return linesep.encode().join(lines) + linesep.encode()
+
+    def get_charset(self):
+        return None
+
+
+class StoredEmailMessage:
+    def __init__(self, outgoing):
+        self.from_email = outgoing.from_email
+        self.encoding = None
+        self._recipients = json.loads(outgoing.recipients)
+        self._data = bytes(outgoing.message)
+
+    def recipients(self):
+        return self._recipients
+
+    def message(self):
+        return _RawMessage(self._data)
+
+
+def ready(now):
+    # Pending messages and messages claimed by a delivery that died.
+    stale = now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    return Q(status=OutgoingEmail.PENDING) | Q(
+        status=OutgoingEmail.SENDING, claimed_at__lt=stale
+    )
+
+
+def sweep_outbox():
+    # The deliver_outbox task of a window may use up its attempts while
+    # messages are still waiting; on a quiet site no new message would
+    # schedule another one, so the worker calls this periodically.
+    if not OutgoingEmail.objects.filter(ready(timezone.now())).exists():
+        return False
+    schedule_delivery()
+    return True
+
+
+def claim(limit, after=0):
+    batch = uuid.uuid4().hex
+    now = timezone.now()
+    ids = list(
+        OutgoingEmail.objects.filter(ready(now), pk__gt=after).order_by('pk')
+        .values_list('pk', flat=True)[:limit]
+    )
+    OutgoingEmail.objects.filter(ready(now), pk__in=ids).update(
+        status=OutgoingEmail.SENDING,
+        batch=batch,
+        claimed_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(OutgoingEmail.objects.filter(
+        pk__in=ids, status=OutgoingEmail.SENDING, batch=batch
+    ).order_by('pk'))
+
+
+def deliver_batch(outgoing, connection):
+    sent, failed = [], []
+    for email in outgoing:
+        try:
+            connection.send_messages([StoredEmailMessage(email)])
+        except Exception:
+            logger.warning('Failed to deliver email #%s', email.pk,
+                           exc_info=True)
+            failed.append(email)
+        else:
+            sent.append(email.pk)
+    OutgoingEmail.objects.filter(pk__in=sent).update(
+        status=OutgoingEmail.SENT, batch='', claimed_at=None
+    )
+    retry = [
+        email.pk for email in failed
+        if email.attempts < settings.EMAIL_MAX_ATTEMPTS
+    ]
+    OutgoingEmail.objects.filter(pk__in=retry).update(
+        status=OutgoingEmail.PENDING, batch='', claimed_at=None
+    )
+    OutgoingEmail.objects.filter(
+        pk__in=[email.pk for email in failed if email.pk not in retry]
+    ).update(status=OutgoingEmail.FAILED, batch='', claimed_at=None)
+    return len(sent), len(failed)
+
+
+def deliver_pending():
+    total_sent = total_failed = last_pk = 0
+    while True:
+        # Messages that fail in this run are retried by the next one.
+        outgoing = claim(settings.EMAIL_BATCH_SIZE, after=last_pk)
+        if not outgoing:
+            break
+        connection = get_connection(settings.EMAIL_DELIVERY_BACKEND)
+        try:
+            with connection:
+                sent, failed = deliver_batch(outgoing, connection)
+        except Exception:
+            # The sink is unreachable: give the batch back and let the task
+            # retry with backoff.
+            OutgoingEmail.objects.filter(
+                pk__in=[email.pk for email in outgoing],
+                status=OutgoingEmail.SENDING,
+            ).update(status=OutgoingEmail.PENDING, batch='', claimed_at=None)
+            raise
+        total_sent += sent
+        total_failed += failed
+        last_pk = outgoing[-1].pk
+    if total_failed:
+        raise RuntimeError(f'{total_failed} emails were not delivered')
+    return total_sent, total_failed
@@ -0,0 +1,129 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+SCHEMA = '''
+    CREATE TABLE post (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        author_id INTEGER NOT NULL,
+        text TEXT NOT NULL,
+        pub_date REAL NOT NULL
+    );
+    CREATE INDEX post_author_idx ON post (author_id, pub_date);
+'''
+READ = 'SELECT * FROM post WHERE author_id = ? ORDER BY pub_date DESC LIMIT 10'
+WRITE = 'INSERT INTO post (author_id, text, pub_date) VALUES (?, ?, ?)'
+AUTHORS = 100
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает конкурентное чтение и запись SQLite с настройками '
+        'по умолчанию и с SQLITE_PRAGMAS и постоянными соединениями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5.0)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=2)
+        parser.add_argument('--rows', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        timeout = settings.DATABASES['default'].get('OPTIONS', {}).get(
+            'timeout', 5
+        )
+        scenarios = (
+            # Before: default journal, a new connection for every request.
+            ('default', {}, 5, False),
+            ('tuned', settings.SQLITE_PRAGMAS, timeout, True),
+        )
+        with tempfile.TemporaryDirectory() as directory:
+            for label, pragmas, scenario_timeout, persistent in scenarios:
+                path = os.path.join(directory, f'{label}.sqlite3')
+                self.prepare(path, pragmas, options['rows'])
+                reads, writes, errors = self.run(
+                    path, pragmas, scenario_timeout, persistent, options
+                )
+                duration = options['duration']
+                self.stdout.write(
+                    f'{label:<8} чтений/с: {reads / duration:>9.0f}  '
+                    f'записей/с: {writes / duration:>8.0f}  '
+                    f'блокировок: {errors}'
+                )
+
+    @staticmethod
+    def connect(path, pragmas, timeout):
+        connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None,
+            check_same_thread=False,
+        )
+        for name, value in pragmas.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def prepare(self, path, pragmas, rows):
+        connection = self.connect(path, pragmas, 5)
+        connection.executescript(SCHEMA)
+        now = time.time()
+        connection.execute('BEGIN')
+        connection.executemany(WRITE, (
+            (number % AUTHORS, f'Пост {number}', now + number)
+            for number in range(rows)
+        ))
+        connection.execute('COMMIT')
+        connection.close()
+
+    def work(self, kind, path, pragmas, timeout, persistent, stop):
+        connection = None
+        done = errors = 0
+        while not stop.is_set():
+            if connection is None:
+                connection = self.connect(path, pragmas, timeout)
+            try:
+                if kind == 'reads':
+                    connection.execute(READ, (done % AUTHORS,)).fetchall()
+                else:
+                    connection.execute(
+                        WRITE, (done % AUTHORS, 'Новый пост', time.time())
+                    )
+                done += 1
+            except sqlite3.OperationalError:
+                errors += 1
+            if not persistent:
+                connection.close()
+                connection = None
+        if connection is not None:
+            connection.close()
+        return done, errors
+
+    def run(self, path, pragmas, timeout, persistent, options):
+        stop = threading.Event()
+        counters = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+
+        def worker(kind):
+            done, errors = self.work(
+                kind, path, pragmas, timeout, persistent, stop
+            )
+            with lock:
+                counters[kind] += done
+                counters['errors'] += errors
+
+        kinds = (
+            ['reads'] * options['readers'] + ['writes'] * options['writers']
+        )
+        threads = [
+            threading.Thread(target=worker, args=(kind,)) for kind in kinds
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(options['duration'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return counters['reads'], counters['writes'], counters['errors']
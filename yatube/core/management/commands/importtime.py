@@ -0,0 +1,62 @@
+import os
+
+from core import importtime
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_MODULES = ['yatube.urls', 'posts.views', 'posts.admin']
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет время импорта при старте процесса через -X importtime '
+        'и сравнивает его с сохранённым базовым замером.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'modules', nargs='*', default=DEFAULT_MODULES,
+            help='Модули, импортируемые после django.setup().',
+        )
+        parser.add_argument(
+            '--baseline',
+            default=os.path.join(settings.BASE_DIR, 'importtime.json'),
+        )
+        parser.add_argument(
+            '--save', action='store_true',
+            help='Сохранить замер как новый базовый.',
+        )
+        parser.add_argument('--top', type=int, default=15)
+        parser.add_argument(
+            '--env', choices=['dev', 'prod'],
+            default=os.environ.get('YATUBE_ENV', 'dev'),
+        )
+
+    def handle(self, *args, **options):
+        result = importtime.parse(importtime.measure(
+            options['modules'], {'YATUBE_ENV': options['env']}
+        ))
+        slowest = sorted(
+            result['modules'].items(), key=lambda item: -item[1]
+        )[:options['top']]
+        for name, cumulative in slowest:
+            self.stdout.write(f'{cumulative / 1000:9.1f} мс  {name}')
+        self.stdout.write(f'Всего: {result["total"] / 1000:.1f} мс')
+        if options['save']:
+            importtime.save(options['baseline'], result)
+            self.stdout.write(self.style.SUCCESS(
+                f'Базовый замер сохранён в {options["baseline"]}'
+            ))
+            return
+        if not os.path.exists(options['baseline']):
+            return
+        found = importtime.regressions(
+            result, importtime.load(options['baseline'])
+        )
+        for name, before, now in found:
+            self.stderr.write(
+                f'{name}: {before / 1000:.1f} мс -> {now / 1000:.1f} мс'
+            )
+        if found:
+            raise CommandError('Время импорта выросло относительно базового')
+        self.stdout.write(self.style.SUCCESS('Регрессий нет'))
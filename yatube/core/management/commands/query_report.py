@@ -0,0 +1,50 @@
+from core.models import QueryStat
+from django.core.management.base import BaseCommand
+from django.db.models import F, FloatField
+from django.db.models.functions import Cast
+
+ORDERINGS = {
+    'total': '-total_time',
+    'max': '-max_time',
+    'calls': '-calls',
+    'avg': '-avg_time',
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает запросы, которые заняли больше всего времени БД, '
+        'по отпечаткам SQL и представлениям.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument(
+            '--order', choices=sorted(ORDERINGS), default='total',
+            help='Порядок: общее, наибольшее, среднее время или вызовы.',
+        )
+        parser.add_argument(
+            '--view', help='Только запросы этого представления.'
+        )
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Удалить собранную статистику после отчёта.',
+        )
+
+    def handle(self, *args, **options):
+        stats = QueryStat.objects.annotate(
+            avg_time=F('total_time') / Cast('calls', FloatField())
+        )
+        if options['view']:
+            stats = stats.filter(view=options['view'])
+        for stat in stats.order_by(ORDERINGS[options['order']])[
+            :options['top']
+        ]:
+            self.stdout.write(
+                f'{stat.total_time:10.1f} ms total  {stat.calls:7d} calls  '
+                f'{stat.avg_time:8.2f} ms avg  {stat.max_time:8.1f} ms max  '
+                f'{stat.view}'
+            )
+            self.stdout.write(f'    {stat.fingerprint}')
+        if options['reset']:
+            stats.delete()
@@ -0,0 +1,26 @@
+from core.warmup import warm_up
+from django.core.management.base import BaseCommand
+from django.core.wsgi import get_wsgi_application
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогревает приложение так же, как при запуске WSGI-сервера, '
+        'и показывает, сколько занял каждый шаг.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--no-requests', action='store_true',
+            help='Не запрашивать страницы из WARMUP_URLS.',
+        )
+
+    def handle(self, *args, **options):
+        application = (
+            None if options['no_requests'] else get_wsgi_application()
+        )
+        results = warm_up(application, self.stdout.write)
+        total = sum(elapsed for _, elapsed, _ in results)
+        self.stdout.write(self.style.SUCCESS(
+            f'Прогрев занял {total * 1000:.1f} мс'
+        ))
@@ -0,0 +1,52 @@
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core import mail, queue
+
+
+class Command(BaseCommand):
+    help = 'Выполняет отложенные задачи из очереди.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threads', type=int, default=4,
+            help='Количество потоков-исполнителей.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=1.0,
+            help='Пауза в секундах, когда очередь пуста.',
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Выполнить задачи, готовые к запуску, и выйти.',
+        )
+
+    def handle(self, *args, **options):
+        worker_id = uuid.uuid4().hex
+        threads = options['threads']
+        self.stdout.write(f'Воркер {worker_id} запущен, потоков: {threads}')
+        last_sweep = None
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            while True:
+                if (
+                    last_sweep is None
+                    or time.monotonic() - last_sweep
+                    >= settings.EMAIL_SWEEP_INTERVAL
+                ):
+                    mail.sweep_outbox()
+                    last_sweep = time.monotonic()
+                tasks = queue.claim(threads, worker_id)
+                if tasks:
+                    results = list(pool.map(queue.run_in_thread, tasks))
+                    self.stdout.write(
+                        f'Выполнено задач: {results.count(True)}, '
+                        f'с ошибкой: {results.count(False)}'
+                    )
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
@@ -0,0 +1,34 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryStat',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=40)),
+                ('view', models.CharField(max_length=200, verbose_name='Представление')),
+                ('fingerprint', models.TextField(verbose_name='Запрос')),
+                ('calls', models.PositiveIntegerField(default=0, verbose_name='Вызовы')),
+                ('total_time', models.FloatField(default=0, verbose_name='Общее время, мс')),
+                ('max_time', models.FloatField(default=0, verbose_name='Наибольшее время, мс')),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Статистика запроса',
+                'verbose_name_plural': 'Статистика запросов',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='querystat',
+            constraint=models.UniqueConstraint(fields=('digest', 'view'), name='unique_query_digest_view'),
+        ),
+    ]
@@ -0,0 +1,108 @@
+from django.db import models
+
+
+class Task(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (RUNNING, 'Выполняется'),
+        (DONE, 'Выполнена'),
+        (FAILED, 'Ошибка'),
+    )
+
+    name = models.CharField('Задача', max_length=200)
+    payload = models.TextField('Аргументы', default='{}')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    max_attempts = models.PositiveSmallIntegerField('Максимум попыток')
+    run_at = models.DateTimeField('Запустить после')
+    idempotency_key = models.CharField(
+        'Ключ идемпотентности',
+        max_length=200,
+        unique=True,
+        blank=True,
+        null=True,
+    )
+    locked_by = models.CharField(max_length=64, blank=True)
+    locked_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('run_at',)
+        indexes = [models.Index(
+            fields=['status', 'run_at'],
+            name='task_status_run_at_idx',
+        )]
+        verbose_name = 'Задача'
+        verbose_name_plural = 'Задачи'
+
+    def __str__(self):
+        return f'{self.name} ({self.status})'
+
+
+class OutgoingEmail(models.Model):
+    PENDING = 'pending'
+    SENDING = 'sending'
+    SENT = 'sent'
+    FAILED = 'failed'
+    STATUS_CHOICES = (
+        (PENDING, 'В очереди'),
+        (SENDING, 'Отправляется'),
+        (SENT, 'Отправлено'),
+        (FAILED, 'Ошибка'),
+    )
+
+    from_email = models.CharField('Отправитель', max_length=254)
+    recipients = models.TextField('Получатели')
+    message = models.BinaryField('Письмо')
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField('Попытки', default=0)
+    batch = models.CharField(max_length=64, blank=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(
+            fields=['status', 'id'],
+            name='email_status_id_idx',
+        )]
+        verbose_name = 'Письмо'
+        verbose_name_plural = 'Письма'
+
+    def __str__(self):
+        return f'{self.from_email} -> {self.recipients} ({self.status})'
+
+
+class QueryStat(models.Model):
+    digest = models.CharField(max_length=40)
+    view = models.CharField('Представление', max_length=200)
+    fingerprint = models.TextField('Запрос')
+    calls = models.PositiveIntegerField('Вызовы', default=0)
+    total_time = models.FloatField('Общее время, мс', default=0)
+    max_time = models.FloatField('Наибольшее время, мс', default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(
+            fields=['digest', 'view'],
+            name='unique_query_digest_view',
+        )]
+        verbose_name = 'Статистика запроса'
+        verbose_name_plural = 'Статистика запросов'
+
+    def __str__(self):
+        return f'{self.view}: {self.fingerprint[:50]}'
@@ -0,0 +1,156 @@
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+
+RATE_KEY = 'profiling:sample_rate'
+# Seconds a worker reuses the rate it read from the shared cache.
+RATE_REFRESH = 10
+SUFFIX = '.collapsed'
+UNSAFE = re.compile(r'[^\w.-]')
+
+_write_lock = threading.Lock()
+_rate = {'value': None, 'read': None}
+
+
+def frame_name(frame):
+    module = frame.f_globals.get('__name__', '?')
+    return f'{module}:{frame.f_code.co_name}'
+
+
+def collapse(frame):
+    # Root first, the way flamegraph.pl and speedscope read folded stacks.
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame).replace(';', ':'))
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+class Sampler:
+    # Looks at the stack of one thread every interval from a helper thread.
+    # The profiled thread runs untouched, so the cost does not depend on how
+    # many functions it calls, unlike cProfile.
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse(frame)] += 1
+            del frame
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+
+def get_sample_rate():
+    # Staff change the rate from the profiling page; the shared cache
+    # carries it to every worker without a restart. Each worker reads it
+    # at most every RATE_REFRESH seconds, not on every request.
+    now = time.monotonic()
+    if _rate['read'] is None or now - _rate['read'] >= RATE_REFRESH:
+        _rate['value'] = cache.get(RATE_KEY)
+        _rate['read'] = now
+    rate = _rate['value']
+    return settings.PROFILING_SAMPLE_RATE if rate is None else rate
+
+
+def set_sample_rate(rate):
+    cache.set(RATE_KEY, rate, None)
+    _rate.update(value=rate, read=time.monotonic())
+
+
+def forget_sample_rate():
+    _rate.update(value=None, read=None)
+
+
+def profile_path(name, root=None):
+    root = root or settings.PROFILING_ROOT
+    return os.path.join(root, UNSAFE.sub('-', name) + SUFFIX)
+
+
+def save_stacks(name, stacks, root=None):
+    # Appends "stack count" lines; read_stacks() sums repeated stacks, so
+    # every process can write to the same file.
+    if not stacks:
+        return
+    path = profile_path(name, root)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lines = ''.join(f'{stack} {count}\n' for stack, count in stacks.items())
+    with _write_lock, open(path, 'a', encoding='utf-8') as target:
+        target.write(lines)
+
+
+def read_stacks(path):
+    stacks = Counter()
+    with open(path, encoding='utf-8') as source:
+        for line in source:
+            stack, _, count = line.rstrip('\n').rpartition(' ')
+            if stack and count.isdigit():
+                stacks[stack] += int(count)
+    return stacks
+
+
+def list_profiles(root=None):
+    root = root or settings.PROFILING_ROOT
+    if not os.path.isdir(root):
+        return []
+    profiles = []
+    for filename in sorted(os.listdir(root)):
+        if filename.endswith(SUFFIX):
+            path = os.path.join(root, filename)
+            profiles.append({
+                'name': filename[:-len(SUFFIX)],
+                'samples': sum(read_stacks(path).values()),
+                'size': os.path.getsize(path),
+            })
+    return profiles
+
+
+def should_profile(request):
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_staff:
+        if request.META.get('HTTP_X_PROFILE'):
+            return True
+    rate = get_sample_rate()
+    return rate > 0 and random.random() < rate
+
+
+class SamplingProfilerMiddleware:
+    # Profiles a request when staff send an X-Profile header, or a random
+    # share of all requests given by the sample rate, and adds its stacks
+    # to the file of the URL name that served it.
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PROFILING_ENABLED or not should_profile(request):
+            return self.get_response(request)
+        sampler = Sampler(
+            threading.get_ident(), settings.PROFILING_INTERVAL
+        ).start()
+        try:
+            return self.get_response(request)
+        finally:
+            stacks = sampler.stop()
+            match = request.resolver_match
+            if match is not None and match.view_name:
+                save_stacks(match.view_name, stacks)
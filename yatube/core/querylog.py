@@ -0,0 +1,183 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connections, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from .models import QueryStat
+
+logger = logging.getLogger(__name__)
+
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+PLACEHOLDER = re.compile(r'%s|\?')
+ROW = r'\(\?(?:\s*,\s*\?)*\)'
+VALUES_LIST = re.compile(ROW + r'(?:\s*,\s*' + ROW + ')*')
+SPACE = re.compile(r'\s+')
+NO_VIEW = '-'
+
+
+def fingerprint(sql):
+    # Literals and placeholders become "?", and IN lists or VALUES rows of
+    # any length collapse, so one ORM call gives one fingerprint.
+    sql = STRING.sub('?', sql)
+    sql = NUMBER.sub('?', sql)
+    sql = PLACEHOLDER.sub('?', sql)
+    sql = VALUES_LIST.sub('(...)', sql)
+    return SPACE.sub(' ', sql).strip()
+
+
+def digest(text):
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def explain(connection, sql, params):
+    prefix = (
+        'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        return '\n'.join(
+            ' '.join(str(column) for column in row)
+            for row in cursor.fetchall()
+        )
+
+
+class QueryStats:
+    # Timings are summed per (fingerprint, view) in memory and added to
+    # QueryStat rows in one flush, like the post view counters.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._queries = 0
+        self._last_flush = time.monotonic()
+
+    def record(self, view, sql, duration):
+        text = fingerprint(sql)
+        key = (digest(text), view)
+        with self._lock:
+            calls, total, longest, _ = self._pending.get(key, (0, 0, 0, text))
+            self._pending[key] = (
+                calls + 1, total + duration, max(longest, duration), text
+            )
+            self._queries += 1
+
+    def due(self):
+        return (
+            self._queries >= settings.QUERYLOG_FLUSH_THRESHOLD
+            or time.monotonic() - self._last_flush
+            >= settings.QUERYLOG_FLUSH_INTERVAL
+        )
+
+    def reset(self):
+        with self._lock:
+            self._pending = {}
+            self._queries = 0
+            self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._queries = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            with transaction.atomic():
+                for key, values in sorted(pending.items()):
+                    self._write(key, *values)
+        except DatabaseError:
+            logger.exception('Failed to flush %d query stats', len(pending))
+            return 0
+        return len(pending)
+
+    def _write(self, key, calls, total, longest, text):
+        query_digest, view = key
+        rows = QueryStat.objects.filter(digest=query_digest, view=view)
+        changes = {
+            'calls': F('calls') + calls,
+            'total_time': F('total_time') + total,
+            'max_time': Greatest(F('max_time'), Value(longest)),
+        }
+        if rows.update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                QueryStat.objects.create(
+                    digest=query_digest, view=view, fingerprint=text,
+                    calls=calls, total_time=total, max_time=longest,
+                )
+        except IntegrityError:
+            # Another worker created the row in the meantime.
+            rows.update(**changes)
+
+
+class QueryLogger:
+    # Execute wrapper for the queries of one request. Time is measured in
+    # milliseconds; statements slower than QUERYLOG_SLOW_MS are logged
+    # with their plan.
+    def __init__(self, request, stats):
+        self.request = request
+        self.stats = stats
+        self._explaining = False
+
+    def view_name(self):
+        match = self.request.resolver_match
+        return match.view_name if match is not None else NO_VIEW
+
+    def __call__(self, execute, sql, params, many, context):
+        if self._explaining:
+            return execute(sql, params, many, context)
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        duration = (time.perf_counter() - started) * 1000
+        self.stats.record(self.view_name(), sql, duration)
+        if duration >= settings.QUERYLOG_SLOW_MS:
+            self.log_slow(context['connection'], sql, params, many, duration)
+        return result
+
+    def log_slow(self, connection, sql, params, many, duration):
+        plan = ''
+        if not many and sql.lstrip()[:6].upper() == 'SELECT':
+            self._explaining = True
+            try:
+                plan = explain(connection, sql, params)
+            except DatabaseError:
+                plan = '(no plan)'
+            finally:
+                self._explaining = False
+        logger.warning(
+            'Slow query in %s: %.1f ms\n%s\n%s',
+            self.view_name(), duration, sql, plan,
+        )
+
+
+class QueryLogMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.QUERYLOG_ENABLED:
+            return self.get_response(request)
+        query_logger = QueryLogger(request, query_stats)
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(
+                    connections[alias].execute_wrapper(query_logger)
+                )
+            response = self.get_response(request)
+        # Written after the wrapper is removed, so the flush is not logged.
+        if query_stats.due():
+            query_stats.flush()
+        return response
+
+
+# Unlike view counters, pending stats are not flushed at exit: losing one
+# interval of timings is fine, and test runs must not write them anywhere.
+query_stats = QueryStats()
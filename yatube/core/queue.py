@@ -0,0 +1,118 @@
+import json
+import logging
+import random
+import traceback
+import uuid
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+registry = {}
+
+
+def task(func=None, *, name=None, max_attempts=None):
+    if func is None:
+        return partial(task, name=name, max_attempts=max_attempts)
+    task_name = name or f'{func.__module__}.{func.__name__}'
+    registry[task_name] = func
+    func.task_name = task_name
+    func.max_attempts = max_attempts
+    func.enqueue = partial(enqueue, func)
+    return func
+
+
+def enqueue(func, args=(), kwargs=None, idempotency_key=None, delay=0):
+    if settings.TASKS_ALWAYS_EAGER:
+        func(*args, **(kwargs or {}))
+        return None
+    payload = json.dumps({'args': list(args), 'kwargs': kwargs or {}})
+    fields = {
+        'name': func.task_name,
+        'payload': payload,
+        'max_attempts': func.max_attempts or settings.TASKS_MAX_ATTEMPTS,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+        'idempotency_key': idempotency_key,
+    }
+    if idempotency_key is None:
+        return Task.objects.create(**fields)
+    try:
+        with transaction.atomic():
+            return Task.objects.create(**fields)
+    except IntegrityError:
+        return Task.objects.get(idempotency_key=idempotency_key)
+
+
+def claim(limit, worker_id=None):
+    worker_id = worker_id or uuid.uuid4().hex
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TASKS_LOCK_TIMEOUT)
+    due = Q(status=Task.PENDING, run_at__lte=now) | Q(
+        status=Task.RUNNING, locked_at__lt=stale
+    )
+    ids = list(
+        Task.objects.filter(due).order_by('run_at')
+        .values_list('pk', flat=True)[:limit]
+    )
+    Task.objects.filter(due, pk__in=ids).update(
+        status=Task.RUNNING,
+        locked_by=worker_id,
+        locked_at=now,
+        attempts=F('attempts') + 1,
+    )
+    return list(Task.objects.filter(
+        pk__in=ids, status=Task.RUNNING, locked_by=worker_id
+    ))
+
+
+def backoff(attempts):
+    delay = settings.TASKS_RETRY_BACKOFF * 2 ** (attempts - 1)
+    return min(delay, settings.TASKS_RETRY_BACKOFF_MAX) * random.uniform(
+        0.8, 1.2
+    )
+
+
+def run(task_obj):
+    func = registry.get(task_obj.name)
+    try:
+        if func is None:
+            raise LookupError(f'Unknown task {task_obj.name}')
+        payload = json.loads(task_obj.payload)
+        func(*payload['args'], **payload['kwargs'])
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning('Task %s #%s failed', task_obj.name, task_obj.pk)
+        retry = task_obj.attempts < task_obj.max_attempts
+        Task.objects.filter(pk=task_obj.pk).update(
+            status=Task.PENDING if retry else Task.FAILED,
+            run_at=timezone.now() + timedelta(
+                seconds=backoff(task_obj.attempts)
+            ),
+            locked_by='',
+            locked_at=None,
+            last_error=error,
+        )
+        return False
+    Task.objects.filter(pk=task_obj.pk).update(
+        status=Task.DONE, locked_by='', locked_at=None, last_error=''
+    )
+    return True
+
+
+def run_in_thread(task_obj):
+    close_old_connections()
+    try:
+        return run(task_obj)
+    finally:
+        close_old_connections()
+
+
+def run_pending(limit=100):
+    return [run(task_obj) for task_obj in claim(limit)]
@@ -0,0 +1,126 @@
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.cache import caches
+from django.shortcuts import render
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def parse_rate(rate):
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period]
+
+
+def refill(state, capacity, per_second, now):
+    tokens, updated = state or (capacity, now)
+    return min(capacity, tokens + (now - updated) * per_second)
+
+
+class LocalBuckets:
+    # Buckets of this process only; the least recently used keys are
+    # dropped once there are more than max_keys of them.
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, capacity, period):
+        now = time.monotonic()
+        with self._lock:
+            tokens = refill(
+                self._buckets.pop(key, None), capacity, capacity / period, now
+            )
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - allowed, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return allowed, (1 - tokens) * period / capacity
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheBuckets:
+    # Buckets in a cache backend, shared by all processes only when the
+    # backend is (the database cache in settings is, LocMemCache is not).
+    # The read and the write are not atomic, so concurrent requests may
+    # occasionally get a token more than the rate allows; that is
+    # acceptable for throttling.
+    def __init__(self, alias='default'):
+        self.alias = alias
+
+    def take(self, key, capacity, period):
+        cache = caches[self.alias]
+        now = time.time()
+        tokens = refill(
+            cache.get(f'ratelimit:{key}'), capacity, capacity / period, now
+        )
+        allowed = tokens >= 1
+        cache.set(f'ratelimit:{key}', (tokens - allowed, now), period)
+        return allowed, (1 - tokens) * period / capacity
+
+    def clear(self):
+        pass
+
+
+BACKENDS = {
+    'local': LocalBuckets(),
+    'cache': CacheBuckets(),
+}
+
+
+def client_ip(request):
+    if settings.RATELIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded:
+            return forwarded.split(',')[0].strip()
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def request_key(request):
+    # Signed-in users are limited per account, everybody else per address.
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return f'user:{user.pk}'
+    return f'ip:{client_ip(request)}'
+
+
+def is_limited(request, scope):
+    rate = settings.RATE_LIMITS.get(scope)
+    if not settings.RATELIMIT_ENABLED or rate is None:
+        return False, 0
+    capacity, period = parse_rate(rate)
+    backend = BACKENDS[settings.RATELIMIT_BACKEND]
+    allowed, retry_after = backend.take(
+        f'{scope}:{request_key(request)}', capacity, period
+    )
+    return not allowed, retry_after
+
+
+def too_many_requests(request, retry_after):
+    response = render(
+        request, 'core/429.html', status=HTTPStatus.TOO_MANY_REQUESTS
+    )
+    response['Retry-After'] = str(max(1, round(retry_after)))
+    return response
+
+
+def ratelimit(scope, methods=('POST',)):
+    # Limits the view with the rate configured in RATE_LIMITS[scope].
+    # Only the listed methods spend tokens, so forms can still be shown.
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method in methods:
+                limited, retry_after = is_limited(request, scope)
+                if limited:
+                    return too_many_requests(request, retry_after)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
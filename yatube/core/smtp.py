@@ -0,0 +1,75 @@
+import socketserver
+import threading
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, code, text):
+        self.wfile.write(f'{code} {text}\r\n'.encode())
+
+    def read_data(self):
+        lines = []
+        for line in self.rfile:
+            if line in (b'.\r\n', b'.\n'):
+                break
+            if line.startswith(b'..'):
+                line = line[1:]
+            lines.append(line)
+        return b''.join(lines)
+
+    def handle(self):
+        self.server.connections += 1
+        self.reply(220, 'localhost SMTP sink')
+        envelope = {'from': None, 'to': []}
+        for line in self.rfile:
+            command, _, argument = line.decode().strip().partition(' ')
+            command = command.upper()
+            if command in ('HELO', 'EHLO', 'NOOP'):
+                self.reply(250, 'localhost')
+            elif command == 'RSET':
+                envelope = {'from': None, 'to': []}
+                self.reply(250, 'OK')
+            elif command == 'MAIL':
+                envelope = {'from': argument[5:].strip('<>'), 'to': []}
+                self.reply(250, 'OK')
+            elif command == 'RCPT':
+                envelope['to'].append(argument[3:].strip('<>'))
+                self.reply(250, 'OK')
+            elif command == 'DATA':
+                self.reply(354, 'End data with <CR><LF>.<CR><LF>')
+                self.server.messages.append(
+                    dict(envelope, data=self.read_data())
+                )
+                self.reply(250, 'OK')
+            elif command == 'QUIT':
+                self.reply(221, 'Bye')
+                return
+            else:
+                self.reply(502, 'Command not implemented')
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    # A minimal in-process SMTP sink that records every message it receives.
+    # It stands in for a real mail server in tests and local runs.
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, host='127.0.0.1', port=0):
+        super().__init__((host, port), _SMTPHandler)
+        self.messages = []
+        self.connections = 0
+        self._thread = None
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
@@ -0,0 +1,163 @@
+import gzip
+import io
+import mimetypes
+import os
+import re
+from wsgiref.util import FileWrapper
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.utils.http import http_date, parse_http_date
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (
+    '.css', '.js', '.map', '.svg', '.json', '.txt', '.html', '.xml', '.ico',
+)
+MIN_COMPRESS_SIZE = 256
+HASHED_NAME = re.compile(r'\.[0-9a-f]{12}\.[^/.]+$')
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, max-age=60'
+CHUNK_SIZE = 64 * 1024
+
+
+def gzip_bytes(data):
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=9,
+                       mtime=0) as archive:
+        archive.write(data)
+    return buffer.getvalue()
+
+
+def precompress(path):
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+    with open(path, 'rb') as source:
+        data = source.read()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return []
+    variants = [('.gz', gzip_bytes)]
+    if brotli is not None:
+        variants.append(('.br', brotli.compress))
+    written = []
+    for suffix, compress in variants:
+        compressed = compress(data)
+        if len(compressed) >= len(data) * 0.95:
+            continue
+        with open(path + suffix, 'wb') as target:
+            target.write(compressed)
+        written.append(path + suffix)
+    return written
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    # Writes .gz (and .br when brotli is installed) next to every hashed
+    # file so the web server never compresses static files per request.
+    def post_process(self, paths, dry_run=False, **options):
+        hashed_names = set()
+        for name, hashed_name, processed in super().post_process(
+            paths, dry_run, **options
+        ):
+            if hashed_name and not isinstance(processed, Exception):
+                hashed_names.add(hashed_name)
+            yield name, hashed_name, processed
+        if dry_run:
+            return
+        for hashed_name in sorted(hashed_names):
+            precompress(self.path(hashed_name))
+
+
+def accepts_encoding(header, coding):
+    for item in header.lower().split(','):
+        token, _, params = item.partition(';')
+        if token.strip() not in (coding, '*'):
+            continue
+        params = params.replace(' ', '')
+        if not params.startswith('q='):
+            return True
+        try:
+            return float(params[2:]) > 0
+        except ValueError:
+            return False
+    return False
+
+
+class StaticFilesApplication:
+    # Serves STATIC_ROOT directly from the WSGI server when there is no
+    # reverse proxy in front of it. Precompressed siblings are picked by
+    # Accept-Encoding and sent through wsgi.file_wrapper (sendfile).
+    encodings = (('br', '.br'), ('gzip', '.gz'))
+
+    def __init__(self, application, root=None, prefix=None):
+        self.application = application
+        self.root = os.path.realpath(root or settings.STATIC_ROOT)
+        self.prefix = prefix or settings.STATIC_URL
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if (
+            not path.startswith(self.prefix)
+            or environ.get('REQUEST_METHOD') not in ('GET', 'HEAD')
+        ):
+            return self.application(environ, start_response)
+        file_path = self.find(path[len(self.prefix):])
+        if file_path is None:
+            return self.application(environ, start_response)
+        return self.serve(file_path, environ, start_response)
+
+    def find(self, name):
+        file_path = os.path.realpath(os.path.join(self.root, name))
+        if not file_path.startswith(self.root + os.sep):
+            return None
+        if not os.path.isfile(file_path):
+            return None
+        return file_path
+
+    def serve(self, file_path, environ, start_response):
+        content_type, _ = mimetypes.guess_type(file_path)
+        headers = [
+            ('Content-Type', content_type or 'application/octet-stream'),
+            ('Vary', 'Accept-Encoding'),
+            ('Cache-Control', (
+                IMMUTABLE if HASHED_NAME.search(file_path) else REVALIDATE
+            )),
+        ]
+        accept = environ.get('HTTP_ACCEPT_ENCODING', '')
+        for coding, suffix in self.encodings:
+            if accepts_encoding(accept, coding) and os.path.isfile(
+                file_path + suffix
+            ):
+                file_path += suffix
+                headers.append(('Content-Encoding', coding))
+                break
+        stat = os.stat(file_path)
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        headers += [
+            ('ETag', etag),
+            ('Last-Modified', http_date(stat.st_mtime)),
+        ]
+        if self.not_modified(environ, etag, stat.st_mtime):
+            start_response('304 Not Modified', headers)
+            return []
+        headers.append(('Content-Length', str(stat.st_size)))
+        start_response('200 OK', headers)
+        if environ['REQUEST_METHOD'] == 'HEAD':
+            return []
+        file_wrapper = environ.get('wsgi.file_wrapper', FileWrapper)
+        return file_wrapper(open(file_path, 'rb'), CHUNK_SIZE)
+
+    @staticmethod
+    def not_modified(environ, etag, mtime):
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')]
+        if_modified_since = environ.get('HTTP_IF_MODIFIED_SINCE')
+        if if_modified_since:
+            try:
+                return int(mtime) <= parse_http_date(if_modified_since)
+            except ValueError:
+                return False
+        return False
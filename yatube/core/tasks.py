@@ -0,0 +1,7 @@
+from .mail import deliver_pending
+from .queue import task
+
+
+@task
+def deliver_outbox():
+    deliver_pending()
@@ -6,3 +6,11 @@ register = template.Library()
 @register.filter
 def addclass(field, css):
     return field.as_widget(attrs={'class': css})
+
+
+@register.filter
+def elided_page_range(page_obj):
+    paginator = page_obj.paginator
+    if not hasattr(paginator, 'get_elided_page_range'):
+        return paginator.page_range
+    return paginator.get_elided_page_range(page_obj.number)
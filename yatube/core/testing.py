@@ -0,0 +1,83 @@
+import hashlib
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+import django
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.migrations.loader import MigrationLoader
+from django.test.runner import DiscoverRunner
+
+
+def migrations_key():
+    # Changes whenever a migration file or Django itself changes, so a
+    # stale snapshot is never restored.
+    digest = hashlib.sha1(django.get_version().encode())
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    for key in sorted(loader.disk_migrations):
+        module = sys.modules[loader.disk_migrations[key].__module__]
+        with open(module.__file__, 'rb') as source:
+            digest.update(source.read())
+    return digest.hexdigest()[:16]
+
+
+def snapshot_path(connection):
+    # Only a single in-memory SQLite test database can be restored.
+    if len(connections.databases) != 1 or connection.vendor != 'sqlite':
+        return None
+    if not connection.creation.is_in_memory_db(
+        connection.creation._get_test_db_name()
+    ):
+        return None
+    return os.path.join(
+        settings.TEST_SNAPSHOT_DIR,
+        f'{connection.alias}-{migrations_key()}.sqlite3',
+    )
+
+
+def save_snapshot(connection, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    connection.ensure_connection()
+    with closing(sqlite3.connect(temporary)) as target:
+        connection.connection.backup(target)
+    os.replace(temporary, path)
+
+
+def restore_snapshot(connection, path):
+    # The same steps as create_test_db() without running the migrations:
+    # the migrated schema is copied into the in-memory database.
+    old_name = connection.settings_dict['NAME']
+    test_name = connection.creation._get_test_db_name()
+    connection.close()
+    settings.DATABASES[connection.alias]['NAME'] = test_name
+    connection.settings_dict['NAME'] = test_name
+    connection.ensure_connection()
+    with closing(sqlite3.connect(path)) as snapshot:
+        snapshot.backup(connection.connection)
+    return old_name
+
+
+class SnapshotTestRunner(DiscoverRunner):
+    # Runs the suite in TEST_PARALLEL worker processes unless --parallel is
+    # given, and restores the migrated test database from a snapshot file
+    # instead of migrating from scratch on every run. Forked workers share
+    # nothing but a copy of that database; each test is rolled back.
+    def __init__(self, parallel=0, **kwargs):
+        super().__init__(parallel=parallel or settings.TEST_PARALLEL, **kwargs)
+
+    def setup_databases(self, **kwargs):
+        connection = connections[DEFAULT_DB_ALIAS]
+        path = snapshot_path(connection)
+        if path is None or self.keepdb:
+            return super().setup_databases(**kwargs)
+        if not os.path.exists(path):
+            old_config = super().setup_databases(**kwargs)
+            save_snapshot(connection, path)
+            return old_config
+        if self.verbosity >= 1:
+            print(f'Restoring test database from {path}...', file=sys.stderr)
+        old_name = restore_snapshot(connection, path)
+        return [(connection, old_name, True)]
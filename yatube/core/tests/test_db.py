@@ -0,0 +1,26 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+
+
+class SQLiteTuningTests(TestCase):
+
+    def test_pragmas_applied_to_connection(self):
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)
+            cursor.execute('PRAGMA cache_size')
+            self.assertEqual(cursor.fetchone()[0], -64 * 1024)
+
+    def test_benchmark_reports_both_configurations(self):
+        out = StringIO()
+        call_command(
+            'bench_sqlite', duration=0.2, readers=1, writers=1, rows=100,
+            stdout=out,
+        )
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[0].startswith('default'))
+        self.assertTrue(lines[1].startswith('tuned'))
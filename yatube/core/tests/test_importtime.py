@@ -0,0 +1,55 @@
+import importlib
+import os
+import sys
+from unittest import mock
+
+from core import importtime
+from django.core.exceptions import ImproperlyConfigured
+from django.test import SimpleTestCase
+
+REPORT = '''import time: self [us] | cumulative | imported package
+import time:       300 |        300 |   _io
+import time:       900 |       5000 | django
+import time:      4100 |       4100 |   django.utils.version
+import time:      2000 |       2000 | posts.views
+'''
+
+
+class ImportTimeTests(SimpleTestCase):
+
+    def test_parse_keeps_top_level_imports(self):
+        self.assertEqual(importtime.parse(REPORT), {
+            'total': 7000,
+            'modules': {'django': 5000, 'posts.views': 2000},
+        })
+
+    def test_regressions_need_absolute_and_relative_growth(self):
+        baseline = importtime.parse(REPORT)
+        current = {
+            'total': 13000,
+            'modules': {'django': 5500, 'posts.views': 7500},
+        }
+        self.assertEqual(importtime.regressions(current, baseline), [
+            ('total', 7000, 13000),
+            ('posts.views', 2000, 7500),
+        ])
+
+    def import_prod(self):
+        sys.modules.pop('yatube.settings.prod', None)
+        return importlib.import_module('yatube.settings.prod')
+
+    def test_production_settings_skip_dev_apps(self):
+        with mock.patch.dict(os.environ, YATUBE_SECRET_KEY='secret'):
+            prod = self.import_prod()
+        self.assertEqual(prod.SECRET_KEY, 'secret')
+        self.assertFalse(prod.DEBUG)
+        self.assertNotIn('debug_toolbar', prod.INSTALLED_APPS)
+        self.assertFalse(any(
+            'debug_toolbar' in middleware for middleware in prod.MIDDLEWARE
+        ))
+
+    def test_production_settings_require_secret_key(self):
+        with mock.patch.dict(os.environ):
+            os.environ.pop('YATUBE_SECRET_KEY', None)
+            with self.assertRaises(ImproperlyConfigured):
+                self.import_prod()
@@ -0,0 +1,107 @@
+from core import queue
+from core.mail import sweep_outbox
+from core.models import OutgoingEmail, Task
+from core.smtp import LocalSMTPServer
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Follow
+
+User = get_user_model()
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    EMAIL_DELIVERY_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+    EMAIL_HOST='127.0.0.1',
+    EMAIL_BATCH_SIZE=2,
+    EMAIL_BATCH_WINDOW=0,
+    TASKS_ALWAYS_EAGER=False,
+)
+class QueuedEmailBackendTests(TestCase):
+
+    def test_send_only_writes_outbox(self):
+        sent = mail.send_mail(
+            'Тема', 'Текст', 'from@yatube.test', ['to@yatube.test']
+        )
+        self.assertEqual(sent, 1)
+        outgoing = OutgoingEmail.objects.get()
+        self.assertEqual(outgoing.status, OutgoingEmail.PENDING)
+
+    def test_outbox_is_delivered_in_batches(self):
+        messages = [
+            mail.EmailMessage(
+                f'Тема {number}', 'Текст', 'from@yatube.test',
+                [f'to{number}@yatube.test'],
+            )
+            for number in range(3)
+        ]
+        mail.get_connection().send_messages(messages)
+
+        with LocalSMTPServer() as server:
+            with self.settings(EMAIL_PORT=server.port):
+                queue.run_pending()
+
+        self.assertEqual(len(server.messages), 3)
+        self.assertEqual(server.connections, 2)
+        self.assertEqual(
+            server.messages[0]['to'], ['to0@yatube.test']
+        )
+        self.assertIn('Текст'.encode(), server.messages[0]['data'])
+        self.assertFalse(OutgoingEmail.objects.exclude(
+            status=OutgoingEmail.SENT
+        ).exists())
+
+    def test_unreachable_sink_keeps_messages(self):
+        mail.send_mail(
+            'Тема', 'Текст', 'from@yatube.test', ['to@yatube.test']
+        )
+        with LocalSMTPServer() as server:
+            port = server.port
+        with self.settings(EMAIL_PORT=port):
+            self.assertEqual(queue.run_pending(), [False])
+        self.assertEqual(
+            OutgoingEmail.objects.get().status, OutgoingEmail.PENDING
+        )
+
+    def test_sweep_reschedules_abandoned_messages(self):
+        mail.send_mail(
+            'Тема', 'Текст', 'from@yatube.test', ['to@yatube.test']
+        )
+        # The task of the message's window gave up after its retries.
+        Task.objects.update(status=Task.FAILED)
+        self.assertTrue(sweep_outbox())
+        self.assertTrue(Task.objects.filter(
+            name='core.tasks.deliver_outbox', status=Task.PENDING
+        ).exists())
+        OutgoingEmail.objects.update(status=OutgoingEmail.SENT)
+        self.assertFalse(sweep_outbox())
+
+    def test_password_reset_is_queued(self):
+        User.objects.create_user(
+            username='test_user_mail',
+            email='reset@yatube.test',
+            password='test_password',
+        )
+        response = Client().post(
+            reverse('users:password_reset_form'),
+            {'email': 'reset@yatube.test'},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(OutgoingEmail.objects.count(), 1)
+
+    def test_new_post_notifies_followers(self):
+        author = User.objects.create_user(username='test_author_mail')
+        for number in range(3):
+            follower = User.objects.create_user(
+                username=f'test_follower_mail_{number}',
+                email=f'follower{number}@yatube.test',
+            )
+            Follow.objects.create(user=follower, author=author)
+        client = Client()
+        client.force_login(author)
+        client.post(reverse('posts:post_create'), {'text': 'Новый пост'})
+
+        queue.run_pending()
+        self.assertEqual(OutgoingEmail.objects.count(), 3)
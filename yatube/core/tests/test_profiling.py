@@ -0,0 +1,130 @@
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter
+from unittest import mock
+
+from core import profiling
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+PROFILING_ROOT = tempfile.mkdtemp()
+stop_sampler = profiling.Sampler.stop
+
+
+def busy(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+class SamplerTests(SimpleTestCase):
+
+    def test_sampler_collects_collapsed_stacks(self):
+        sampler = profiling.Sampler(threading.get_ident(), 0.001).start()
+        busy(0.05)
+        stacks = sampler.stop()
+        self.assertTrue(stacks)
+        stack = stacks.most_common(1)[0][0]
+        self.assertTrue(stack.endswith(f'{__name__}:busy'))
+        self.assertIn(f'{__name__}:test_sampler_collects_collapsed_stacks',
+                      stack)
+
+    def test_read_stacks_merges_repeated_stacks(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        profiling.save_stacks('posts:index', {'a;b': 2, 'a;c': 1}, root)
+        profiling.save_stacks('posts:index', {'a;b': 3}, root)
+        path = profiling.profile_path('posts:index', root)
+        self.assertTrue(path.endswith('posts-index.collapsed'))
+        self.assertEqual(
+            profiling.read_stacks(path), {'a;b': 5, 'a;c': 1}
+        )
+
+
+# Test requests are often shorter than one sampling interval.
+@mock.patch.object(
+    profiling.Sampler, 'stop',
+    lambda sampler: stop_sampler(sampler) + Counter({'a;b': 1}),
+)
+@override_settings(
+    PROFILING_ENABLED=True,
+    PROFILING_ROOT=PROFILING_ROOT,
+    PROFILING_SAMPLE_RATE=0,
+)
+class ProfilingMiddlewareTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create(
+            username='test_staff_profiling', is_staff=True
+        )
+        cls.user = User.objects.create(username='test_user_profiling')
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(PROFILING_ROOT, ignore_errors=True)
+        super().tearDownClass()
+
+    def setUp(self):
+        cache.clear()
+        profiling.forget_sample_rate()
+        shutil.rmtree(PROFILING_ROOT, ignore_errors=True)
+        self.staff_client = Client()
+        self.staff_client.force_login(self.staff)
+
+    def profiled_names(self):
+        return [profile['name'] for profile in profiling.list_profiles()]
+
+    def test_staff_header_profiles_request(self):
+        self.staff_client.get(reverse('posts:index'), HTTP_X_PROFILE='1')
+        self.assertEqual(self.profiled_names(), ['posts-index'])
+
+    def test_header_is_ignored_for_other_users(self):
+        client = Client()
+        client.force_login(self.user)
+        client.get(reverse('posts:index'), HTTP_X_PROFILE='1')
+        self.assertEqual(self.profiled_names(), [])
+
+    def test_sample_rate_is_changed_without_restart(self):
+        response = self.staff_client.post(
+            reverse('core:profiles'), {'sample_rate': '1'}
+        )
+        self.assertRedirects(response, reverse('core:profiles'))
+        self.assertEqual(profiling.get_sample_rate(), 1)
+        Client().get(reverse('posts:group_list', args=['missing']))
+        Client().get(reverse('posts:index'))
+        self.assertIn('posts-index', self.profiled_names())
+
+    def test_rate_set_by_another_worker_is_picked_up(self):
+        self.assertEqual(profiling.get_sample_rate(), 0)
+        # Another worker changes the shared rate.
+        cache.set(profiling.RATE_KEY, 0.5, None)
+        self.assertEqual(profiling.get_sample_rate(), 0)
+        later = time.monotonic() + profiling.RATE_REFRESH
+        with mock.patch.object(profiling.time, 'monotonic',
+                               return_value=later):
+            self.assertEqual(profiling.get_sample_rate(), 0.5)
+
+    def test_staff_download_profile(self):
+        profiling.save_stacks('posts:profile', {'a;b': 2})
+        profiling.save_stacks('posts:profile', {'a;b': 1})
+        url = reverse('core:profile_download', args=['posts-profile'])
+        response = self.staff_client.get(url)
+        self.assertEqual(response.content.decode(), 'a;b 3\n')
+        self.assertIn('posts-profile.collapsed',
+                      response['Content-Disposition'])
+        response = Client().get(url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_staff_delete_profile(self):
+        profiling.save_stacks('posts:profile', {'a;b': 2})
+        self.staff_client.post(
+            reverse('core:profile_delete', args=['posts-profile'])
+        )
+        self.assertEqual(self.profiled_names(), [])
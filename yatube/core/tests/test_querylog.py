@@ -0,0 +1,80 @@
+from io import StringIO
+
+from core.models import QueryStat
+from core.querylog import fingerprint, query_stats
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+User = get_user_model()
+
+
+class FingerprintTests(SimpleTestCase):
+
+    def test_literals_and_lists_are_normalized(self):
+        self.assertEqual(
+            fingerprint(
+                'SELECT "id" FROM "posts_post"\n  WHERE "id" IN (%s, %s, %s)'
+                " AND \"text\" = 'it''s' LIMIT 21"
+            ),
+            'SELECT "id" FROM "posts_post" WHERE "id" IN (...) '
+            'AND "text" = ? LIMIT ?',
+        )
+        self.assertEqual(
+            fingerprint('INSERT INTO "t" VALUES (%s, %s), (%s, %s)'),
+            fingerprint('INSERT INTO "t" VALUES (%s, %s)'),
+        )
+
+
+@override_settings(QUERYLOG_ENABLED=True, QUERYLOG_SLOW_MS=10 ** 6)
+class QueryLogTests(TestCase):
+
+    def setUp(self):
+        query_stats.reset()
+        self.addCleanup(query_stats.reset)
+
+    def test_queries_are_aggregated_per_view(self):
+        author = User.objects.create(username='test_user_querylog')
+        for _ in range(2):
+            Client().get(reverse('posts:profile', args=[author.username]))
+        self.assertGreater(query_stats.flush(), 0)
+        stats = QueryStat.objects.filter(view='posts:profile')
+        self.assertTrue(stats.exists())
+        user_query = stats.get(fingerprint__contains='"auth_user"."username"')
+        self.assertEqual(user_query.calls, 2)
+        self.assertGreaterEqual(user_query.total_time, user_query.max_time)
+        self.assertFalse(QueryStat.objects.filter(
+            fingerprint__contains='core_querystat'
+        ).exists())
+
+    def test_flush_adds_to_existing_rows(self):
+        query_stats.record('posts:index', 'SELECT 1', 2.0)
+        query_stats.flush()
+        query_stats.record('posts:index', 'SELECT 2', 5.0)
+        query_stats.flush()
+        stat = QueryStat.objects.get(view='posts:index')
+        self.assertEqual(stat.fingerprint, 'SELECT ?')
+        self.assertEqual(
+            (stat.calls, stat.total_time, stat.max_time), (2, 7.0, 5.0)
+        )
+
+    @override_settings(QUERYLOG_SLOW_MS=0)
+    def test_slow_queries_are_logged_with_plan(self):
+        with self.assertLogs('core.querylog', 'WARNING') as logs:
+            Client().get(reverse('posts:index'))
+        self.assertIn('Slow query in posts:index', logs.output[0])
+        self.assertTrue(
+            any('SCAN' in line or 'SEARCH' in line for line in logs.output)
+        )
+
+    def test_report_command(self):
+        query_stats.record('posts:index', 'SELECT 1', 1.0)
+        query_stats.record('posts:profile', 'SELECT "x"', 9.0)
+        query_stats.flush()
+        out = StringIO()
+        call_command('query_report', '--top', '1', stdout=out)
+        self.assertIn('posts:profile', out.getvalue())
+        self.assertNotIn('posts:index', out.getvalue())
+        call_command('query_report', '--reset', stdout=StringIO())
+        self.assertFalse(QueryStat.objects.exists())
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+from core import queue
+from core.models import Task
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+calls = []
+
+
+@queue.task(name='tests.remember')
+def remember(value):
+    calls.append(value)
+
+
+@queue.task(name='tests.explode', max_attempts=2)
+def explode():
+    raise RuntimeError('Тестовая ошибка')
+
+
+@override_settings(TASKS_ALWAYS_EAGER=False)
+class TaskQueueTests(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_task_runs_from_queue(self):
+        remember.enqueue(args=['значение'])
+        self.assertEqual(calls, [])
+
+        self.assertEqual(queue.run_pending(), [True])
+        self.assertEqual(calls, ['значение'])
+        self.assertEqual(Task.objects.get().status, Task.DONE)
+
+    def test_idempotency_key_deduplicates(self):
+        first = remember.enqueue(args=[1], idempotency_key='remember:1')
+        second = remember.enqueue(args=[1], idempotency_key='remember:1')
+        self.assertEqual(first.pk, second.pk)
+
+        queue.run_pending()
+        self.assertEqual(calls, [1])
+
+    def test_delayed_task_waits(self):
+        remember.enqueue(args=[1], delay=60)
+        self.assertEqual(queue.run_pending(), [])
+
+    def test_failed_task_retries_with_backoff(self):
+        explode.enqueue()
+        self.assertEqual(queue.run_pending(), [False])
+        task = Task.objects.get()
+        self.assertEqual(task.status, Task.PENDING)
+        self.assertGreater(task.run_at, timezone.now())
+        self.assertIn('Тестовая ошибка', task.last_error)
+
+        Task.objects.update(run_at=timezone.now())
+        self.assertEqual(queue.run_pending(), [False])
+        self.assertEqual(Task.objects.get().status, Task.FAILED)
+
+    def test_stale_running_task_is_reclaimed(self):
+        remember.enqueue(args=[1])
+        Task.objects.update(
+            status=Task.RUNNING,
+            locked_by='dead-worker',
+            locked_at=timezone.now() - timedelta(hours=1),
+        )
+        self.assertEqual(queue.run_pending(), [True])
+
+    @override_settings(TASKS_ALWAYS_EAGER=True)
+    def test_eager_mode_runs_inline(self):
+        remember.enqueue(args=[1])
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
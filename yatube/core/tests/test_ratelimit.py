@@ -0,0 +1,71 @@
+from unittest import mock
+
+from core.ratelimit import BACKENDS, is_limited
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(
+    RATELIMIT_ENABLED=True,
+    RATE_LIMITS={'post_create': '2/m', 'signup': '1/h', 'test': '2/s'},
+)
+class RateLimitTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        BACKENDS['local'].clear()
+
+    def anonymous_request(self, address='10.0.0.1'):
+        request = RequestFactory().post('/', REMOTE_ADDR=address)
+        request.user = AnonymousUser()
+        return request
+
+    def test_post_create_is_limited_per_user(self):
+        author = User.objects.create(username='test_user_ratelimit')
+        client = Client()
+        client.force_login(author)
+        url = reverse('posts:post_create')
+        for number in range(2):
+            response = client.post(url, {'text': f'Пост {number}'})
+            self.assertEqual(response.status_code, 302)
+        response = client.post(url, {'text': 'Лишний пост'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(Post.objects.count(), 2)
+
+        other = Client()
+        other.force_login(User.objects.create(username='test_other_rl'))
+        response = other.post(url, {'text': 'Пост другого автора'})
+        self.assertEqual(response.status_code, 302)
+
+    def test_signup_is_limited_per_address_for_posts_only(self):
+        url = reverse('users:signup')
+        client = Client()
+        client.post(url, {})
+        self.assertEqual(client.post(url, {}).status_code, 429)
+        self.assertEqual(client.get(url).status_code, 200)
+
+    def test_buckets_refill_over_time(self):
+        for backend in ('local', 'cache'):
+            with self.subTest(backend=backend), self.settings(
+                RATELIMIT_BACKEND=backend
+            ), mock.patch('core.ratelimit.time') as clock:
+                clock.monotonic.return_value = clock.time.return_value = 100
+                request = self.anonymous_request()
+                results = [is_limited(request, 'test')[0] for _ in range(3)]
+                self.assertEqual(results, [False, False, True])
+                clock.monotonic.return_value = clock.time.return_value = 101
+                self.assertFalse(is_limited(request, 'test')[0])
+                self.assertFalse(
+                    is_limited(self.anonymous_request('10.0.0.2'), 'test')[0]
+                )
+
+    def test_check_runs_no_queries(self):
+        with self.assertNumQueries(0):
+            is_limited(self.anonymous_request(), 'test')
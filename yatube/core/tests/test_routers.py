@@ -0,0 +1,79 @@
+from unittest import mock
+
+from django.core.cache.backends.db import BaseDatabaseCache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from posts.models import Post
+from yatube import routers
+
+
+@override_settings(DATABASE_REPLICAS=['replica1'])
+class PrimaryReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = routers.PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def run_request(self, view, **cookies):
+        request = self.factory.post('/')
+        request.COOKIES.update(cookies)
+        middleware = routers.ReplicaPinningMiddleware(view)
+        return middleware(request)
+
+    def test_reads_go_to_replica(self):
+        def view(request):
+            self.assertEqual(self.router.db_for_read(Post), 'replica1')
+            return HttpResponse()
+
+        response = self.run_request(view)
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+    def test_write_pins_reads_and_sets_cookie(self):
+        def view(request):
+            self.assertEqual(self.router.db_for_write(Post), 'default')
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+            return HttpResponse()
+
+        response = self.run_request(view)
+        self.assertEqual(
+            response.cookies[routers.PIN_COOKIE]['max-age'], 10
+        )
+        self.assertFalse(routers.is_pinned())
+
+    def test_cookie_pins_following_request(self):
+        def view(request):
+            self.assertEqual(self.router.db_for_read(Post), 'default')
+            return HttpResponse()
+
+        self.run_request(view, **{routers.PIN_COOKIE: '1'})
+
+    def test_cache_table_stays_on_primary_without_pinning(self):
+        entry = BaseDatabaseCache('yatube_cache', {}).cache_model_class
+
+        def view(request):
+            self.assertEqual(self.router.db_for_read(entry), 'default')
+            self.assertEqual(self.router.db_for_write(entry), 'default')
+            self.assertEqual(self.router.db_for_read(Post), 'replica1')
+            return HttpResponse()
+
+        response = self.run_request(view)
+        self.assertNotIn(routers.PIN_COOKIE, response.cookies)
+
+    def test_reads_in_transaction_go_to_primary(self):
+        def view(request):
+            with mock.patch.object(connection, 'in_atomic_block', True):
+                self.assertEqual(self.router.db_for_read(Post), 'default')
+            return HttpResponse()
+
+        self.run_request(view)
+
+    def test_reads_outside_requests_go_to_primary(self):
+        self.assertEqual(self.router.db_for_write(Post), 'default')
+        self.assertFalse(routers.is_pinned())
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_reads_primary(self):
+        self.assertEqual(self.router.db_for_read(Post), 'default')
+        self.assertFalse(self.router.allow_migrate('replica1', 'posts'))
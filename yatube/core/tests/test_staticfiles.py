@@ -0,0 +1,84 @@
+import gzip
+import os
+import shutil
+import tempfile
+
+from core.staticfiles import (CompressedManifestStaticFilesStorage,
+                              StaticFilesApplication, accepts_encoding)
+from django.test import SimpleTestCase
+
+CSS = b'body { color: black; }\n' * 100
+
+
+def fallback(environ, start_response):
+    start_response('404 Not Found', [])
+    return [b'django']
+
+
+class StaticFilesTests(SimpleTestCase):
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        self.storage = CompressedManifestStaticFilesStorage(
+            location=self.root, base_url='/static/'
+        )
+        with open(os.path.join(self.root, 'site.css'), 'wb') as css:
+            css.write(CSS)
+        list(self.storage.post_process({'site.css': (self.storage,
+                                                     'site.css')}))
+        self.hashed_name = self.storage.stored_name('site.css')
+        self.app = StaticFilesApplication(fallback, self.root, '/static/')
+
+    def request(self, path, **environ):
+        response = {}
+
+        def start_response(status, headers):
+            response['status'] = status
+            response['headers'] = dict(headers)
+
+        environ.setdefault('REQUEST_METHOD', 'GET')
+        environ['PATH_INFO'] = path
+        body = b''.join(self.app(environ, start_response))
+        return response['status'], response['headers'], body
+
+    def test_collect_writes_hashed_and_gzipped_files(self):
+        self.assertNotEqual(self.hashed_name, 'site.css')
+        path = self.storage.path(self.hashed_name)
+        with gzip.open(path + '.gz') as compressed:
+            self.assertEqual(compressed.read(), CSS)
+
+    def test_serves_precompressed_file_with_immutable_cache(self):
+        status, headers, body = self.request(
+            f'/static/{self.hashed_name}', HTTP_ACCEPT_ENCODING='gzip, br'
+        )
+        self.assertEqual(status, '200 OK')
+        self.assertEqual(headers['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', headers['Cache-Control'])
+        self.assertEqual(headers['Content-Type'], 'text/css')
+        self.assertEqual(gzip.decompress(body), CSS)
+
+    def test_serves_identity_without_accept_encoding(self):
+        status, headers, body = self.request(f'/static/{self.hashed_name}')
+        self.assertNotIn('Content-Encoding', headers)
+        self.assertEqual(body, CSS)
+
+    def test_conditional_request_returns_not_modified(self):
+        _, headers, _ = self.request(f'/static/{self.hashed_name}')
+        status, _, body = self.request(
+            f'/static/{self.hashed_name}', HTTP_IF_NONE_MATCH=headers['ETag']
+        )
+        self.assertEqual(status, '304 Not Modified')
+        self.assertEqual(body, b'')
+
+    def test_unknown_and_escaping_paths_fall_through(self):
+        for path in ('/static/missing.css', '/static/../secret', '/media/x'):
+            with self.subTest(path=path):
+                status, _, body = self.request(path)
+                self.assertEqual(body, b'django')
+
+    def test_accepts_encoding(self):
+        self.assertTrue(accepts_encoding('gzip, deflate', 'gzip'))
+        self.assertTrue(accepts_encoding('*', 'br'))
+        self.assertFalse(accepts_encoding('gzip;q=0', 'gzip'))
+        self.assertFalse(accepts_encoding('deflate', 'gzip'))
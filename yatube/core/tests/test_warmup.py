@@ -0,0 +1,58 @@
+import importlib
+from unittest import mock
+
+from core import warmup
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.core.wsgi import get_wsgi_application
+from django.test import SimpleTestCase, TestCase, override_settings
+
+
+class WarmupStepsTests(SimpleTestCase):
+
+    def test_every_template_compiles(self):
+        names = list(warmup.template_names())
+        self.assertIn('posts/index.html', names)
+        self.assertIn('includes/paginator.html', names)
+        self.assertEqual(
+            warmup.compile_templates(), f'{len(names)} compiled, 0 failed'
+        )
+
+    def test_every_url_name_resolves(self):
+        self.assertRegex(warmup.resolve_urls(), r'^[1-9]\d* url names$')
+
+
+class PrimeCachesTests(TestCase):
+
+    @override_settings(WARMUP_URLS=['/', '/missing/'])
+    def test_prime_caches_requests_hot_pages(self):
+        cache.clear()
+        result = warmup.prime_caches(get_wsgi_application())
+        self.assertEqual(result, '/ 200, /missing/ 404')
+        self.assertIsNotNone(
+            cache.get(make_template_fragment_key('index_page', [1]))
+        )
+
+
+class WarmupHostTests(SimpleTestCase):
+
+    def test_host_falls_back_to_localhost(self):
+        cases = (
+            ([], 'localhost'),
+            (['*'], 'localhost'),
+            (['*', '.yatube.test'], 'yatube.test'),
+        )
+        for hosts, expected in cases:
+            with self.subTest(hosts=hosts):
+                with self.settings(ALLOWED_HOSTS=hosts):
+                    self.assertEqual(warmup.warmup_host(), expected)
+
+    @override_settings(WARMUP_ON_START=True)
+    def test_failed_warm_up_does_not_stop_the_worker(self):
+        from yatube import wsgi
+
+        with mock.patch.object(
+            warmup, 'warm_up', side_effect=RuntimeError('no tables')
+        ):
+            importlib.reload(wsgi)
+        self.assertIsNotNone(wsgi.application)
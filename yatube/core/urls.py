@@ -0,0 +1,11 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'core'
+
+urlpatterns = [
+    path('', views.profiles, name='profiles'),
+    path('<str:name>/', views.profile_download, name='profile_download'),
+    path('<str:name>/delete/', views.profile_delete, name='profile_delete'),
+]
@@ -1,6 +1,13 @@
+import os
 from http import HTTPStatus
 
-from django.shortcuts import render
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.http import require_POST
+
+from .profiling import (get_sample_rate, list_profiles, profile_path,
+                        read_stacks, set_sample_rate)
 
 
 def page_not_found(request, exception):
@@ -21,3 +28,45 @@ def server_error(request):
         {'path': request.path},
         HTTPStatus.INTERNAL_SERVER_ERROR
     )
+
+
+@staff_member_required
+def profiles(request):
+    if request.method == 'POST':
+        try:
+            rate = float(request.POST.get('sample_rate', ''))
+        except ValueError:
+            rate = None
+        if rate is not None and 0 <= rate <= 1:
+            set_sample_rate(rate)
+            return redirect('core:profiles')
+    return render(request, 'core/profiles.html', {
+        'profiles': list_profiles(),
+        'sample_rate': get_sample_rate(),
+    })
+
+
+@staff_member_required
+def profile_download(request, name):
+    # Repeated stacks from different requests and workers are merged, so
+    # the file goes straight into flamegraph.pl or speedscope.
+    path = profile_path(name)
+    if not os.path.exists(path):
+        raise Http404
+    stacks = read_stacks(path)
+    response = HttpResponse(
+        ''.join(f'{stack} {count}\n' for stack, count in stacks.items()),
+        content_type='text/plain; charset=utf-8',
+    )
+    filename = os.path.basename(path)
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+@staff_member_required
+@require_POST
+def profile_delete(request, name):
+    path = profile_path(name)
+    if os.path.exists(path):
+        os.remove(path)
+    return redirect('core:profiles')
@@ -0,0 +1,144 @@
+import io
+import logging
+import os
+import time
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist, TemplateSyntaxError
+from django.template.loader import get_template
+from django.urls import NoReverseMatch, get_resolver, reverse
+from django.urls.converters import IntConverter
+from django.utils.module_loading import autodiscover_modules
+
+logger = logging.getLogger(__name__)
+
+WARMUP_MODULES = ('models', 'forms', 'views', 'urls', 'admin', 'feeds', 'api')
+URL_NAMESPACES = ('posts', 'users')
+
+
+def import_apps():
+    autodiscover_modules(*WARMUP_MODULES)
+    return f'{len(WARMUP_MODULES)} modules per app'
+
+
+def template_names():
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(('.html', '.txt', '.xml')):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, directory).replace(os.sep, '/')
+
+
+def compile_templates():
+    # With DEBUG off Django keeps compiled templates in the cached loader,
+    # so every later get_template() of these names is a dict lookup.
+    compiled = failed = 0
+    for name in template_names():
+        try:
+            get_template(name)
+        except (TemplateDoesNotExist, TemplateSyntaxError):
+            logger.warning('Template %s failed to compile', name,
+                           exc_info=True)
+            failed += 1
+        else:
+            compiled += 1
+    return f'{compiled} compiled, {failed} failed'
+
+
+def sample_kwargs(pattern):
+    return {
+        name: 1 if isinstance(converter, IntConverter) else 'warmup'
+        for name, converter in pattern.pattern.converters.items()
+    }
+
+
+def resolve_urls():
+    resolver = get_resolver()
+    resolved = 0
+    for namespace in URL_NAMESPACES:
+        _, namespace_resolver = resolver.namespace_dict[namespace]
+        for pattern in namespace_resolver.url_patterns:
+            if not getattr(pattern, 'name', None):
+                continue
+            try:
+                path = reverse(
+                    f'{namespace}:{pattern.name}',
+                    kwargs=sample_kwargs(pattern),
+                )
+            except NoReverseMatch:
+                continue
+            resolver.resolve(path)
+            resolved += 1
+    return f'{resolved} url names'
+
+
+def open_connections():
+    # Checks every database and runs the connection setup (pragmas) once.
+    aliases = list(connections)
+    for alias in aliases:
+        connections[alias].ensure_connection()
+    return f'{len(aliases)} databases'
+
+
+def close_connections():
+    # Connections belong to the warming thread only, and a preforking
+    # server must not share them between workers.
+    for alias in connections:
+        connections[alias].close()
+
+
+def warmup_host():
+    # A host the application accepts. Django allows localhost when
+    # ALLOWED_HOSTS is empty and DEBUG is on.
+    for host in settings.ALLOWED_HOSTS:
+        if host != '*':
+            return host.lstrip('.')
+    return 'localhost'
+
+
+def prime_caches(application):
+    # Requests the hot pages through the whole stack so view, template
+    # fragment and count caches are filled before real traffic arrives.
+    statuses = []
+    for url in settings.WARMUP_URLS:
+        environ = {'PATH_INFO': url, 'wsgi.errors': io.StringIO()}
+        setup_testing_defaults(environ)
+        environ['HTTP_HOST'] = warmup_host()
+        response = {}
+
+        def start_response(status, headers, exc_info=None):
+            response['status'] = status.split()[0]
+
+        body = application(environ, start_response)
+        for _ in body:
+            pass
+        if hasattr(body, 'close'):
+            body.close()
+        statuses.append(f'{url} {response.get("status")}')
+    return ', '.join(statuses)
+
+
+def warm_up(application=None, report=None):
+    steps = [
+        ('import apps', import_apps),
+        ('compile templates', compile_templates),
+        ('resolve urls', resolve_urls),
+        ('open connections', open_connections),
+    ]
+    if application is not None:
+        steps.append(('prime caches', lambda: prime_caches(application)))
+    results = []
+    for name, step in steps:
+        started = time.perf_counter()
+        detail = step()
+        elapsed = time.perf_counter() - started
+        results.append((name, elapsed, detail))
+        message = f'Warm-up: {name} took {elapsed * 1000:.1f} ms ({detail})'
+        logger.info(message)
+        if report is not None:
+            report(message)
+    close_connections()
+    return results
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Comment, Group, Post
+from .models import ArchivedPost, Comment, Group, GroupStats, Post
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -21,6 +21,11 @@ class GroupAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class GroupStatsAdmin(admin.ModelAdmin):
+    list_display = ('group', 'post_count', 'last_post', 'top_authors',)
+    list_select_related = ('group',)
+
+
 class CommentAdmin(admin.ModelAdmin):
     list_display = ('pk', 'author', 'created', 'text', 'post',)
     list_filter = ('created',)
@@ -28,6 +33,15 @@ class CommentAdmin(admin.ModelAdmin):
     empty_value_display = '-пусто-'
 
 
+class ArchivedPostAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'text', 'pub_date', 'author', 'archived_at',)
+    search_fields = ('text',)
+    list_filter = ('pub_date',)
+    empty_value_display = '-пусто-'
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
+admin.site.register(GroupStats, GroupStatsAdmin)
 admin.site.register(Comment, CommentAdmin)
+admin.site.register(ArchivedPost, ArchivedPostAdmin)
@@ -0,0 +1,206 @@
+from functools import wraps
+from http import HTTPStatus
+from operator import attrgetter
+
+from django.conf import settings
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, set_response_etag
+from django.views.decorators.http import require_GET
+
+from .archive import get_post_or_archived
+from .models import Group, User
+from .pagination import ChainedKeysetPaginator, KeysetPaginator
+from .views import (follow_posts_for, group_posts_for, index_posts,
+                    profile_posts_for)
+
+FEED_ORDERING = ('-pub_date', '-id')
+COMMENT_ORDERING = ('-created', '-id')
+COMPACT = {'separators': (',', ':'), 'ensure_ascii': False}
+
+
+def _group(post):
+    return post.group.slug if post.group_id else None
+
+
+def _image(post):
+    return post.image.url if post.image else None
+
+
+# Public field name -> (model fields to load, serializer).
+POST_FIELDS = {
+    'id': (('id',), attrgetter('id')),
+    'text': (('text',), attrgetter('text')),
+    'pub_date': (('pub_date',), attrgetter('pub_date')),
+    'author': (('author', 'author__username'), attrgetter('author.username')),
+    'group': (('group', 'group__slug'), _group),
+    'image': (('image',), _image),
+    'comment_count': (('comment_count',), attrgetter('comment_count')),
+    'view_count': (('view_count',), attrgetter('view_count')),
+}
+RELATED_FIELDS = ('author', 'group')
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def json_response(request, data, status=HTTPStatus.OK):
+    response = JsonResponse(data, status=status, json_dumps_params=COMPACT)
+    if status != HTTPStatus.OK:
+        return response
+    # Clients revalidate with If-None-Match and get an empty 304 back when
+    # the page did not change.
+    set_response_etag(response)
+    response['Cache-Control'] = 'private, no-cache'
+    return get_conditional_response(
+        request, etag=response['ETag'], response=response
+    )
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except BadRequest as error:
+            return json_response(
+                request, {'error': str(error)}, HTTPStatus.BAD_REQUEST
+            )
+    return require_GET(wrapper)
+
+
+def requested_fields(request):
+    value = request.GET.get('fields')
+    if not value:
+        return list(POST_FIELDS)
+    names = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = sorted(set(names) - POST_FIELDS.keys())
+    if unknown:
+        raise BadRequest(f'Unknown fields: {", ".join(unknown)}')
+    return names
+
+
+def page_size(request):
+    try:
+        size = int(request.GET.get('limit', settings.API_PAGE_SIZE))
+    except ValueError:
+        raise BadRequest('limit must be an integer')
+    return max(1, min(size, settings.API_MAX_PAGE_SIZE))
+
+
+def columns_for(names, required=('id',)):
+    columns = set(required)
+    for name in names:
+        columns.update(POST_FIELDS[name][0])
+    return columns
+
+
+def related_for(names):
+    return [name for name in RELATED_FIELDS if name in names]
+
+
+def restrict(queryset, names):
+    # Loads only the columns behind the requested fields; the ordering
+    # columns are always needed to build the next cursor.
+    queryset = queryset.select_related(None)
+    related = related_for(names)
+    if related:
+        queryset = queryset.select_related(*related)
+    # The feed builders defer the full text, and only() keeps deferred
+    # fields deferred, so the deferral is cleared first.
+    return queryset.defer(None).only(
+        *columns_for(names, required=('id', 'pub_date'))
+    )
+
+
+def serialize_post(post, names):
+    return {name: POST_FIELDS[name][1](post) for name in names}
+
+
+def feed_response(request, querysets, extra=None):
+    names = requested_fields(request)
+    paginator = ChainedKeysetPaginator(
+        [restrict(queryset, names) for queryset in querysets],
+        FEED_ORDERING,
+        page_size(request),
+    )
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except ValueError:
+        raise BadRequest('Invalid cursor')
+    data = dict(extra or {})
+    data['results'] = [serialize_post(post, names) for post in page]
+    data['next'] = page.next_cursor
+    return json_response(request, data)
+
+
+@api_view
+def index(request):
+    return feed_response(request, [index_posts()])
+
+
+@api_view
+def group_posts(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return feed_response(
+        request, [group_posts_for(group)], {'group': group.slug}
+    )
+
+
+@api_view
+def profile(request, username):
+    author = get_object_or_404(User, username=username)
+    return feed_response(request, profile_posts_for(author), {
+        'username': author.username,
+        'full_name': author.get_full_name(),
+    })
+
+
+@api_view
+def follow_index(request):
+    if not request.user.is_authenticated:
+        return json_response(
+            request, {'error': 'Authentication required'},
+            HTTPStatus.UNAUTHORIZED,
+        )
+    return feed_response(request, [follow_posts_for(request.user)])
+
+
+@api_view
+def post_detail(request, post_id):
+    names = requested_fields(request)
+    post = get_post_or_archived(
+        post_id, fields=columns_for(names), related=related_for(names),
+        viewer=request.user,
+    )
+    data = serialize_post(post, names)
+    data['archived'] = post.is_archived
+    return json_response(request, data)
+
+
+@api_view
+def post_comments(request, post_id):
+    post = get_post_or_archived(
+        post_id, fields=('id',), related=(), viewer=request.user
+    )
+    comments = post.comments.select_related('author').only(
+        'id', 'text', 'created', 'author', 'author__username'
+    )
+    paginator = KeysetPaginator(comments, COMMENT_ORDERING, page_size(request))
+    try:
+        page = paginator.page(request.GET.get('cursor'))
+    except ValueError:
+        raise BadRequest('Invalid cursor')
+    return json_response(request, {
+        'results': [
+            {
+                'id': comment.id,
+                'author': comment.author.username,
+                'text': comment.text,
+                'created': comment.created,
+            }
+            for comment in page
+        ],
+        'next': page.next_cursor,
+    })
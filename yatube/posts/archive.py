@@ -0,0 +1,103 @@
+from datetime import timedelta
+
+from core.cache import bump_version
+from django.conf import settings
+from django.db import router, transaction
+from django.http import Http404
+from django.utils import timezone
+
+from .counters import refresh_group_stats
+from .models import ArchivedComment, ArchivedPost, Comment, Post
+from .pagination import COUNTS_SCOPE
+from .signals import feed_scopes_for
+from .trending import forget_posts
+
+POST_FIELDS = (
+    'id', 'text', 'pub_date', 'author_id', 'group_id', 'image',
+    'comment_count', 'view_count', 'excerpt', 'text_html', 'word_count',
+)
+COMMENT_FIELDS = ('id', 'post_id', 'author_id', 'text', 'created')
+
+
+def archive_cutoff(days=None):
+    if days is None:
+        days = settings.ARCHIVE_AFTER_DAYS
+    return timezone.now() - timedelta(days=days)
+
+
+def archive_batch(cutoff, batch_size):
+    # Copies the oldest posts and their comments into the archive tables and
+    # removes them from the hot ones in a single transaction.
+    with transaction.atomic():
+        posts = list(
+            Post.objects.published().filter(pub_date__lt=cutoff)
+            .order_by('pub_date', 'id')
+            .values(*POST_FIELDS)[:batch_size]
+        )
+        if not posts:
+            return 0, 0
+        ids = [post['id'] for post in posts]
+        comments = list(
+            Comment.objects.filter(post_id__in=ids).values(*COMMENT_FIELDS)
+        )
+        ArchivedPost.objects.bulk_create(
+            [ArchivedPost(**post) for post in posts]
+        )
+        ArchivedComment.objects.bulk_create(
+            [ArchivedComment(**comment) for comment in comments]
+        )
+        # Raw deletes: delete() would load every comment and send the
+        # comment and post signals row by row. The versions are bumped once
+        # per batch below, and archive_posts() refreshes the group stats.
+        Comment.objects.filter(post_id__in=ids)._raw_delete(
+            router.db_for_write(Comment)
+        )
+        Post.objects.filter(id__in=ids)._raw_delete(router.db_for_write(Post))
+    scopes = {COUNTS_SCOPE}
+    for post in posts:
+        scopes.update(feed_scopes_for(post['author_id'], post['group_id']))
+    bump_version(*scopes)
+    forget_posts([(post['id'], post['group_id']) for post in posts])
+    return len(posts), len(comments)
+
+
+def archive_posts(cutoff=None, batch_size=None, report=None):
+    cutoff = cutoff or archive_cutoff()
+    batch_size = batch_size or settings.ARCHIVE_BATCH_SIZE
+    total_posts = total_comments = 0
+    while True:
+        posts, comments = archive_batch(cutoff, batch_size)
+        if not posts:
+            break
+        total_posts += posts
+        total_comments += comments
+        if report is not None:
+            report(
+                f'В архиве постов: {total_posts}, '
+                f'комментариев: {total_comments}'
+            )
+    if total_posts:
+        # The raw deletes skipped the signals; the stats are rebuilt once.
+        refresh_group_stats()
+    return total_posts, total_comments
+
+
+def get_post_or_archived(post_id, fields=None, related=('author', 'group'),
+                         viewer=None):
+    # Hot table first: archived posts are rarely requested. Unpublished
+    # posts are found only for their author.
+    for model in (Post, ArchivedPost):
+        posts = model.objects.all()
+        if model is Post:
+            posts = (
+                posts.published() if viewer is None
+                else posts.visible_to(viewer)
+            )
+        if related:
+            posts = posts.select_related(*related)
+        if fields is not None:
+            posts = posts.only(*fields)
+        post = posts.filter(id=post_id).first()
+        if post is not None:
+            return post
+    raise Http404
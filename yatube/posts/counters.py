@@ -0,0 +1,192 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import (Case, Count, F, IntegerField, Max, OuterRef,
+                              Subquery, Value, When)
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Comment, Group, GroupStats, Post
+from .trending import record_views
+
+logger = logging.getLogger(__name__)
+
+# Every post in a batch costs three SQL parameters; SQLite allows 999.
+FLUSH_BATCH_SIZE = 300
+
+
+class ViewCounter:
+    # Views are summed in memory and written as one UPDATE per batch,
+    # so a crashed worker loses at most one flush interval of views.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = Counter()
+        self._total = 0
+        self._last_flush = time.monotonic()
+
+    def incr(self, post_id, amount=1):
+        # Returns the post's views not in the database yet, this one
+        # included, counted before a flush may write them.
+        with self._lock:
+            self._pending[post_id] += amount
+            pending = self._pending[post_id]
+            self._total += amount
+            due = (
+                self._total >= settings.VIEW_COUNT_FLUSH_THRESHOLD
+                or time.monotonic() - self._last_flush
+                >= settings.VIEW_COUNT_FLUSH_INTERVAL
+            )
+        if due:
+            self.flush()
+        return pending
+
+    def pending(self, post_id):
+        return self._pending.get(post_id, 0)
+
+    def reset(self):
+        with self._lock:
+            self._pending.clear()
+            self._total = 0
+            self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            self._total = 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        try:
+            self._write(sorted(pending.items()))
+        except DatabaseError:
+            logger.exception('Failed to flush %d view counters', len(pending))
+            with self._lock:
+                self._pending.update(pending)
+                self._total += sum(pending.values())
+            return 0
+        if settings.TRENDING_ENABLED:
+            self._record_trending(pending)
+        return len(pending)
+
+    def _record_trending(self, pending):
+        ids = sorted(pending)
+        groups = {}
+        for start in range(0, len(ids), FLUSH_BATCH_SIZE):
+            # Drafts previewed by their authors take no top-K slots.
+            groups.update(Post.objects.published().filter(
+                pk__in=ids[start:start + FLUSH_BATCH_SIZE]
+            ).values_list('id', 'group_id'))
+        record_views([
+            (post_id, groups[post_id], count)
+            for post_id, count in pending.items() if post_id in groups
+        ])
+
+    def _write(self, items):
+        with transaction.atomic():
+            for start in range(0, len(items), FLUSH_BATCH_SIZE):
+                chunk = items[start:start + FLUSH_BATCH_SIZE]
+                delta = Case(
+                    *[When(pk=pk, then=Value(count)) for pk, count in chunk],
+                    output_field=IntegerField(),
+                )
+                Post.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+                    view_count=F('view_count') + delta
+                )
+
+
+def _flush_on_exit():
+    try:
+        view_counter.flush()
+    except Exception:
+        # The database may already be closed when the interpreter exits.
+        logger.info('Dropped pending view counters on exit', exc_info=True)
+
+
+view_counter = ViewCounter()
+atexit.register(_flush_on_exit)
+
+
+def refresh_comment_counts(posts):
+    counts = Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+        'post'
+    ).annotate(total=Count('pk')).values('total')
+    return posts.update(comment_count=Coalesce(Subquery(counts), 0))
+
+
+def refresh_group_stats(group_ids=None):
+    # Recounts the given groups, or all of them, with two GROUP BY queries
+    # over the published posts and replaces their stats rows.
+    posts = Post.objects.published().filter(group__isnull=False).order_by()
+    stats = GroupStats.objects.all()
+    if group_ids is None:
+        group_ids = list(Group.objects.values_list('id', flat=True))
+    else:
+        group_ids = list(group_ids)
+        if not group_ids:
+            return 0
+        posts = posts.filter(group_id__in=group_ids)
+        stats = stats.filter(group_id__in=group_ids)
+    totals = {
+        row['group']: row for row in posts.values('group').annotate(
+            post_count=Count('id'), last_post=Max('pub_date')
+        )
+    }
+    top_authors = defaultdict(list)
+    authors = posts.values('group', 'author__username').annotate(
+        posts=Count('id')
+    ).order_by('group', '-posts', 'author__username')
+    for row in authors:
+        names = top_authors[row['group']]
+        if len(names) < settings.GROUP_TOP_AUTHORS:
+            names.append(row['author__username'])
+    rows = [
+        GroupStats(
+            group_id=group_id,
+            post_count=totals.get(group_id, {}).get('post_count', 0),
+            last_post=totals.get(group_id, {}).get('last_post'),
+            top_authors=' '.join(top_authors[group_id]),
+        )
+        for group_id in group_ids
+    ]
+    with transaction.atomic():
+        stats.delete()
+        GroupStats.objects.bulk_create(rows)
+    return len(rows)
+
+
+def add_group_posts(group_id, count, last_post):
+    # Counts newly published posts in a group's stats row without
+    # recounting the group; the top authors wait for refresh_group_stats.
+    rows = GroupStats.objects.filter(group_id=group_id)
+    changes = {
+        'post_count': F('post_count') + count,
+        'last_post': Greatest(
+            Coalesce(F('last_post'), Value(last_post)), Value(last_post)
+        ),
+    }
+    if rows.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            GroupStats.objects.create(
+                group_id=group_id, post_count=count, last_post=last_post
+            )
+    except IntegrityError:
+        # Another request created the row in the meantime.
+        rows.update(**changes)
+
+
+def remove_group_post(group_id, pub_date):
+    rows = GroupStats.objects.filter(group_id=group_id, post_count__gt=0)
+    rows.update(post_count=F('post_count') - 1)
+    # Only removing the newest post moves the last post date back.
+    latest = Post.objects.published().filter(
+        group_id=OuterRef('group_id')
+    ).order_by('-pub_date').values('pub_date')[:1]
+    GroupStats.objects.filter(
+        group_id=group_id, last_post__lte=pub_date
+    ).update(last_post=Subquery(latest))
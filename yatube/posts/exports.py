@@ -0,0 +1,49 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Follow, Post
+
+EXPORTS = {
+    'posts': (Post, (
+        'id', 'author_id', 'group_id', 'text', 'pub_date', 'image',
+        'comment_count', 'view_count', 'status', 'publish_at',
+    )),
+    'comments': (Comment, ('id', 'post_id', 'author_id', 'text', 'created')),
+    'follows': (Follow, ('id', 'user_id', 'author_id')),
+}
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+CHUNK_SIZE = 2000
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def export_rows(name, from_id=None, to_id=None, chunk_size=CHUNK_SIZE):
+    model, fields = EXPORTS[name]
+    queryset = model.objects.order_by('pk')
+    if from_id is not None:
+        queryset = queryset.filter(pk__gte=from_id)
+    if to_id is not None:
+        queryset = queryset.filter(pk__lte=to_id)
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def export_lines(name, fmt, from_id=None, to_id=None,
+                 chunk_size=CHUNK_SIZE):
+    _, fields = EXPORTS[name]
+    rows = export_rows(name, from_id, to_id, chunk_size)
+    if fmt == 'csv':
+        writer = csv.writer(_Echo())
+        yield writer.writerow(fields)
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(fields, row))) + '\n'
@@ -0,0 +1,141 @@
+from core.cache import get_version
+from django.conf import settings
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse, reverse_lazy
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import http_date
+from django.utils.text import Truncator
+
+from .models import Group, User
+from .views import group_posts_for, index_posts
+
+
+class PostsFeed(Feed):
+    title = 'Yatube: новые записи'
+    link = reverse_lazy('posts:index')
+    description = 'Последние записи всех авторов Yatube.'
+
+    def items(self):
+        # Feed entries carry the full text, unlike the HTML feeds.
+        return index_posts().defer(None)[:settings.FEED_ITEMS]
+
+    def item_title(self, post):
+        return Truncator(post.text).words(8)
+
+    def item_description(self, post):
+        return post.text
+
+    def item_link(self, post):
+        return reverse('posts:post_detail', args=[post.id])
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.get_full_name() or post.author.username
+
+
+class GroupFeed(PostsFeed):
+    def get_object(self, request, slug):
+        return get_object_or_404(Group, slug=slug)
+
+    def title(self, group):
+        return f'Yatube: {group.title}'
+
+    def link(self, group):
+        return reverse('posts:group_list', args=[group.slug])
+
+    def description(self, group):
+        return group.description
+
+    def items(self, group):
+        return group_posts_for(group).defer(None)[:settings.FEED_ITEMS]
+
+
+class AuthorFeed(PostsFeed):
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Yatube: {author.get_full_name() or author.username}'
+
+    def link(self, author):
+        return reverse('posts:profile', args=[author.username])
+
+    def description(self, author):
+        return f'Последние записи пользователя {author.username}.'
+
+    def items(self, author):
+        return author.posts.published().select_related('group', 'author')[
+            :settings.FEED_ITEMS
+        ]
+
+
+class AtomPostsFeed(PostsFeed):
+    feed_type = Atom1Feed
+    subtitle = PostsFeed.description
+
+
+class AtomGroupFeed(GroupFeed):
+    feed_type = Atom1Feed
+    subtitle = GroupFeed.description
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorFeed.description
+
+
+def object_scope(prefix, model, field):
+    # Scopes are keyed by id, like the ones the post signals bump. The id
+    # of a slug or username is cached, so a 304 needs no query.
+    def scope(**kwargs):
+        value = kwargs[field]
+        key = f'feed:id:{model._meta.label_lower}:{value}'
+        object_id = cache.get(key)
+        if object_id is None:
+            object_id = model.objects.filter(**{field: value}).values_list(
+                'id', flat=True
+            ).first()
+            if object_id is not None:
+                cache.set(key, object_id, settings.FEED_CACHE_TIMEOUT)
+        return f'{prefix}:{object_id}'
+    return scope
+
+
+GROUP_SCOPE = object_scope('feed:group', Group, 'slug')
+AUTHOR_SCOPE = object_scope('feed:author', User, 'username')
+
+
+def cached_feed(feed, scope):
+    # The rendered XML is cached under the scope version, which the post
+    # signals bump. The version doubles as ETag and Last-Modified, so a
+    # polling reader gets a 304 without the feed being rendered or even
+    # read from the cache.
+    kind = feed.feed_type.__name__
+
+    def view(request, **kwargs):
+        name = scope(**kwargs) if callable(scope) else scope
+        version = get_version(name)
+        etag = f'"{name}:{version}:{kind}"'
+        not_modified = get_conditional_response(
+            request, etag=etag, last_modified=version
+        )
+        if not_modified is not None:
+            return not_modified
+        key = f'{name}:{version}:{kind}'
+        cached = cache.get(key)
+        if cached is None:
+            response = feed(request, **kwargs)
+            cached = (response.content, response['Content-Type'])
+            cache.set(key, cached, settings.FEED_CACHE_TIMEOUT)
+        response = HttpResponse(cached[0], content_type=cached[1])
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(version)
+        response['Cache-Control'] = 'public, no-cache'
+        return response
+    return view
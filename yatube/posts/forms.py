@@ -1,8 +1,12 @@
 from django import forms
 from django.forms import Textarea
+from django.utils import timezone
 
 from .models import Comment, Post
 
+# The value format of <input type="datetime-local">.
+LOCAL_FORMAT = '%Y-%m-%dT%H:%M'
+
 
 class PostForm(forms.ModelForm):
     class Meta:
@@ -13,6 +17,41 @@ class PostForm(forms.ModelForm):
         }
 
 
+class PublishingForm(forms.ModelForm):
+    # Shown next to PostForm and bound to the same post.
+    publish_at = forms.DateTimeField(
+        label='Опубликовать в',
+        required=False,
+        input_formats=[LOCAL_FORMAT, '%Y-%m-%d %H:%M'],
+        widget=forms.DateTimeInput(
+            attrs={'type': 'datetime-local'}, format=LOCAL_FORMAT
+        ),
+        help_text='Время публикации запланированного поста',
+    )
+
+    class Meta:
+        model = Post
+        fields = ('status', 'publish_at')
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Without a status in the request the post keeps its current one.
+        self.fields['status'].required = False
+
+    def clean_status(self):
+        return self.cleaned_data['status'] or self.instance.status
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if cleaned_data.get('status') == Post.SCHEDULED:
+            publish_at = cleaned_data.get('publish_at')
+            if publish_at is None or publish_at <= timezone.now():
+                self.add_error(
+                    'publish_at', 'Укажите время публикации в будущем.'
+                )
+        return cleaned_data
+
+
 class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
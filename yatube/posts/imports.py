@@ -0,0 +1,215 @@
+import json
+import time
+from contextlib import contextmanager
+
+from core.cache import bump_version
+from django.contrib.auth.hashers import make_password
+from django.db import connection, connections, router, transaction
+from django.db.models import Max
+from django.db.models.sql import InsertQuery
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .counters import refresh_comment_counts, refresh_group_stats
+from .models import (ArchivedComment, ArchivedPost, Comment, Group, Post,
+                     User)
+from .pagination import COUNTS_SCOPE
+from .rendering import derived_fields
+
+BATCH_SIZE = 5000
+# Records without these keys are skipped.
+REQUIRED_KEYS = {
+    'post': ('author', 'text'),
+    'comment': ('post', 'author', 'text'),
+}
+STATUSES = dict(Post.STATUS_CHOICES)
+
+
+def next_id(*models):
+    # Archived rows keep their ids, so they must not be reused. Ids are
+    # handed out from the largest one at the start of the import, so rows
+    # created meanwhile by anything else would collide: imports need
+    # exclusive write access to the posts and comments.
+    return max(
+        model.objects.aggregate(last=Max('id'))['last'] or 0
+        for model in models
+    ) + 1
+
+
+def insert_rows(model, objects):
+    # bulk_create() would replace the auto_now_add dates with the current
+    # time. A raw insert, as loaddata does, stores the values as they are
+    # set on the objects, so every row is written once.
+    if not objects:
+        return
+    connection = connections[router.db_for_write(model)]
+    fields = model._meta.concrete_fields
+    # The largest insert the database accepts per statement.
+    size = connection.ops.bulk_batch_size(fields, objects)
+    for start in range(0, len(objects), size):
+        query = InsertQuery(model)
+        query.insert_values(fields, objects[start:start + size], raw=True)
+        query.get_compiler(connection=connection).execute_sql()
+
+
+def parse_moment(value):
+    moment = parse_datetime(value) if value else None
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, timezone.utc)
+    return moment
+
+
+def parse_timestamp(value):
+    return parse_moment(value) or timezone.now()
+
+
+@contextmanager
+def deferred_indexes(enabled):
+    # Secondary indexes from Meta.indexes are rebuilt once at the end
+    # instead of being updated row by row.
+    if not enabled:
+        yield
+        return
+    indexes = [
+        (model, index)
+        for model in (Post, Comment)
+        for index in model._meta.indexes
+    ]
+    with connection.schema_editor() as editor:
+        for model, index in indexes:
+            editor.remove_index(model, index)
+    try:
+        yield
+    finally:
+        with connection.schema_editor() as editor:
+            for model, index in indexes:
+                editor.add_index(model, index)
+
+
+class Importer:
+    def __init__(self, batch_size=BATCH_SIZE, report=None):
+        self.batch_size = batch_size
+        self.report = report or (lambda message: None)
+        self.users = dict(User.objects.values_list('username', 'id'))
+        self.groups = dict(Group.objects.values_list('slug', 'id'))
+        self.post_ids = {}
+        self.next_post_id = next_id(Post, ArchivedPost)
+        self.next_comment_id = next_id(Comment, ArchivedComment)
+        self.first_post_id = self.next_post_id
+        self.records = []
+        self.stats = {
+            'posts': 0, 'comments': 0, 'users': 0, 'skipped': 0,
+        }
+        self.started = time.monotonic()
+
+    def add(self, record):
+        required = REQUIRED_KEYS.get(record.get('type'))
+        if required is None or any(
+            record.get(key) is None for key in required
+        ):
+            self.stats['skipped'] += 1
+            return
+        if record['type'] == 'post':
+            record['status'] = record.get('status') or Post.PUBLISHED
+            if record['status'] not in STATUSES:
+                self.stats['skipped'] += 1
+                return
+            if record.get('id') is not None:
+                self.post_ids[str(record['id'])] = self.next_post_id
+            record['pk'] = self.next_post_id
+            self.next_post_id += 1
+        self.records.append(record)
+        if len(self.records) >= self.batch_size:
+            self.flush()
+
+    def ensure_users(self, usernames):
+        missing = sorted(set(usernames) - self.users.keys())
+        if not missing:
+            return
+        password = make_password(None)
+        User.objects.bulk_create(
+            [User(username=name, password=password) for name in missing]
+        )
+        for start in range(0, len(missing), 500):
+            self.users.update(
+                User.objects.filter(username__in=missing[start:start + 500])
+                .values_list('username', 'id')
+            )
+        self.stats['users'] += len(missing)
+
+    def build_post(self, record):
+        return Post(
+            id=record['pk'],
+            pub_date=parse_timestamp(record.get('pub_date')),
+            updated=timezone.now(),
+            author_id=self.users[record['author']],
+            group_id=self.groups.get(record.get('group')),
+            text=record['text'],
+            image=record.get('image') or '',
+            status=record['status'],
+            publish_at=parse_moment(record.get('publish_at')),
+            # The raw insert skips Post.save().
+            **derived_fields(record['text']),
+        )
+
+    def build_comment(self, record):
+        comment = Comment(
+            id=self.next_comment_id,
+            post_id=self.post_ids[str(record['post'])],
+            author_id=self.users[record['author']],
+            text=record['text'],
+            created=parse_timestamp(record.get('created')),
+        )
+        self.next_comment_id += 1
+        return comment
+
+    def flush(self):
+        records, self.records = self.records, []
+        # Comments on posts that are not in the import are skipped before
+        # their authors are created.
+        posts = [record for record in records if record['type'] == 'post']
+        comments = [
+            record for record in records
+            if record['type'] == 'comment'
+            and str(record['post']) in self.post_ids
+        ]
+        self.stats['skipped'] += len(records) - len(posts) - len(comments)
+        if not posts and not comments:
+            return
+        with transaction.atomic():
+            self.ensure_users(
+                record['author'] for record in posts + comments
+            )
+            new_posts = [self.build_post(record) for record in posts]
+            new_comments = [self.build_comment(record) for record in comments]
+            insert_rows(Post, new_posts)
+            insert_rows(Comment, new_comments)
+        self.stats['posts'] += len(posts)
+        self.stats['comments'] += len(comments)
+        elapsed = time.monotonic() - self.started
+        total = self.stats['posts'] + self.stats['comments']
+        self.report(
+            f'Постов: {self.stats["posts"]}, '
+            f'комментариев: {self.stats["comments"]}, '
+            f'{total / elapsed:.0f} записей/с'
+        )
+
+    def finish(self):
+        self.flush()
+        # Counters are rebuilt once here; the raw inserts send no signals.
+        refresh_comment_counts(
+            Post.objects.filter(id__gte=self.first_post_id)
+        )
+        refresh_group_stats()
+        bump_version(COUNTS_SCOPE, 'feed:index')
+        return self.stats
+
+
+def import_stream(lines, batch_size=BATCH_SIZE, defer_indexes=False,
+                  report=None):
+    with deferred_indexes(defer_indexes):
+        importer = Importer(batch_size, report)
+        for line in lines:
+            if line.strip():
+                importer.add(json.loads(line))
+        return importer.finish()
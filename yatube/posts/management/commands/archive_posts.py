@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+from posts.archive import archive_cutoff, archive_posts
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит старые посты вместе с комментариями в архивные таблицы '
+        'пачками, чтобы основная таблица постов оставалась небольшой.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            help='Возраст поста в днях, по умолчанию ARCHIVE_AFTER_DAYS.',
+        )
+        parser.add_argument('--batch-size', type=int)
+
+    def handle(self, *args, **options):
+        posts, comments = archive_posts(
+            archive_cutoff(options['days']),
+            options['batch_size'],
+            self.stdout.write,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Перенесено в архив: постов {posts}, комментариев {comments}'
+        ))
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+from posts.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = (
+        'Обновляет файлы sitemap для постов, групп и профилей. '
+        'Перезаписываются только части с новыми или изменёнными записями.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Перестроить все файлы заново.',
+        )
+
+    def handle(self, *args, **options):
+        written = build_sitemaps(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено файлов sitemap: {len(written)}'
+        ))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from posts.exports import CHUNK_SIZE, CONTENT_TYPES, EXPORTS, export_lines
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает посты, комментарии или подписки в NDJSON или CSV '
+        'потоком, не загружая таблицу в память.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(EXPORTS))
+        parser.add_argument(
+            '--format', choices=sorted(CONTENT_TYPES), default='ndjson'
+        )
+        parser.add_argument(
+            '--from-id', type=int,
+            help='Начать с этого id включительно (для продолжения выгрузки).',
+        )
+        parser.add_argument(
+            '--to-id', type=int, help='Закончить на этом id включительно.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+        parser.add_argument(
+            '--output', help='Файл для выгрузки, по умолчанию stdout.'
+        )
+
+    def handle(self, *args, **options):
+        lines = export_lines(
+            options['name'],
+            options['format'],
+            options['from_id'],
+            options['to_id'],
+            options['chunk_size'],
+        )
+        if options['output'] is None:
+            stream = self.stdout
+            for line in lines:
+                stream.write(line, ending='')
+            return
+        with open(options['output'], 'w', encoding='utf-8',
+                  newline='') as stream:
+            stream.writelines(lines)
+        self.stderr.write(f'Выгрузка записана в {options["output"]}')
@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand
+from posts.imports import BATCH_SIZE, import_stream
+
+
+class Command(BaseCommand):
+    help = (
+        'Импортирует посты и комментарии из NDJSON. Каждая строка - объект '
+        '{"type": "post", "id", "author", "group", "text", "pub_date", '
+        '"status", "publish_at"} '
+        'или {"type": "comment", "post", "author", "text", "created"}, '
+        'где post - id поста из этого же файла. Во время импорта сайт '
+        'не должен создавать посты и комментарии.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Путь к файлу или - для stdin.')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument(
+            '--defer-indexes', action='store_true',
+            help='Удалить вторичные индексы на время импорта.',
+        )
+
+    def handle(self, *args, **options):
+        report = self.stdout.write
+        if options['path'] == '-':
+            stats = import_stream(
+                sys.stdin, options['batch_size'], options['defer_indexes'],
+                report,
+            )
+        else:
+            with open(options['path'], encoding='utf-8') as lines:
+                stats = import_stream(
+                    lines, options['batch_size'], options['defer_indexes'],
+                    report,
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Готово: постов {stats["posts"]}, '
+            f'комментариев {stats["comments"]}, '
+            f'новых авторов {stats["users"]}, '
+            f'пропущено {stats["skipped"]}'
+        ))
@@ -0,0 +1,36 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from posts.publishing import publish_scheduled
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует запланированные посты, время которых наступило, '
+        'пачками; с --loop проверяет их постоянно.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int)
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Не завершаться, а проверять посты каждые --interval секунд.',
+        )
+        parser.add_argument(
+            '--interval', type=float,
+            help='Пауза между проверками, по умолчанию PUBLISH_INTERVAL.',
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.PUBLISH_INTERVAL
+        while True:
+            published = publish_scheduled(
+                batch_size=options['batch_size'], report=self.stdout.write
+            )
+            if not options['loop']:
+                break
+            time.sleep(interval)
+        self.stdout.write(self.style.SUCCESS(
+            f'Опубликовано постов: {published}'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from posts.counters import refresh_group_stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает число постов, дату последнего поста и самых '
+        'активных авторов всех групп для каталога групп.'
+    )
+
+    def handle(self, *args, **options):
+        groups = refresh_group_stats()
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлена статистика групп: {groups}'
+        ))
@@ -0,0 +1,77 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:14
+
+from django.db import migrations, models
+from django.utils.html import linebreaks, urlize
+from django.utils.text import Truncator
+
+BATCH_SIZE = 500
+# A frozen copy of posts.rendering as of this migration, so the backfill
+# does not change when the live code or settings do.
+DERIVED_FIELDS = ('excerpt', 'text_html', 'word_count')
+EXCERPT_LENGTH = 300
+
+
+def derived_fields(text):
+    return {
+        'excerpt': Truncator(text).chars(EXCERPT_LENGTH),
+        'text_html': linebreaks(urlize(text, nofollow=True, autoescape=True)),
+        'word_count': len(text.split()),
+    }
+
+
+def fill_derived_text(apps, schema_editor):
+    for name in ('Post', 'ArchivedPost'):
+        model = apps.get_model('posts', name)
+        last_id = 0
+        while True:
+            batch = list(model.objects.filter(id__gt=last_id).order_by(
+                'id'
+            ).only('id', 'text')[:BATCH_SIZE])
+            if not batch:
+                break
+            for post in batch:
+                for field, value in derived_fields(post.text).items():
+                    setattr(post, field, value)
+            model.objects.bulk_update(batch, DERIVED_FIELDS)
+            last_id = batch[-1].id
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0016_post_updated'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedpost',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Отрывок'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='archivedpost',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число слов'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Отрывок'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Текст в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='word_count',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Число слов'),
+        ),
+        migrations.RunPython(fill_derived_text, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0017_post_derived_text'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='publish_at',
+            field=models.DateTimeField(blank=True, help_text='Время публикации запланированного поста', null=True, verbose_name='Опубликовать в'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='status',
+            field=models.CharField(choices=[('draft', 'Черновик'), ('scheduled', 'Запланирован'), ('published', 'Опубликован')], default='published', max_length=10, verbose_name='Статус'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', '-pub_date'], name='post_status_pub_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['status', 'publish_at'], name='post_status_publish_at_idx'),
+        ),
+    ]
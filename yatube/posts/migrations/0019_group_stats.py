@@ -0,0 +1,63 @@
+# Generated by Django 2.2.16 on 2026-10-19 10:21
+
+from collections import defaultdict
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+TOP_AUTHORS = 3
+
+
+def fill_group_stats(apps, schema_editor):
+    Group = apps.get_model('posts', 'Group')
+    GroupStats = apps.get_model('posts', 'GroupStats')
+    Post = apps.get_model('posts', 'Post')
+    posts = Post.objects.filter(
+        status='published', group__isnull=False
+    ).order_by()
+    totals = {
+        row['group']: row for row in posts.values('group').annotate(
+            post_count=models.Count('id'), last_post=models.Max('pub_date')
+        )
+    }
+    top_authors = defaultdict(list)
+    authors = posts.values('group', 'author__username').annotate(
+        posts=models.Count('id')
+    ).order_by('group', '-posts', 'author__username')
+    for row in authors:
+        if len(top_authors[row['group']]) < TOP_AUTHORS:
+            top_authors[row['group']].append(row['author__username'])
+    GroupStats.objects.bulk_create(
+        GroupStats(
+            group_id=group_id,
+            post_count=totals.get(group_id, {}).get('post_count', 0),
+            last_post=totals.get(group_id, {}).get('last_post'),
+            top_authors=' '.join(top_authors[group_id]),
+        )
+        for group_id in Group.objects.values_list('id', flat=True)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0018_post_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupStats',
+            fields=[
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='posts.Group', verbose_name='Группа')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Число постов')),
+                ('last_post', models.DateTimeField(blank=True, null=True, verbose_name='Последний пост')),
+                ('top_authors', models.TextField(blank=True, verbose_name='Самые активные авторы')),
+                ('updated', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Статистика группы',
+                'verbose_name_plural': 'Статистика групп',
+            },
+        ),
+        migrations.RunPython(fill_group_stats, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,9 @@
+from core.db import estimate_count
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .rendering import DERIVED_FIELDS, derived_fields
+
 User = get_user_model()
 
 
@@ -22,12 +25,79 @@ class Group(models.Model):
         return self.title
 
 
+class GroupStats(models.Model):
+    # Kept by the post signals and rebuilt by refresh_group_stats() in
+    # posts.counters, so the group directory reads every number with its
+    # group in one query.
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Группа',
+    )
+    post_count = models.PositiveIntegerField('Число постов', default=0)
+    last_post = models.DateTimeField('Последний пост', null=True, blank=True)
+    # Usernames contain no spaces, so a space separated list is enough.
+    top_authors = models.TextField('Самые активные авторы', blank=True)
+    updated = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Статистика группы'
+        verbose_name_plural = 'Статистика групп'
+
+    @property
+    def top_author_names(self):
+        return self.top_authors.split()
+
+
+# Post fields whose previous values the signals need.
+TRACKED_FIELDS = ('group_id', 'status')
+
+
+class PostQuerySet(models.QuerySet):
+    def published(self):
+        return self.filter(status=self.model.PUBLISHED)
+
+    def visible_to(self, user):
+        # Drafts and scheduled posts are shown to their author only.
+        if not user.is_authenticated:
+            return self.published()
+        return self.filter(
+            models.Q(status=self.model.PUBLISHED) | models.Q(author=user)
+        )
+
+    def estimate_published(self):
+        # The planner only knows the size of the whole table. Drafts and
+        # scheduled posts are few, so the published feed is estimated as
+        # the table minus their exact count, which the status index
+        # answers cheaply.
+        manager = self.model._default_manager.using(self.db)
+        total = estimate_count(manager.all())
+        if total is None:
+            return None
+        hidden = manager.filter(
+            status__in=[self.model.DRAFT, self.model.SCHEDULED]
+        ).count()
+        return max(total - hidden, 0)
+
+
 class Post(models.Model):
+    DRAFT = 'draft'
+    SCHEDULED = 'scheduled'
+    PUBLISHED = 'published'
+    STATUS_CHOICES = (
+        (DRAFT, 'Черновик'),
+        (SCHEDULED, 'Запланирован'),
+        (PUBLISHED, 'Опубликован'),
+    )
+
     text = models.TextField(
         verbose_name='Текст поста',
         help_text='Перед вами чистый лист. Творите.'
     )
     pub_date = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -50,14 +120,89 @@ class Post(models.Model):
         blank=True,
         help_text='Добавьте картинку'
     )
+    comment_count = models.PositiveIntegerField(
+        'Число комментариев',
+        default=0,
+        editable=False,
+    )
+    view_count = models.PositiveIntegerField(
+        'Число просмотров',
+        default=0,
+        editable=False,
+    )
+    excerpt = models.TextField('Отрывок', blank=True, editable=False)
+    text_html = models.TextField('Текст в HTML', blank=True, editable=False)
+    word_count = models.PositiveIntegerField(
+        'Число слов', default=0, editable=False
+    )
+    status = models.CharField(
+        'Статус',
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=PUBLISHED,
+    )
+    publish_at = models.DateTimeField(
+        'Опубликовать в',
+        blank=True,
+        null=True,
+        help_text='Время публикации запланированного поста'
+    )
+
+    objects = PostQuerySet.as_manager()
+
+    is_archived = False
 
     class Meta:
         ordering = ('-pub_date',)
         verbose_name = 'Пост'
         verbose_name_plural = 'Посты'
+        # Feeds filter on the status and order by date; the scheduler looks
+        # up due posts by status and publish time.
+        indexes = [
+            models.Index(
+                fields=['status', '-pub_date'],
+                name='post_status_pub_date_idx',
+            ),
+            models.Index(
+                fields=['status', 'publish_at'],
+                name='post_status_publish_at_idx',
+            ),
+        ]
+
+    @property
+    def is_published(self):
+        return self.status == self.PUBLISHED
 
     def __str__(self):
-        return self.text[:15]
+        # The excerpt starts with the text and is loaded in feeds.
+        return (self.excerpt or self.text)[:15]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        post = super().from_db(db, field_names, values)
+        post._original = {
+            name: value for name, value in zip(field_names, values)
+            if name in TRACKED_FIELDS
+        }
+        return post
+
+    def original(self, attname):
+        # The value a tracked field had when the post was loaded or last
+        # saved, None for a new post. The signals use it to update the
+        # group a post leaves.
+        return getattr(self, '_original', {}).get(attname)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'text' in update_fields:
+            for name, value in derived_fields(self.text).items():
+                setattr(self, name, value)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, *DERIVED_FIELDS}
+        super().save(*args, **kwargs)
+        self._original = {
+            name: getattr(self, name) for name in TRACKED_FIELDS
+        }
 
 
 class Comment(models.Model):
@@ -82,6 +227,10 @@ class Comment(models.Model):
 
     class Meta:
         ordering = ('-created',)
+        indexes = [models.Index(
+            fields=['post', 'created', 'id'],
+            name='comment_post_created_idx',
+        )]
 
 
 class Follow(models.Model):
@@ -103,3 +252,75 @@ class Follow(models.Model):
             fields=['user', 'author'],
             name='unique_user_author',
         )]
+
+
+class ArchivedPost(models.Model):
+    # Cold copy of Post: rows keep their original id so links stay valid.
+    id = models.IntegerField(primary_key=True)
+    text = models.TextField(verbose_name='Текст поста')
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='archived_posts',
+        verbose_name='Автор'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        related_name='archived_posts',
+        blank=True,
+        null=True,
+        verbose_name='Группа поста'
+    )
+    image = models.ImageField('Картинка', upload_to='posts/', blank=True)
+    comment_count = models.PositiveIntegerField(
+        'Число комментариев', default=0
+    )
+    view_count = models.PositiveIntegerField('Число просмотров', default=0)
+    excerpt = models.TextField('Отрывок', blank=True, editable=False)
+    text_html = models.TextField('Текст в HTML', blank=True, editable=False)
+    word_count = models.PositiveIntegerField(
+        'Число слов', default=0, editable=False
+    )
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    is_archived = True
+    is_published = True
+
+    class Meta:
+        ordering = ('-pub_date',)
+        verbose_name = 'Архивный пост'
+        verbose_name_plural = 'Архивные посты'
+        indexes = [models.Index(
+            fields=['author', 'pub_date'],
+            name='archived_post_author_idx',
+        )]
+
+    def __str__(self):
+        return (self.excerpt or self.text)[:15]
+
+
+class ArchivedComment(models.Model):
+    id = models.IntegerField(primary_key=True)
+    post = models.ForeignKey(
+        ArchivedPost,
+        related_name='comments',
+        on_delete=models.CASCADE,
+        verbose_name='Пост'
+    )
+    author = models.ForeignKey(
+        User,
+        related_name='archived_comments',
+        on_delete=models.CASCADE,
+        verbose_name='Автор'
+    )
+    text = models.TextField(verbose_name='Текст комментария')
+    created = models.DateTimeField()
+
+    class Meta:
+        ordering = ('-created',)
+        indexes = [models.Index(
+            fields=['post', 'created', 'id'],
+            name='archived_comment_post_idx',
+        )]
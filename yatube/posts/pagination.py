@@ -0,0 +1,261 @@
+import base64
+import binascii
+import hashlib
+import json
+
+from core.cache import get_version
+from core.db import estimate_count
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet, ValidationError
+from django.core.paginator import Paginator
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+# Version scope bumped on every write that can change a feed count.
+COUNTS_SCOPE = 'counts'
+
+
+def _serialize(value):
+    return value.isoformat()
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, separators=(',', ':'), default=_serialize)
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    padding = '=' * (-len(cursor) % 4)
+    try:
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        values = json.loads(raw.decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+class KeysetPage:
+    def __init__(self, object_list, next_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+
+class KeysetPaginator:
+    # The cursor stores the ordering values of the last object on a page,
+    # so the next page is an index range scan instead of an OFFSET.
+    def __init__(self, queryset, ordering, per_page):
+        self.queryset = queryset.order_by(*ordering)
+        self.ordering = ordering
+        self.per_page = per_page
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip('-'))
+            for name in ordering
+        ]
+
+    def _cursor_for(self, obj):
+        return encode_cursor([
+            getattr(obj, field.attname) for field in self.fields
+        ])
+
+    def _filter_after(self, values):
+        if len(values) != len(self.fields):
+            raise ValueError('Invalid cursor')
+        try:
+            values = [
+                field.to_python(value)
+                for field, value in zip(self.fields, values)
+            ]
+        except ValidationError:
+            raise ValueError('Invalid cursor')
+        condition = Q()
+        equal = {}
+        for name, field, value in zip(self.ordering, self.fields, values):
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{field.attname}__{lookup}': value})
+            equal[field.attname] = value
+        return condition
+
+    def page(self, cursor=None):
+        queryset = self.queryset
+        if cursor:
+            queryset = queryset.filter(
+                self._filter_after(decode_cursor(cursor))
+            )
+        objects = list(queryset[:self.per_page + 1])
+        next_cursor = None
+        if len(objects) > self.per_page:
+            objects = objects[:self.per_page]
+            next_cursor = self._cursor_for(objects[-1])
+        return KeysetPage(objects, next_cursor)
+
+    def get_page(self, cursor=None):
+        try:
+            return self.page(cursor)
+        except ValueError:
+            return self.page()
+
+
+class ChainedSequence:
+    # Lets Paginator walk several querysets as one list. Each part is
+    # counted once and only parts overlapping the requested slice are
+    # queried, so later (archived) parts cost nothing on early pages.
+    def __init__(self, *parts):
+        self.parts = parts
+        self._counts = None
+
+    def counts(self):
+        if self._counts is None:
+            self._counts = [part.count() for part in self.parts]
+        return self._counts
+
+    def count(self):
+        return sum(self.counts())
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            items = self[index:index + 1]
+            if not items:
+                raise IndexError('ChainedSequence index out of range')
+            return items[0]
+        start, stop, _ = index.indices(self.count())
+        items, offset = [], 0
+        for part, size in zip(self.parts, self.counts()):
+            if start < offset + size and stop > offset:
+                items.extend(
+                    part[max(start - offset, 0):min(stop - offset, size)]
+                )
+            offset += size
+        return items
+
+
+class ChainedKeysetPaginator:
+    # Keyset counterpart of ChainedSequence. The same cursor is applied to
+    # every part, which works as long as each part only holds objects that
+    # sort after everything in the previous parts (hot posts, then archive).
+    def __init__(self, querysets, ordering, per_page):
+        self.querysets = querysets
+        self.ordering = ordering
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        objects = []
+        last = len(self.querysets) - 1
+        for number, queryset in enumerate(self.querysets):
+            paginator = KeysetPaginator(
+                queryset, self.ordering, self.per_page - len(objects)
+            )
+            page = paginator.page(cursor)
+            objects.extend(page)
+            if page.has_next():
+                return KeysetPage(objects, page.next_cursor)
+            if len(objects) == self.per_page and number < last:
+                # The page is full; later parts may still have objects.
+                return KeysetPage(objects, paginator._cursor_for(objects[-1]))
+        return KeysetPage(objects, None)
+
+    def get_page(self, cursor=None):
+        try:
+            return self.page(cursor)
+        except ValueError:
+            return self.page()
+
+
+class ElidedPaginator(Paginator):
+    # Page links around the current page and at both ends, with ellipses
+    # in between. The range is generated lazily from num_pages, so it
+    # stays a few items long however many pages there are and works with
+    # whatever count the paginator has (exact, cached or estimated).
+    ELLIPSIS = '…'
+
+    def get_elided_page_range(self, number=1, *, on_each_side=2, on_ends=1):
+        number = self.validate_number(number)
+        num_pages = self.num_pages
+        if num_pages <= (on_each_side + on_ends) * 2:
+            yield from range(1, num_pages + 1)
+            return
+        if number > 1 + on_each_side + on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(num_pages - on_ends + 1, num_pages + 1)
+        else:
+            yield from range(number + 1, num_pages + 1)
+
+
+def queryset_signature(object_list):
+    # The SQL of every part plus the newest id of its table, so rows added
+    # by bulk_create (which sends no signals) still change the signature.
+    # Max(id) is a single index lookup, unlike COUNT(*).
+    parts = getattr(object_list, 'parts', [object_list])
+    try:
+        queries = [
+            f'{part.query}#{latest_id(part.model)}' for part in parts
+        ]
+    except (AttributeError, EmptyResultSet):
+        return None
+    return hashlib.md5('|'.join(queries).encode()).hexdigest()
+
+
+def latest_id(model):
+    return model._default_manager.aggregate(latest=Max('pk'))['latest']
+
+
+class CachedCountPaginator(ElidedPaginator):
+    # Exact counts are cached per queryset under the COUNTS_SCOPE version,
+    # which post, group and follow writes bump. Above
+    # COUNT_ESTIMATE_THRESHOLD rows, unfiltered tables use the planner
+    # estimate instead and never COUNT(*) the whole table; so do feeds
+    # whose builder passes an estimate (the published index). Pages past
+    # the real end then simply come back empty.
+    count_is_estimated = False
+
+    def __init__(self, *args, estimate=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estimate = estimate
+
+    def estimated_count(self):
+        if self.estimate is not None:
+            return self.estimate()
+        if hasattr(self.object_list, 'query'):
+            return estimate_count(self.object_list)
+        return None
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if (
+            estimate is not None
+            and estimate >= settings.COUNT_ESTIMATE_THRESHOLD
+        ):
+            self.count_is_estimated = True
+            return estimate
+        # The signature is only needed for the cached exact count.
+        signature = queryset_signature(self.object_list)
+        if signature is None:
+            return super().count
+        key = f'count:{get_version(COUNTS_SCOPE)}:{signature}'
+        count = cache.get(key)
+        if count is None:
+            count = super().count
+            cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+        return count
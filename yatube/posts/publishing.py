@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+from core.cache import bump_version
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .counters import add_group_posts
+from .models import Post
+from .pagination import COUNTS_SCOPE
+from .signals import feed_scopes
+from .tasks import notify_followers
+
+
+def notify_new_post(post):
+    notify_followers.enqueue(
+        args=[post.id], idempotency_key=f'notify_followers:{post.id}'
+    )
+
+
+def publish_due(now=None, batch_size=None):
+    # Publishes one batch of scheduled posts whose time has come. The
+    # status condition in the UPDATE keeps concurrent schedulers from
+    # publishing a post twice, and only the posts this UPDATE published
+    # get the side effects below.
+    now = now or timezone.now()
+    batch_size = batch_size or settings.PUBLISH_BATCH_SIZE
+    with transaction.atomic():
+        posts = list(
+            Post.objects.filter(status=Post.SCHEDULED, publish_at__lte=now)
+            .only('id', 'author', 'group', 'publish_at')
+            .order_by('publish_at', 'id')[:batch_size]
+        )
+        if not posts:
+            return 0
+        ids = [post.id for post in posts]
+        updated = timezone.now()
+        published = Post.objects.filter(
+            id__in=ids, status=Post.SCHEDULED
+        ).update(
+            status=Post.PUBLISHED, pub_date=F('publish_at'), updated=updated
+        )
+        if published < len(posts):
+            # Another scheduler or an edit published some of them first;
+            # those carry a different modification time.
+            ours = set(Post.objects.filter(
+                id__in=ids, status=Post.PUBLISHED, updated=updated
+            ).values_list('id', flat=True))
+            posts = [post for post in posts if post.id in ours]
+    # update() sends no post_save, so the versions and group stats a new
+    # post updates are updated here.
+    scopes = {COUNTS_SCOPE}
+    for post in posts:
+        scopes.update(feed_scopes(post))
+    bump_version(*scopes)
+    groups = defaultdict(list)
+    for post in posts:
+        if post.group_id:
+            groups[post.group_id].append(post.publish_at)
+    for group_id, dates in groups.items():
+        add_group_posts(group_id, len(dates), max(dates))
+    for post in posts:
+        notify_new_post(post)
+    return len(posts)
+
+
+def publish_scheduled(now=None, batch_size=None, report=None):
+    total = 0
+    while True:
+        published = publish_due(now, batch_size)
+        if not published:
+            return total
+        total += published
+        if report is not None:
+            report(f'Опубликовано постов: {total}')
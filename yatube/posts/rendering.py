@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.utils.html import linebreaks, urlize
+from django.utils.text import Truncator
+
+DERIVED_FIELDS = ('excerpt', 'text_html', 'word_count')
+
+
+def render_html(text):
+    # urlize() escapes the text, so the result is safe to output as is.
+    return linebreaks(urlize(text, nofollow=True, autoescape=True))
+
+
+def derived_fields(text):
+    # Stored next to the text when a post is saved, so feeds never load
+    # or process the full text.
+    return {
+        'excerpt': Truncator(text).chars(settings.POST_EXCERPT_LENGTH),
+        'text_html': render_html(text),
+        'word_count': len(text.split()),
+    }
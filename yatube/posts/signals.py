@@ -0,0 +1,91 @@
+from core.cache import bump_version
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .counters import add_group_posts, remove_group_post
+from .models import Comment, Follow, Group, Post
+from .pagination import COUNTS_SCOPE
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        Post.objects.filter(pk=instance.post_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    Post.objects.filter(pk=instance.post_id, comment_count__gt=0).update(
+        comment_count=F('comment_count') - 1
+    )
+
+
+def feed_scopes_for(author_id, *group_ids):
+    # Version scopes of the syndication feeds of an author and groups,
+    # keyed by id so that no related object is loaded.
+    scopes = {'feed:index', f'feed:author:{author_id}'}
+    for group_id in group_ids:
+        if group_id:
+            scopes.add(f'feed:group:{group_id}')
+    return scopes
+
+
+def feed_scopes(post):
+    # The feeds a post appears or appeared in.
+    return feed_scopes_for(
+        post.author_id, post.group_id, post.original('group_id')
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_feeds(sender, instance, **kwargs):
+    bump_version(*feed_scopes(instance))
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@receiver(post_save, sender=Follow)
+@receiver(post_delete, sender=Follow)
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def invalidate_counts(sender, **kwargs):
+    bump_version(COUNTS_SCOPE)
+
+
+def move_group_post(post, before, after):
+    # before and after are (group_id, published) pairs. Counts and the last
+    # post date are adjusted with F() deltas for the group a post leaves and
+    # the one it joins; top authors are left to refresh_group_stats.
+    if before == after:
+        return
+    (old_group, was_published), (group, published) = before, after
+    if old_group and was_published:
+        remove_group_post(old_group, post.pub_date)
+    if group and published:
+        add_group_posts(group, 1, post.pub_date)
+
+
+@receiver(post_save, sender=Post)
+def update_group_stats(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    before = (
+        instance.original('group_id'),
+        instance.original('status') == Post.PUBLISHED,
+    )
+    move_group_post(
+        instance, before, (instance.group_id, instance.is_published)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def remove_from_group_stats(sender, instance, **kwargs):
+    move_group_post(
+        instance,
+        (instance.group_id, instance.is_published),
+        (instance.group_id, False),
+    )
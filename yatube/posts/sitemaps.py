@@ -0,0 +1,204 @@
+import hashlib
+import json
+import os
+import re
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.db.models import (Count, ExpressionWrapper, F, IntegerField, Max,
+                              Q)
+from django.urls import reverse
+
+from .models import ArchivedPost, Group, Post, User
+
+INDEX_NAME = 'sitemap.xml'
+STATE_NAME = 'state.json'
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+
+
+# Archived posts keep their ids and still resolve in post_detail. The same
+# field gives the lastmod of an entry and the fingerprint of its shard.
+POST_SOURCES = (
+    (Post.objects.published(), 'updated'),
+    (ArchivedPost.objects.all(), 'archived_at'),
+)
+
+
+def latest_post():
+    # Drafts and scheduled posts must not reveal when their author was
+    # active.
+    return Max('posts__pub_date', filter=Q(posts__status=Post.PUBLISHED))
+
+
+def post_entries(start, stop):
+    for posts, modified in POST_SOURCES:
+        rows = posts.filter(id__gte=start, id__lt=stop).order_by(
+            'id'
+        ).values_list('id', modified)
+        for post_id, lastmod in rows.iterator():
+            yield reverse('posts:post_detail', args=[post_id]), lastmod
+
+
+def group_entries(start, stop):
+    rows = Group.objects.filter(id__gte=start, id__lt=stop).order_by(
+        'id'
+    ).annotate(lastmod=latest_post()).values_list('slug', 'lastmod')
+    for slug, lastmod in rows:
+        yield reverse('posts:group_list', args=[slug]), lastmod
+
+
+def profile_entries(start, stop):
+    rows = User.objects.filter(
+        is_active=True, id__gte=start, id__lt=stop
+    ).order_by('id').annotate(
+        lastmod=latest_post()
+    ).values_list('username', 'lastmod')
+    for username, lastmod in rows.iterator():
+        yield reverse('posts:profile', args=[username]), lastmod
+
+
+# Section name -> (querysets with the aggregate of their latest change,
+# the field that names an object in its URL, entries for an id range).
+# Every section is sharded by id.
+SECTIONS = {
+    'posts': (
+        [(posts, Max(modified)) for posts, modified in POST_SOURCES],
+        None,
+        post_entries,
+    ),
+    'groups': (
+        [(Group.objects.all(), latest_post())],
+        'slug',
+        group_entries,
+    ),
+    'profiles': (
+        [(User.objects.filter(is_active=True), latest_post())],
+        'username',
+        profile_entries,
+    ),
+}
+
+# Only the index and the shards are public; state.json and the .tmp files
+# of a running build are not.
+PUBLIC_NAME = re.compile(
+    r'(?:sitemap|(?:{})-\d+)\.xml'.format('|'.join(SECTIONS))
+)
+
+
+def shard_of(object_id):
+    return str(object_id // settings.SITEMAP_SHARD_SIZE)
+
+
+def name_digests(querysets, field):
+    # URLs built from a slug or username change without any date changing,
+    # so the names of a shard are part of its fingerprint.
+    digests = {}
+    for queryset, _ in querysets:
+        rows = queryset.order_by('id').values_list('id', field)
+        for object_id, name in rows.iterator():
+            digest = digests.setdefault(shard_of(object_id), hashlib.md5())
+            digest.update(f'{object_id}:{name}\n'.encode())
+    return {shard: digest.hexdigest() for shard, digest in digests.items()}
+
+
+def shard_fingerprints(name):
+    # One grouped query per table: the number of rows and the latest change
+    # in every shard, plus the names behind the URLs. A shard is rewritten
+    # only when this changes, so new, edited, renamed, deleted and archived
+    # objects all touch just their shard.
+    size = settings.SITEMAP_SHARD_SIZE
+    querysets, name_field, _ = SECTIONS[name]
+    shards = {}
+    for queryset, latest in querysets:
+        rows = queryset.annotate(shard=ExpressionWrapper(
+            F('id') / size, output_field=IntegerField()
+        )).order_by().values('shard').annotate(
+            rows=Count('id', distinct=True), lastmod=latest
+        )
+        for row in rows:
+            count, lastmod = shards.get(str(row['shard']), (0, ''))
+            if row['lastmod'] is not None:
+                lastmod = max(lastmod, row['lastmod'].isoformat())
+            shards[str(row['shard'])] = (count + row['rows'], lastmod)
+    names = name_digests(querysets, name_field) if name_field else {}
+    return {
+        shard: (count, lastmod, names.get(shard, ''))
+        for shard, (count, lastmod) in shards.items()
+    }
+
+
+def absolute(location):
+    return escape(settings.SITE_URL.rstrip('/') + location)
+
+
+def write_file(path, lines):
+    # Crawlers never see a half-written file.
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as target:
+        target.writelines(lines)
+    os.replace(temporary, path)
+
+
+def shard_lines(name, shard):
+    size = settings.SITEMAP_SHARD_SIZE
+    _, _, entries = SECTIONS[name]
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for location, lastmod in entries(shard * size, (shard + 1) * size):
+        yield f'<url><loc>{absolute(location)}</loc>'
+        if lastmod is not None:
+            yield f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        yield '</url>\n'
+    yield '</urlset>\n'
+
+
+def index_lines(state):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for name in SECTIONS:
+        for shard, (_, lastmod, _) in sorted(
+            state.get(name, {}).items(), key=lambda item: int(item[0])
+        ):
+            location = reverse('posts:sitemap_file',
+                               args=[f'{name}-{shard}.xml'])
+            yield f'<sitemap><loc>{absolute(location)}</loc>'
+            if lastmod:
+                yield f'<lastmod>{lastmod[:10]}</lastmod>'
+            yield '</sitemap>\n'
+    yield '</sitemapindex>\n'
+
+
+def load_state(root):
+    try:
+        with open(os.path.join(root, STATE_NAME), encoding='utf-8') as state:
+            return json.load(state)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_sitemaps(root=None, full=False):
+    root = root or settings.SITEMAP_ROOT
+    os.makedirs(root, exist_ok=True)
+    previous = {} if full else load_state(root)
+    state, written = {}, []
+    for name in SECTIONS:
+        state[name] = {
+            shard: list(fingerprint)
+            for shard, fingerprint in shard_fingerprints(name).items()
+        }
+        old = previous.get(name, {})
+        for shard, fingerprint in state[name].items():
+            path = os.path.join(root, f'{name}-{shard}.xml')
+            if old.get(shard) != fingerprint or not os.path.exists(path):
+                write_file(path, shard_lines(name, int(shard)))
+                written.append(path)
+        for shard in old.keys() - state[name].keys():
+            path = os.path.join(root, f'{name}-{shard}.xml')
+            if os.path.exists(path):
+                os.remove(path)
+    if written or state != previous:
+        write_file(os.path.join(root, INDEX_NAME), index_lines(state))
+        write_file(
+            os.path.join(root, STATE_NAME), [json.dumps(state, indent=1)]
+        )
+    return written
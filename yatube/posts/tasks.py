@@ -0,0 +1,71 @@
+from core.queue import task
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.urls import reverse
+
+from .models import Comment, Post, User
+
+# Geometries used by the {% thumbnail %} tags in posts templates.
+THUMBNAIL_GEOMETRIES = ('960x390', '960x339')
+
+
+@task
+def generate_thumbnails(post_id):
+    # Imported here: core autodiscovers the tasks modules at startup, and
+    # sorl is only needed by the worker.
+    from sorl.thumbnail import get_thumbnail
+
+    post = Post.objects.filter(pk=post_id).only('image').first()
+    if post is None or not post.image:
+        return
+    for geometry in THUMBNAIL_GEOMETRIES:
+        get_thumbnail(post.image, geometry, crop='center', upscale=True)
+
+
+@task
+def notify_post_author(comment_id):
+    comment = Comment.objects.select_related(
+        'author', 'post__author'
+    ).filter(pk=comment_id).first()
+    if comment is None:
+        return
+    author = comment.post.author
+    if not author.email or author == comment.author:
+        return
+    send_mail(
+        'Новый комментарий к вашему посту',
+        f'{comment.author.get_full_name() or comment.author.username} '
+        f'оставил комментарий: {comment.text}\n\n'
+        + reverse('posts:post_detail', args=[comment.post_id]),
+        settings.DEFAULT_FROM_EMAIL,
+        [author.email],
+    )
+
+
+@task
+def notify_followers(post_id):
+    post = Post.objects.published().select_related('author').filter(
+        pk=post_id
+    ).first()
+    if post is None:
+        return
+    author = post.author.get_full_name() or post.author.username
+    subject = f'Новая запись от {author}'
+    body = f'{post.text[:200]}\n\n' + reverse(
+        'posts:post_detail', args=[post.id]
+    )
+    emails = User.objects.filter(
+        follower__author=post.author_id
+    ).exclude(email='').values_list('email', flat=True)
+    connection = get_connection()
+    batch = []
+    for email in emails.iterator(chunk_size=settings.EMAIL_BATCH_SIZE):
+        batch.append(EmailMessage(
+            subject, body, settings.DEFAULT_FROM_EMAIL, [email],
+            connection=connection,
+        ))
+        if len(batch) == settings.EMAIL_BATCH_SIZE:
+            connection.send_messages(batch)
+            batch = []
+    if batch:
+        connection.send_messages(batch)
@@ -0,0 +1,109 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from posts.counters import refresh_comment_counts
+from posts.models import Comment, Follow, Group, Post
+from posts.rendering import derived_fields
+
+User = get_user_model()
+
+SEED_AUTHORS = 6
+SEED_GROUPS = 3
+SEED_POSTS = 150
+SEED_COMMENTED_POSTS = 20
+SEED_MODELS = (User, Group, Post, Comment, Follow)
+
+_snapshot = None
+
+
+def seed():
+    # Every third post has no group; the reader follows half the authors.
+    # bulk_create() does not set primary keys on SQLite, hence the reloads.
+    User.objects.bulk_create(
+        User(username=f'seed_author_{number}')
+        for number in range(SEED_AUTHORS)
+    )
+    authors = list(User.objects.filter(
+        username__startswith='seed_author_'
+    ).order_by('id'))
+    reader = User.objects.create(username='seed_reader')
+    Group.objects.bulk_create(
+        Group(
+            title=f'Группа {number}',
+            slug=f'seed-group-{number}',
+            description=f'Описание группы {number}',
+        )
+        for number in range(SEED_GROUPS)
+    )
+    groups = list(
+        Group.objects.filter(slug__startswith='seed-group-').order_by('id')
+    )
+    Post.objects.bulk_create(
+        Post(
+            author=authors[number % SEED_AUTHORS],
+            group=None if number % 3 == 2 else groups[number % SEED_GROUPS],
+            text=f'Пост {number}',
+            **derived_fields(f'Пост {number}'),
+        )
+        for number in range(SEED_POSTS)
+    )
+    Follow.objects.bulk_create(
+        Follow(user=reader, author=author)
+        for author in authors[:SEED_AUTHORS // 2]
+    )
+    commented = list(Post.objects.order_by('id')[:SEED_COMMENTED_POSTS])
+    Comment.objects.bulk_create(
+        Comment(post=post, author=reader, text=f'Комментарий {post.pk}')
+        for post in commented
+    )
+    refresh_comment_counts(Post.objects.all())
+
+
+def take_snapshot():
+    snapshot = []
+    with connection.cursor() as cursor:
+        for model in SEED_MODELS:
+            table = connection.ops.quote_name(model._meta.db_table)
+            cursor.execute(f'SELECT * FROM {table}')
+            columns = [column[0] for column in cursor.description]
+            snapshot.append((table, columns, cursor.fetchall()))
+    return snapshot
+
+
+def restore_snapshot(snapshot):
+    # Raw inserts keep the ids and dates and skip signals and auto_now.
+    with connection.cursor() as cursor:
+        for table, columns, rows in snapshot:
+            if not rows:
+                continue
+            names = ', '.join(connection.ops.quote_name(c) for c in columns)
+            values = ', '.join(['%s'] * len(columns))
+            cursor.executemany(
+                f'INSERT INTO {table} ({names}) VALUES ({values})', rows
+            )
+
+
+def load_seed():
+    # The dataset is built once per process (one per parallel worker) and
+    # then copied from the snapshot into every class that needs it.
+    global _snapshot
+    if _snapshot is None:
+        seed()
+        _snapshot = take_snapshot()
+    else:
+        restore_snapshot(_snapshot)
+
+
+class SeededTestCase(TestCase):
+    # The seeded rows live in the class transaction and every test is
+    # rolled back to them, so tests never rebuild the data in setUp.
+    @classmethod
+    def setUpTestData(cls):
+        load_seed()
+        cls.reader = User.objects.get(username='seed_reader')
+        cls.authors = list(User.objects.filter(
+            username__startswith='seed_author_'
+        ).order_by('id'))
+        cls.groups = list(
+            Group.objects.filter(slug__startswith='seed-group-').order_by('id')
+        )
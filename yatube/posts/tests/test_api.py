@@ -0,0 +1,108 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Comment, Follow, Group, Post
+
+User = get_user_model()
+
+
+class PostsApiTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_api')
+        cls.group = Group.objects.create(
+            title='Тестовая группа API',
+            slug='test-slug-api',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(
+                author=cls.user, group=cls.group, text=f'Пост API {number}'
+            )
+            for number in range(5)
+        ]
+        Comment.objects.create(
+            post=cls.posts[0], author=cls.user, text='Комментарий API'
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_feed_pages_with_cursor(self):
+        url = reverse('posts:api_index')
+        first = self.client.get(url, {'limit': 3}).json()
+        second = self.client.get(
+            url, {'limit': 3, 'cursor': first['next']}
+        ).json()
+        ids = [post['id'] for post in first['results'] + second['results']]
+        self.assertEqual(ids, [post.id for post in self.posts[::-1]])
+        self.assertIsNone(second['next'])
+
+    def test_fields_limit_loaded_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('posts:api_index'), {'fields': 'id,author'}
+            )
+        self.assertEqual(
+            response.json()['results'][0],
+            {'id': self.posts[-1].id, 'author': 'test_user_api'},
+        )
+        sql = queries.captured_queries[-1]['sql']
+        self.assertNotIn('"posts_post"."text"', sql)
+        self.assertNotIn('posts_group', sql)
+
+    def test_text_is_loaded_with_the_page(self):
+        counts = []
+        for limit in (1, 5):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(
+                    reverse('posts:api_index'),
+                    {'fields': 'id,text', 'limit': limit},
+                )
+            counts.append(len(queries))
+        self.assertEqual(
+            [post['text'] for post in response.json()['results']],
+            [post.text for post in self.posts[::-1]],
+        )
+        self.assertEqual(counts[0], counts[1])
+
+    def test_unknown_field_and_bad_cursor_are_rejected(self):
+        url = reverse('posts:api_index')
+        for params in ({'fields': 'id,password'}, {'cursor': '!!!'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_etag_returns_not_modified(self):
+        url = reverse('posts:api_post_detail', args=[self.posts[0].id])
+        response = self.client.get(url)
+        self.assertEqual(response.json()['group'], 'test-slug-api')
+        cached = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_comments_group_and_profile(self):
+        comments = self.client.get(
+            reverse('posts:api_post_comments', args=[self.posts[0].id])
+        ).json()
+        self.assertEqual(comments['results'][0]['text'], 'Комментарий API')
+        group = self.client.get(
+            reverse('posts:api_group_list', args=[self.group.slug])
+        ).json()
+        self.assertEqual(len(group['results']), 5)
+        profile = self.client.get(
+            reverse('posts:api_profile', args=[self.user.username])
+        ).json()
+        self.assertEqual(profile['username'], 'test_user_api')
+        self.assertEqual(len(profile['results']), 5)
+
+    def test_follow_feed_requires_login(self):
+        url = reverse('posts:api_follow_index')
+        self.assertEqual(self.client.get(url).status_code, 401)
+        reader = User.objects.create(username='test_reader_api')
+        Follow.objects.create(user=reader, author=self.user)
+        self.client.force_login(reader)
+        self.assertEqual(len(self.client.get(url).json()['results']), 5)
@@ -0,0 +1,150 @@
+from datetime import timedelta
+
+from core.cache import get_version
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from posts.archive import archive_posts
+from posts.models import ArchivedComment, ArchivedPost, Comment, Post
+from posts.pagination import ChainedSequence
+from posts.trending import record_activity, trending_ids
+
+User = get_user_model()
+
+
+class ArchiveTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_archive')
+        cls.old_posts = [
+            Post.objects.create(author=cls.user, text=f'Старый пост {number}')
+            for number in range(3)
+        ]
+        Post.objects.filter(
+            id__in=[post.id for post in cls.old_posts]
+        ).update(pub_date=timezone.now() - timedelta(days=800))
+        cls.new_post = Post.objects.create(author=cls.user, text='Новый пост')
+        Comment.objects.create(
+            post=cls.old_posts[0], author=cls.user, text='Старый комментарий'
+        )
+
+    def setUp(self):
+        self.client = Client()
+
+    def archive(self):
+        return archive_posts(
+            timezone.now() - timedelta(days=365), batch_size=2
+        )
+
+    def test_old_posts_move_to_archive_in_batches(self):
+        self.assertEqual(self.archive(), (3, 1))
+        self.assertEqual(list(Post.objects.all()), [self.new_post])
+        self.assertEqual(ArchivedPost.objects.count(), 3)
+        archived = ArchivedPost.objects.get(id=self.old_posts[0].id)
+        self.assertEqual(archived.comment_count, 1)
+        self.assertEqual(
+            ArchivedComment.objects.get().post_id, self.old_posts[0].id
+        )
+        self.assertFalse(Comment.objects.exists())
+
+    def test_archiving_does_not_touch_comments_one_by_one(self):
+        for number in range(5):
+            Comment.objects.create(
+                post=self.old_posts[1], author=self.user,
+                text=f'Комментарий {number}',
+            )
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.archive(), (3, 6))
+        for query in queries.captured_queries:
+            self.assertNotIn('UPDATE "posts_post"', query['sql'])
+        self.assertEqual(
+            ArchivedPost.objects.get(id=self.old_posts[1].id).comment_count,
+            5,
+        )
+
+    def test_archived_posts_leave_feeds_and_trending(self):
+        cache.clear()
+        record_activity([
+            (self.old_posts[0].id, None, 5), (self.new_post.id, None, 1),
+        ])
+        author_scope = f'feed:author:{self.user.id}'
+        version = get_version(author_scope)
+        self.archive()
+        self.assertGreater(get_version(author_scope), version)
+        self.assertEqual(trending_ids(), [self.new_post.id])
+
+    def test_post_detail_falls_back_to_archive(self):
+        self.archive()
+        response = self.client.get(
+            reverse('posts:post_detail', args=[self.old_posts[0].id])
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['post'].is_archived)
+        self.assertEqual(
+            [comment.text for comment in response.context['comments']],
+            ['Старый комментарий'],
+        )
+        self.assertNotContains(
+            response, reverse('posts:add_comment', args=[self.old_posts[0].id])
+        )
+
+    def test_archived_post_does_not_accept_comments(self):
+        self.archive()
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse('posts:add_comment', args=[self.old_posts[0].id]),
+            {'text': 'Новый комментарий'},
+        )
+        self.assertFalse(Comment.objects.exists())
+        self.assertEqual(ArchivedComment.objects.count(), 1)
+
+    def test_profile_continues_into_archive(self):
+        self.archive()
+        response = self.client.get(
+            reverse('posts:profile', args=[self.user.username])
+        )
+        self.assertEqual(response.context['count_posts'], 4)
+        self.assertEqual(
+            [post.id for post in response.context['page_obj']],
+            [self.new_post.id] + [post.id for post in self.old_posts[::-1]],
+        )
+
+    def test_chained_sequence_slices_span_parts(self):
+        self.archive()
+        sequence = ChainedSequence(
+            Post.objects.none(),
+            self.user.posts.all(),
+            self.user.archived_posts.order_by('id'),
+        )
+        self.assertEqual(len(sequence), 4)
+        self.assertEqual(
+            [post.id for post in sequence[0:2]],
+            [self.new_post.id, self.old_posts[0].id],
+        )
+        self.assertEqual(sequence[3].id, self.old_posts[2].id)
+        page = Paginator(sequence, 3).page(2)
+        self.assertEqual([post.id for post in page], [self.old_posts[2].id])
+
+    def test_profile_api_continues_into_archive(self):
+        self.archive()
+        url = reverse('posts:api_profile', args=[self.user.username])
+        ids, cursor = [], None
+        while True:
+            params = {'limit': 3, 'fields': 'id'}
+            if cursor:
+                params['cursor'] = cursor
+            data = self.client.get(url, params).json()
+            ids += [post['id'] for post in data['results']]
+            cursor = data['next']
+            if cursor is None:
+                break
+        expected = [self.new_post.id]
+        expected += [post.id for post in self.old_posts[::-1]]
+        self.assertEqual(ids, expected)
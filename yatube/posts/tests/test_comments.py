@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from posts.models import Comment, Post
+
+User = get_user_model()
+
+
+@override_settings(COMMENTS_PER_PAGE=3)
+class CommentsPaginationTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_comments')
+        cls.authorised_client = Client()
+        cls.authorised_client.force_login(cls.user)
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост комментариев',
+        )
+        cls.comments = [
+            Comment.objects.create(
+                post=cls.post,
+                author=cls.user,
+                text=f'Тестовый комментарий № {number}',
+            )
+            for number in range(7)
+        ]
+
+    def test_comment_count_follows_comments(self):
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, len(self.comments))
+
+        self.authorised_client.post(
+            reverse('posts:add_comment', kwargs={'post_id': self.post.id}),
+            data={'text': 'Новый комментарий'},
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, len(self.comments) + 1)
+
+        Comment.objects.filter(text='Новый комментарий').delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.comment_count, len(self.comments))
+
+    def test_post_detail_shows_first_page(self):
+        response = self.authorised_client.get(
+            reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        )
+        comments = response.context['comments']
+        self.assertEqual(
+            [comment.id for comment in comments],
+            [comment.id for comment in reversed(self.comments)][:3],
+        )
+        self.assertTrue(response.context['comments_page'].has_next())
+
+    def test_cursor_walks_all_comments(self):
+        url = reverse('posts:post_comments', kwargs={'post_id': self.post.id})
+        cursor = ''
+        seen = []
+        while True:
+            response = self.authorised_client.get(
+                url, {'cursor': cursor, 'format': 'json'}
+            )
+            self.assertEqual(response.status_code, HTTPStatus.OK)
+            seen.extend(
+                comment.id for comment in response.context['comments']
+            )
+            cursor = response.json()['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(
+            seen, [comment.id for comment in reversed(self.comments)]
+        )
+        self.assertEqual(response.json()['count'], len(self.comments))
+
+    def test_invalid_cursor_returns_first_page(self):
+        response = self.authorised_client.get(
+            reverse('posts:post_comments', kwargs={'post_id': self.post.id}),
+            {'cursor': 'not-a-cursor'},
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertContains(response, 'Тестовый комментарий № 6')
@@ -0,0 +1,72 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.counters import view_counter
+from posts.models import Post
+
+User = get_user_model()
+
+
+@override_settings(
+    VIEW_COUNT_FLUSH_THRESHOLD=3,
+    VIEW_COUNT_FLUSH_INTERVAL=3600,
+)
+class ViewCounterTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.guest_client = Client()
+        cls.user = User.objects.create(username='test_user_counters')
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовый пост просмотров',
+        )
+        cls.another_post = Post.objects.create(
+            author=cls.user,
+            text='Другой тестовый пост просмотров',
+        )
+
+    def setUp(self):
+        view_counter.reset()
+
+    def test_views_are_buffered_until_threshold(self):
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        self.guest_client.get(url)
+        response = self.guest_client.get(url)
+
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 0)
+        self.assertEqual(response.context['view_count'], 2)
+
+        self.guest_client.get(url)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 3)
+
+    def test_view_that_flushes_is_still_shown(self):
+        url = reverse('posts:post_detail', kwargs={'post_id': self.post.id})
+        self.guest_client.get(url)
+        self.guest_client.get(url)
+        response = self.guest_client.get(url)
+        self.assertEqual(response.context['view_count'], 3)
+        with self.settings(VIEW_COUNT_FLUSH_THRESHOLD=1):
+            response = self.guest_client.get(url)
+        self.assertEqual(response.context['view_count'], 4)
+
+    def test_flush_writes_all_posts_in_one_batch(self):
+        view_counter.incr(self.post.id)
+        view_counter.incr(self.another_post.id)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(view_counter.flush(), 2)
+        updates = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('UPDATE')
+        ]
+        self.assertEqual(len(updates), 1)
+        self.post.refresh_from_db()
+        self.another_post.refresh_from_db()
+        self.assertEqual(self.post.view_count, 1)
+        self.assertEqual(self.another_post.view_count, 1)
+        self.assertEqual(view_counter.pending(self.post.id), 0)
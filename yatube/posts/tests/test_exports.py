@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from posts.models import Comment, Follow, Post
+
+User = get_user_model()
+
+
+class ExportTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_export')
+        cls.staff = User.objects.create(
+            username='test_staff_export', is_staff=True
+        )
+        cls.staff_client = Client()
+        cls.staff_client.force_login(cls.staff)
+        cls.authorised_client = Client()
+        cls.authorised_client.force_login(cls.user)
+        cls.posts = [
+            Post.objects.create(author=cls.user, text=f'Пост выгрузки {n}')
+            for n in range(5)
+        ]
+        Comment.objects.create(
+            post=cls.posts[0], author=cls.staff, text='Комментарий'
+        )
+        Follow.objects.create(user=cls.staff, author=cls.user)
+
+    def get_export(self, name, **params):
+        response = self.staff_client.get(
+            reverse('posts:export_data', kwargs={'name': name}), params
+        )
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_is_staff_only(self):
+        response = self.authorised_client.get(
+            reverse('posts:export_data', kwargs={'name': 'posts'})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_ndjson_export_with_id_range(self):
+        from_id, to_id = self.posts[1].id, self.posts[3].id
+        lines = self.get_export(
+            'posts', from_id=from_id, to_id=to_id
+        ).splitlines()
+        rows = [json.loads(line) for line in lines]
+        self.assertEqual(
+            [row['id'] for row in rows], list(range(from_id, to_id + 1))
+        )
+        self.assertEqual(rows[0]['text'], 'Пост выгрузки 1')
+        self.assertEqual(rows[0]['status'], Post.PUBLISHED)
+        self.assertIsNone(rows[0]['publish_at'])
+
+    def test_csv_export(self):
+        rows = list(csv.reader(io.StringIO(
+            self.get_export('comments', format='csv')
+        )))
+        self.assertEqual(rows[0][:2], ['id', 'post_id'])
+        self.assertEqual(rows[1][3], 'Комментарий')
+
+    def test_unknown_export_is_not_found(self):
+        response = self.staff_client.get(
+            reverse('posts:export_data', kwargs={'name': 'users'})
+        )
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_command_writes_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'follows.ndjson')
+            call_command('export_data', 'follows', output=path,
+                         stderr=io.StringIO())
+            with open(path, encoding='utf-8') as export:
+                rows = [json.loads(line) for line in export]
+        self.assertEqual(rows[0]['user_id'], self.staff.id)
@@ -0,0 +1,96 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Group, Post
+
+User = get_user_model()
+
+
+class FeedsTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_feeds')
+        cls.group = Group.objects.create(
+            title='Тестовая группа лент',
+            slug='test-slug-feeds',
+            description='Тестовое описание',
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, group=cls.group, text='Пост для ленты'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def test_feeds_render_posts(self):
+        urls = (
+            reverse('posts:feed'),
+            reverse('posts:feed_atom'),
+            reverse('posts:group_feed', args=[self.group.slug]),
+            reverse('posts:group_feed_atom', args=[self.group.slug]),
+            reverse('posts:profile_feed', args=[self.user.username]),
+            reverse('posts:profile_feed_atom', args=[self.user.username]),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertContains(response, 'Пост для ленты')
+
+    def test_feed_items_load_the_full_text(self):
+        Post.objects.create(author=self.user, text='Ещё один пост')
+        with self.assertNumQueries(1):
+            self.client.get(reverse('posts:feed'))
+
+    def test_unknown_group_is_not_found(self):
+        response = self.client.get(reverse('posts:group_feed', args=['no']))
+        self.assertEqual(response.status_code, 404)
+
+    def test_feed_is_cached_until_new_post_in_scope(self):
+        url = reverse('posts:group_feed', args=[self.group.slug])
+        response = self.client.get(url)
+        Post.objects.filter(id=self.post.id).update(text='Тихая правка')
+        self.assertContains(self.client.get(url), 'Пост для ленты')
+
+        Post.objects.create(author=self.user, text='Пост без группы')
+        self.assertEqual(
+            self.client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            ).status_code,
+            304,
+        )
+
+        Post.objects.create(
+            author=self.user, group=self.group, text='Новый пост группы'
+        )
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertContains(fresh, 'Новый пост группы')
+        self.assertContains(fresh, 'Тихая правка')
+
+    def test_post_moved_out_of_group_leaves_its_feed(self):
+        url = reverse('posts:group_feed', args=[self.group.slug])
+        response = self.client.get(url)
+        post = Post.objects.get(id=self.post.id)
+        post.group = None
+        with CaptureQueriesContext(connection) as queries:
+            post.save()
+        for query in queries:
+            self.assertNotIn('"auth_user"', query['sql'])
+        fresh = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(fresh.status_code, 200)
+        self.assertNotContains(fresh, 'Пост для ленты')
+
+    def test_if_modified_since_returns_not_modified(self):
+        url = reverse('posts:feed')
+        response = self.client.get(url)
+        cached = self.client.get(
+            url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(cached.status_code, 304)
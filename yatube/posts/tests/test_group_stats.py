@@ -0,0 +1,134 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from posts.counters import refresh_group_stats
+from posts.models import Group, GroupStats, Post
+from posts.publishing import publish_due
+
+User = get_user_model()
+
+
+@override_settings(GROUP_TOP_AUTHORS=2)
+class GroupStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [
+            User.objects.create(username=f'test_group_author_{number}')
+            for number in range(3)
+        ]
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='stats-group',
+            description='Тестовое описание',
+        )
+        cls.empty_group = Group.objects.create(
+            title='Пустая группа', slug='empty-group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def create_post(self, author, **kwargs):
+        return Post.objects.create(
+            author=author, group=self.group, text='Тестовый пост', **kwargs
+        )
+
+    def test_posts_keep_stats_current(self):
+        for author, posts in zip(self.authors, (1, 3, 2)):
+            for _ in range(posts):
+                last = self.create_post(author)
+        self.create_post(self.authors[0], status=Post.DRAFT)
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 6)
+        self.assertEqual(stats.last_post, last.pub_date)
+        self.assertEqual(stats.top_author_names, [])
+        refresh_group_stats()
+        stats.refresh_from_db()
+        self.assertEqual(stats.top_author_names, [
+            self.authors[1].username, self.authors[2].username,
+        ])
+        last.delete()
+        stats.refresh_from_db()
+        self.assertEqual(stats.post_count, 5)
+        self.assertLess(stats.last_post, last.pub_date)
+
+    def test_moved_post_changes_both_groups(self):
+        post = self.create_post(self.authors[0])
+        with CaptureQueriesContext(connection) as queries:
+            post.group = self.empty_group
+            post.save()
+        counts = dict(GroupStats.objects.values_list('group', 'post_count'))
+        self.assertEqual(counts, {self.group.id: 0, self.empty_group.id: 1})
+        self.assertIsNone(GroupStats.objects.get(group=self.group).last_post)
+        for query in queries:
+            self.assertNotIn('COUNT(', query['sql'])
+
+    def test_unpublishing_removes_the_post(self):
+        post = self.create_post(self.authors[0])
+        post.status = Post.DRAFT
+        post.save()
+        post.text = 'Правка черновика'
+        post.save()
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 0)
+
+    def test_scheduled_posts_count_once_published(self):
+        now = timezone.now()
+        post = self.create_post(
+            self.authors[0], status=Post.SCHEDULED,
+            publish_at=now + timedelta(minutes=1),
+        )
+        self.assertFalse(GroupStats.objects.filter(group=self.group).exists())
+        publish_due(now + timedelta(minutes=2))
+        stats = GroupStats.objects.get(group=self.group)
+        self.assertEqual(stats.post_count, 1)
+        self.assertEqual(stats.last_post, post.publish_at)
+
+    def test_command_rebuilds_every_group(self):
+        self.create_post(self.authors[0])
+        GroupStats.objects.all().delete()
+        out = StringIO()
+        call_command('refresh_group_stats', stdout=out)
+        self.assertIn('Обновлена статистика групп: 2', out.getvalue())
+        counts = dict(GroupStats.objects.values_list('group', 'post_count'))
+        self.assertEqual(counts, {self.group.id: 1, self.empty_group.id: 0})
+
+    def get_directory(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = Client().get(reverse('posts:group_index'))
+        return response, [query['sql'] for query in queries]
+
+    def test_directory_does_not_query_posts(self):
+        self.create_post(self.authors[0])
+        refresh_group_stats()
+        response, queries = self.get_directory()
+        self.assertEqual(
+            list(response.context['page_obj']),
+            [self.empty_group, self.group],
+        )
+        self.assertContains(response, 'Записей: 1')
+        self.assertContains(
+            response,
+            reverse('posts:profile', args=[self.authors[0].username]),
+        )
+        for number in range(5):
+            group = Group.objects.create(
+                title=f'Группа {number}', slug=f'more-group-{number}',
+                description='Тестовое описание',
+            )
+            Post.objects.create(
+                author=self.authors[1], group=group, text='Тестовый пост'
+            )
+        _, more_queries = self.get_directory()
+        self.assertEqual(len(more_queries), len(queries))
+        for sql in more_queries:
+            self.assertNotIn('"posts_post"', sql)
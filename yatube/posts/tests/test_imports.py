@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from posts.imports import import_stream
+from posts.models import Comment, Group, Post
+
+User = get_user_model()
+
+
+class ImportPostsTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_import')
+        cls.group = Group.objects.create(
+            title='Тестовая группа импорта',
+            slug='test-slug-import',
+            description='Тестовое описание',
+        )
+
+    def lines(self):
+        records = [
+            {'type': 'post', 'id': 'a1', 'author': 'test_user_import',
+             'group': 'test-slug-import', 'text': 'Первый пост',
+             'pub_date': '2015-03-01T10:00:00+00:00'},
+            {'type': 'post', 'id': 'a2', 'author': 'new_author_import',
+             'group': 'unknown-group', 'text': 'Второй пост'},
+            {'type': 'comment', 'post': 'a1', 'author': 'new_author_import',
+             'text': 'Комментарий', 'created': '2015-03-02T10:00:00'},
+            {'type': 'comment', 'post': 'a1', 'author': 'test_user_import',
+             'text': 'Ещё комментарий'},
+            {'type': 'comment', 'post': 'missing', 'author': 'x',
+             'text': 'Потерянный комментарий'},
+            {'type': 'post', 'id': 'a3', 'text': 'Пост без автора'},
+            {'type': 'post', 'id': 'a4', 'author': 'test_user_import',
+             'text': 'Запланированный пост', 'status': 'scheduled',
+             'publish_at': '2030-01-01T09:00:00+00:00'},
+            {'type': 'post', 'id': 'a5', 'author': 'test_user_import',
+             'text': 'Пост с чужим статусом', 'status': 'hidden'},
+        ]
+        return [json.dumps(record) + '\n' for record in records]
+
+    def test_import_creates_posts_comments_and_authors(self):
+        stats = import_stream(self.lines(), batch_size=2)
+        self.assertEqual(stats, {
+            'posts': 3, 'comments': 2, 'users': 1, 'skipped': 3,
+        })
+        self.assertFalse(User.objects.filter(username='x').exists())
+        first = Post.objects.get(text='Первый пост')
+        self.assertEqual(first.group, self.group)
+        self.assertEqual(first.pub_date.year, 2015)
+        self.assertEqual(first.comment_count, 2)
+        self.assertEqual(
+            Comment.objects.get(text='Комментарий').created.day, 2
+        )
+        second = Post.objects.get(text='Второй пост')
+        self.assertIsNone(second.group)
+        self.assertEqual(second.author.username, 'new_author_import')
+        self.assertFalse(second.author.has_usable_password())
+        self.assertEqual(second.status, Post.PUBLISHED)
+        self.assertIsNone(second.publish_at)
+        scheduled = Post.objects.get(text='Запланированный пост')
+        self.assertEqual(scheduled.status, Post.SCHEDULED)
+        self.assertEqual(scheduled.publish_at.year, 2030)
+
+    def test_dates_are_kept_without_touching_the_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            import_stream(self.lines())
+        # Every row is written once, with its dates.
+        for query in queries.captured_queries:
+            self.assertNotIn('"pub_date" = ', query['sql'])
+            self.assertNotIn('UPDATE "posts_comment"', query['sql'])
+        self.assertTrue(Post._meta.get_field('pub_date').auto_now_add)
+        self.assertEqual(
+            Post.objects.get(text='Первый пост').pub_date.year, 2015
+        )
+        self.assertGreater(
+            Post.objects.get(text='Второй пост').pub_date.year, 2015
+        )
+
+    def test_command_reports_progress(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'posts.ndjson')
+            with open(path, 'w', encoding='utf-8') as source:
+                source.writelines(self.lines())
+            call_command('import_posts', path, stdout=out)
+        self.assertIn('записей/с', out.getvalue())
+        self.assertIn('Готово: постов 3', out.getvalue())
@@ -1,5 +1,6 @@
 from django.contrib.auth import get_user_model
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django.urls import reverse
 
 from ..models import Group, Post
 
@@ -32,3 +33,33 @@ class PostModelTest(TestCase):
         for expected_name, actual_name in object_names.items():
             with self.subTest(expected_name=expected_name):
                 self.assertEqual(expected_name, actual_name)
+
+    @override_settings(POST_EXCERPT_LENGTH=20)
+    def test_derived_text_is_computed_on_save(self):
+        post = Post.objects.create(
+            author=self.user,
+            text=(
+                'Смотрите <b>тут</b>: https://example.com\n'
+                'и ещё немного текста'
+            ),
+        )
+        self.assertEqual(post.excerpt, 'Смотрите <b>тут</b>…')
+        self.assertEqual(post.word_count, 7)
+        self.assertEqual(
+            post.text_html,
+            '<p>Смотрите &lt;b&gt;тут&lt;/b&gt;: '
+            '<a href="https://example.com" rel="nofollow">'
+            'https://example.com</a><br>и ещё немного текста</p>',
+        )
+        post.text = 'Новый текст'
+        post.save(update_fields=['text'])
+        post.refresh_from_db()
+        self.assertEqual(
+            (post.excerpt, post.word_count), ('Новый текст', 2)
+        )
+
+    def test_feeds_do_not_load_the_full_text(self):
+        response = self.client.get(reverse('posts:index'))
+        post = response.context['page_obj'][0]
+        self.assertEqual(post.get_deferred_fields(), {'text', 'text_html'})
+        self.assertContains(response, self.post.excerpt)
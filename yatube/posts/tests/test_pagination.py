@@ -0,0 +1,137 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.models import Post
+from posts.pagination import CachedCountPaginator, ElidedPaginator
+from posts.tests.seed import SEED_POSTS, SeededTestCase
+
+ELLIPSIS = ElidedPaginator.ELLIPSIS
+
+
+class ElidedPaginatorTests(SimpleTestCase):
+
+    def page_range(self, number, num_pages):
+        paginator = ElidedPaginator(range(num_pages * 10), 10)
+        return list(paginator.get_elided_page_range(number))
+
+    def test_short_range_is_not_elided(self):
+        self.assertEqual(self.page_range(3, 6), [1, 2, 3, 4, 5, 6])
+
+    def test_long_range_is_windowed(self):
+        self.assertEqual(
+            self.page_range(1, 10000), [1, 2, 3, ELLIPSIS, 10000]
+        )
+        self.assertEqual(
+            self.page_range(500, 10000),
+            [1, ELLIPSIS, 498, 499, 500, 501, 502, ELLIPSIS, 10000],
+        )
+        self.assertEqual(
+            self.page_range(10000, 10000), [1, ELLIPSIS, 9998, 9999, 10000]
+        )
+
+
+class CachedCountPaginatorTests(SeededTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def count(self, queryset):
+        with CaptureQueriesContext(connection) as queries:
+            count = CachedCountPaginator(queryset, 10).count
+        counted = [
+            query for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+        return count, len(counted)
+
+    def test_count_is_cached_until_posts_change(self):
+        author = self.authors[0]
+        posts = author.posts.all()
+        total = SEED_POSTS // len(self.authors)
+        self.assertEqual(self.count(posts), (total, 1))
+        self.assertEqual(self.count(posts), (total, 0))
+        Post.objects.create(author=author, text='Новый пост')
+        self.assertEqual(self.count(posts), (total + 1, 1))
+        Post.objects.filter(author=author).first().delete()
+        self.assertEqual(self.count(posts), (total, 1))
+
+    def test_bulk_created_posts_change_the_count(self):
+        posts = Post.objects.all()
+        self.assertEqual(self.count(posts), (SEED_POSTS, 1))
+        Post.objects.bulk_create([Post(author=self.reader, text='Пачка')])
+        self.assertEqual(self.count(posts), (SEED_POSTS + 1, 1))
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+    def test_large_tables_use_the_estimate(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        paginator = CachedCountPaginator(Post.objects.all(), 2)
+        self.assertEqual(self.count(Post.objects.all()), (SEED_POSTS, 0))
+        self.assertEqual(paginator.count, SEED_POSTS)
+        self.assertTrue(paginator.count_is_estimated)
+        author_posts = self.authors[0].posts.all()
+        self.assertEqual(
+            self.count(author_posts), (SEED_POSTS // len(self.authors), 1)
+        )
+
+    @override_settings(COUNT_ESTIMATE_THRESHOLD=1)
+    def test_index_uses_the_estimate_minus_hidden_posts(self):
+        Post.objects.create(
+            author=self.reader, text='Черновик', status=Post.DRAFT
+        )
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        with CaptureQueriesContext(connection) as queries:
+            response = Client().get(reverse('posts:index'))
+        paginator = response.context['page_obj'].paginator
+        self.assertEqual(paginator.count, SEED_POSTS)
+        self.assertTrue(paginator.count_is_estimated)
+        counted = [
+            query['sql'] for query in queries.captured_queries
+            if 'COUNT(' in query['sql']
+        ]
+        self.assertEqual(len(counted), 1)
+        self.assertIn('"status" IN', counted[0])
+        # The signature of the cached exact count is not computed.
+        for query in queries.captured_queries:
+            self.assertNotIn('MAX("posts_post"."id")', query['sql'])
+
+
+class SeededFeedPaginationTests(SeededTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_feed_renders_windowed_links(self):
+        response = Client().get(reverse('posts:index'), {'page': 8})
+        self.assertContains(response, '?page=10"')
+        self.assertNotContains(response, '?page=11"')
+        self.assertContains(response, ELLIPSIS, count=2)
+
+    def test_api_cursor_walks_the_whole_feed_once(self):
+        seen, cursor = [], None
+        while True:
+            params = {'limit': 40, 'fields': 'id'}
+            if cursor:
+                params['cursor'] = cursor
+            data = Client().get(reverse('posts:api_index'), params).json()
+            seen += [post['id'] for post in data['results']]
+            cursor = data['next']
+            if not cursor:
+                break
+        self.assertEqual(len(seen), SEED_POSTS)
+        self.assertEqual(
+            seen, list(Post.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            ))
+        )
+
+    def test_follow_feed_counts_followed_authors_only(self):
+        client = Client()
+        client.force_login(self.reader)
+        response = client.get(reverse('posts:follow_index'))
+        self.assertEqual(
+            response.context['page_obj'].paginator.count, SEED_POSTS // 2
+        )
@@ -0,0 +1,170 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from core.cache import get_version
+from core.models import Task
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from posts.forms import LOCAL_FORMAT, PublishingForm
+from posts.models import Group, GroupStats, Post
+from posts.pagination import COUNTS_SCOPE
+from posts.publishing import publish_due, publish_scheduled
+
+User = get_user_model()
+
+
+class PublishingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create(username='test_user_publishing')
+        cls.reader = User.objects.create(username='test_reader_publishing')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='publishing-group',
+            description='Тестовое описание',
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.author_client = Client()
+        self.author_client.force_login(self.author)
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def create_post(self, status, publish_at=None, text='Тестовый пост'):
+        return Post.objects.create(
+            author=self.author, group=self.group, text=text,
+            status=status, publish_at=publish_at,
+        )
+
+    def test_draft_is_hidden_from_feeds_and_other_users(self):
+        draft = self.create_post(Post.DRAFT, text='Черновик поста')
+        feeds = (
+            reverse('posts:index'),
+            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
+            reverse(
+                'posts:profile', kwargs={'username': self.author.username}
+            ),
+        )
+        for address in feeds:
+            with self.subTest(address=address):
+                response = self.reader_client.get(address)
+                self.assertNotIn(draft, response.context['page_obj'])
+        detail = reverse('posts:post_detail', kwargs={'post_id': draft.id})
+        self.assertEqual(self.reader_client.get(detail).status_code, 404)
+        response = self.author_client.get(detail)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Пост видите только вы.')
+
+    def test_author_sees_drafts_on_profile(self):
+        draft = self.create_post(Post.DRAFT)
+        address = reverse(
+            'posts:profile', kwargs={'username': self.author.username}
+        )
+        response = self.author_client.get(address)
+        self.assertEqual(list(response.context['drafts']), [draft])
+        response = self.reader_client.get(address)
+        self.assertIsNone(response.context['drafts'])
+
+    def test_publish_due_publishes_in_batches(self):
+        now = timezone.now()
+        due = [
+            self.create_post(Post.SCHEDULED, now - timedelta(minutes=number))
+            for number in range(1, 4)
+        ]
+        later = self.create_post(Post.SCHEDULED, now + timedelta(hours=1))
+        index_version = get_version('feed:index')
+        counts_version = get_version(COUNTS_SCOPE)
+        self.assertEqual(publish_due(now, batch_size=2), 2)
+        self.assertEqual(publish_scheduled(now, batch_size=2), 1)
+        for post in due:
+            post.refresh_from_db()
+            self.assertEqual(post.status, Post.PUBLISHED)
+            self.assertEqual(post.pub_date, post.publish_at)
+        later.refresh_from_db()
+        self.assertEqual(later.status, Post.SCHEDULED)
+        self.assertGreater(get_version('feed:index'), index_version)
+        self.assertGreater(get_version(COUNTS_SCOPE), counts_version)
+        self.assertEqual(
+            Task.objects.filter(
+                idempotency_key__startswith='notify_followers:'
+            ).count(),
+            len(due),
+        )
+
+    def test_posts_published_meanwhile_get_no_side_effects(self):
+        now = timezone.now()
+        first, second = (
+            self.create_post(Post.SCHEDULED, now - timedelta(minutes=1))
+            for _ in range(2)
+        )
+        real_now = timezone.now
+
+        def publish_first_elsewhere():
+            # Another scheduler wins the race for the first post.
+            Post.objects.filter(id=first.id).update(
+                status=Post.PUBLISHED, updated=now - timedelta(seconds=1)
+            )
+            return real_now()
+
+        started = real_now()
+        with mock.patch('posts.publishing.timezone.now',
+                        side_effect=publish_first_elsewhere):
+            self.assertEqual(publish_due(now), 1)
+        self.assertEqual(
+            GroupStats.objects.get(group=self.group).post_count, 1
+        )
+        self.assertEqual(
+            list(Task.objects.filter(
+                idempotency_key__startswith='notify_followers:'
+            ).values_list('idempotency_key', flat=True)),
+            [f'notify_followers:{second.id}'],
+        )
+        second.refresh_from_db()
+        self.assertGreaterEqual(second.updated, started)
+
+    def test_command_publishes_due_posts(self):
+        post = self.create_post(
+            Post.SCHEDULED, timezone.now() - timedelta(minutes=1)
+        )
+        out = StringIO()
+        call_command('publish_scheduled', stdout=out)
+        self.assertIn('Опубликовано постов: 1', out.getvalue())
+        self.assertTrue(Post.objects.published().filter(id=post.id).exists())
+
+    def test_scheduled_post_needs_future_time(self):
+        past = (timezone.now() - timedelta(hours=1)).strftime(LOCAL_FORMAT)
+        form = PublishingForm(
+            {'status': Post.SCHEDULED, 'publish_at': past},
+            instance=Post(),
+        )
+        self.assertFalse(form.is_valid())
+        self.assertIn('publish_at', form.errors)
+        form = PublishingForm({}, instance=Post(status=Post.DRAFT))
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data['status'], Post.DRAFT)
+
+    def test_create_without_status_publishes(self):
+        self.author_client.post(
+            reverse('posts:post_create'), {'text': 'Сразу в ленте'}
+        )
+        post = Post.objects.get(text='Сразу в ленте')
+        self.assertEqual(post.status, Post.PUBLISHED)
+
+    def test_publishing_a_draft_moves_it_to_the_top(self):
+        draft = self.create_post(Post.DRAFT)
+        Post.objects.filter(id=draft.id).update(
+            pub_date=timezone.now() - timedelta(days=1)
+        )
+        self.create_post(Post.PUBLISHED, text='Старый пост')
+        self.author_client.post(
+            reverse('posts:post_edit', kwargs={'post_id': draft.id}),
+            {'text': draft.text, 'status': Post.PUBLISHED},
+        )
+        response = self.reader_client.get(reverse('posts:index'))
+        self.assertEqual(response.context['page_obj'][0].id, draft.id)
@@ -0,0 +1,140 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from posts.archive import archive_posts
+from posts.models import Group, Post
+from posts.sitemaps import build_sitemaps
+
+User = get_user_model()
+
+
+@override_settings(SITEMAP_SHARD_SIZE=2, SITE_URL='https://yatube.test')
+class SitemapTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_sitemap')
+        cls.group = Group.objects.create(
+            title='Тестовая группа карты',
+            slug='test-slug-sitemap',
+            description='Тестовое описание',
+        )
+        cls.posts = [
+            Post.objects.create(author=cls.user, text=f'Пост {number}')
+            for number in range(3)
+        ]
+
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        override = self.settings(SITEMAP_ROOT=self.root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def read(self, name):
+        with open(os.path.join(self.root, name), encoding='utf-8') as file:
+            return file.read()
+
+    def shard_of(self, post):
+        return f'posts-{post.id // 2}.xml'
+
+    def test_full_build_writes_index_and_shards(self):
+        build_sitemaps()
+        index = self.read('sitemap.xml')
+        self.assertIn(
+            f'https://yatube.test/sitemaps/{self.shard_of(self.posts[0])}',
+            index,
+        )
+        self.assertIn('profiles-', index)
+        self.assertIn(
+            'https://yatube.test/group/test-slug-sitemap/',
+            self.read('groups-0.xml'),
+        )
+        for post in self.posts:
+            self.assertIn(
+                f'https://yatube.test/posts/{post.id}/',
+                self.read(self.shard_of(post)),
+            )
+
+    def test_incremental_build_rewrites_only_changed_shards(self):
+        build_sitemaps()
+        self.assertEqual(build_sitemaps(), [])
+        post = Post.objects.create(author=self.user, text='Новый пост')
+        written = [os.path.basename(path) for path in build_sitemaps()]
+        self.assertIn(self.shard_of(post), written)
+        self.assertIn('profiles-0.xml', written)
+        self.assertNotIn(self.shard_of(self.posts[0]), written)
+        self.assertIn(f'/posts/{post.id}/', self.read(self.shard_of(post)))
+
+        shard, url = self.shard_of(post), f'/posts/{post.id}/'
+        post.delete()
+        build_sitemaps()
+        path = os.path.join(self.root, shard)
+        self.assertFalse(os.path.exists(path) and url in self.read(shard))
+
+    def test_renamed_group_and_user_rewrite_their_shards(self):
+        build_sitemaps()
+        Group.objects.filter(id=self.group.id).update(slug='renamed-slug')
+        User.objects.filter(id=self.user.id).update(username='renamed_user')
+        written = [os.path.basename(path) for path in build_sitemaps()]
+        self.assertIn(f'groups-{self.group.id // 2}.xml', written)
+        self.assertIn(f'profiles-{self.user.id // 2}.xml', written)
+        self.assertIn(
+            '/group/renamed-slug/',
+            self.read(f'groups-{self.group.id // 2}.xml'),
+        )
+
+    def test_unpublished_posts_do_not_change_lastmod(self):
+        Post.objects.filter(author=self.user).update(
+            pub_date=timezone.now() - timedelta(days=30)
+        )
+        build_sitemaps()
+        Post.objects.create(
+            author=self.user, group=self.group, text='Черновик',
+            status=Post.DRAFT,
+        )
+        written = [os.path.basename(path) for path in build_sitemaps()]
+        self.assertNotIn(f'profiles-{self.user.id // 2}.xml', written)
+        self.assertNotIn(f'groups-{self.group.id // 2}.xml', written)
+        self.assertNotIn(
+            timezone.now().date().isoformat(),
+            self.read(f'profiles-{self.user.id // 2}.xml'),
+        )
+
+    def test_archived_posts_use_the_archive_date(self):
+        post = self.posts[0]
+        Post.objects.filter(id=post.id).update(
+            pub_date=timezone.now() - timedelta(days=800)
+        )
+        archive_posts(timezone.now() - timedelta(days=365))
+        build_sitemaps()
+        self.assertIn(
+            f'/posts/{post.id}/</loc><lastmod>'
+            f'{timezone.now().date().isoformat()}</lastmod>',
+            self.read(self.shard_of(post)),
+        )
+
+    def test_files_are_served_from_disk(self):
+        build_sitemaps()
+        client = Client()
+        response = client.get(reverse('posts:sitemap'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            b'sitemapindex', b''.join(response.streaming_content)
+        )
+        name = self.shard_of(self.posts[0])
+        response = client.get(reverse('posts:sitemap_file', args=[name]))
+        self.assertEqual(response.status_code, 200)
+        for name in ('posts-999.xml', 'state.json', f'{name}.tmp'):
+            with self.subTest(name=name):
+                response = client.get(
+                    reverse('posts:sitemap_file', args=[name])
+                )
+                self.assertEqual(response.status_code, 404)
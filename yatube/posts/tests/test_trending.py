@@ -0,0 +1,110 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from posts.counters import view_counter
+from posts.models import Group, Post
+from posts.trending import add_score, log_weight, record_activity, trending_ids
+
+User = get_user_model()
+HOUR = 60 * 60
+
+
+@override_settings(TRENDING_HALF_LIFE=HOUR, TRENDING_CAPACITY=3)
+class TrendingScoreTests(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_old_activity_decays(self):
+        now = 10 * HOUR
+        record_activity([(1, None, 4)], now=now - 3 * HOUR)
+        record_activity([(2, None, 1)], now=now)
+        self.assertEqual(trending_ids(), [2, 1])
+        record_activity([(1, None, 2)], now=now)
+        self.assertEqual(trending_ids(), [1, 2])
+
+    def test_top_is_bounded_and_kept_per_group(self):
+        for post_id in range(1, 6):
+            record_activity([(post_id, 7, post_id)], now=0)
+        self.assertEqual(trending_ids(), [5, 4, 3])
+        self.assertEqual(trending_ids(7), [5, 4, 3])
+        self.assertEqual(trending_ids(8), [])
+
+    def test_untracked_post_inherits_the_lowest_score(self):
+        top = {1: log_weight(8, 0), 2: log_weight(2, 0)}
+        add_score(top, 3, log_weight(1, 0), capacity=2)
+        self.assertEqual(set(top), {1, 3})
+        self.assertAlmostEqual(top[3], log_weight(3, 0))
+
+
+@override_settings(VIEW_COUNT_FLUSH_THRESHOLD=1)
+class TrendingViewsTests(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create(username='test_user_trending')
+        cls.group = Group.objects.create(
+            title='Тестовая группа', slug='trending-group',
+            description='Тестовое описание',
+        )
+        cls.quiet_post = Post.objects.create(
+            author=cls.user, text='Тихий пост',
+        )
+        cls.busy_post = Post.objects.create(
+            author=cls.user, text='Обсуждаемый пост', group=cls.group,
+        )
+
+    def setUp(self):
+        cache.clear()
+        view_counter.reset()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_comments_and_views_raise_posts(self):
+        self.client.get(
+            reverse('posts:post_detail', args=[self.quiet_post.id])
+        )
+        self.assertEqual(trending_ids(), [self.quiet_post.id])
+        self.client.post(
+            reverse('posts:add_comment', args=[self.busy_post.id]),
+            {'text': 'Комментарий'},
+        )
+        self.assertEqual(
+            trending_ids(), [self.busy_post.id, self.quiet_post.id]
+        )
+        self.assertEqual(trending_ids(self.group.id), [self.busy_post.id])
+
+    def test_trending_page_does_not_query_comments(self):
+        self.client.post(
+            reverse('posts:add_comment', args=[self.busy_post.id]),
+            {'text': 'Комментарий'},
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(list(response.context['posts']), [self.busy_post])
+        self.assertFalse(any(
+            'posts_comment' in query['sql'] or 'text_html' in query['sql']
+            for query in queries.captured_queries
+        ))
+        response = self.client.get(
+            reverse('posts:group_trending', args=[self.group.slug])
+        )
+        self.assertEqual(list(response.context['posts']), [self.busy_post])
+
+    def test_draft_previews_are_not_recorded(self):
+        draft = Post.objects.create(
+            author=self.user, text='Черновик', status=Post.DRAFT
+        )
+        self.client.get(reverse('posts:post_detail', args=[draft.id]))
+        self.assertEqual(trending_ids(), [])
+
+    def test_deleted_posts_drop_out(self):
+        post = Post.objects.create(author=self.user, text='Удалённый пост')
+        record_activity([(post.id, None, 1)])
+        post.delete()
+        response = self.client.get(reverse('posts:trending'))
+        self.assertEqual(list(response.context['posts']), [])
@@ -10,6 +10,7 @@ from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client, TestCase, override_settings
 from django.urls import reverse
 from posts.models import Follow, Group, Post
+from posts.tests.seed import SeededTestCase
 
 User = get_user_model()
 
@@ -272,62 +273,42 @@ class PostViewsTests(TestCase):
         self.assertEqual(len(response_non_follower.context['page_obj']), 0)
 
 
-class PaginatorViewsTest(TestCase):
+class PaginatorViewsTest(SeededTestCase):
 
     @classmethod
-    def setUpClass(cls):
-        super().setUpClass()
-        cls.guest_client = Client()
-        cls.user = User.objects.create(username='test_user_views_page',)
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.user = cls.authors[0]
+        cls.group = cls.groups[0]
         cls.authorised_client = Client()
-        cls.authorised_client.force_login(cls.user)
-
-        cls.group = Group.objects.create(
-            title='Тестовая группа views',
-            slug='test-slug-views-page',
-            description='Тестовое описание views',
-        )
-
-        cls.posts_quantity = 13
+        cls.authorised_client.force_login(cls.reader)
         cls.posts_per_page = settings.ITEMS_PER_PAGE
-        cls.posts_obj = []
-
-        for pk in range(cls.posts_quantity):
-            cls.posts_obj.append(Post(
-                                 pk=pk,
-                                 text=f'Тестовый пост № {pk}',
-                                 author=cls.user,
-                                 group=cls.group,))
-
-        Post.objects.bulk_create(cls.posts_obj, cls.posts_quantity)
+        cls.feeds = {
+            reverse('posts:index'): Post.objects.count(),
+            reverse('posts:group_list', kwargs={'slug': cls.group.slug}):
+                cls.group.posts.count(),
+            reverse('posts:profile', kwargs={'username': cls.user.username}):
+                cls.user.posts.count(),
+        }
 
     def test_first_page_contains_ten_posts(self):
-        views = (
-            reverse('posts:index'),
-            reverse('posts:group_list', kwargs={'slug': self.group.slug}),
-            reverse('posts:profile', kwargs={'username': self.user.username}),
-        )
-        for view in views:
+        for view in self.feeds:
             with self.subTest(view=view):
                 response = self.authorised_client.get(view)
                 self.assertEqual(
                     len(response.context['page_obj']), self.posts_per_page
                 )
 
-    def test_second_page_contains_left_posts(self):
-        group = self.group.slug
-        user = self.user.username
-        views = (
-            f'{reverse("posts:index")}?page=2',
-            f'{reverse("posts:group_list", kwargs={"slug": group})}'
-            f'?page=2',
-            f'{reverse("posts:profile", kwargs={"username": user})}'
-            f'?page=2',
-        )
-        for view in views:
+    def test_last_page_contains_left_posts(self):
+        for view, posts_quantity in self.feeds.items():
+            last_page = -(-posts_quantity // self.posts_per_page)
+            left_posts = posts_quantity - (
+                (last_page - 1) * self.posts_per_page
+            )
             with self.subTest(view=view):
-                response = self.authorised_client.get(view)
+                response = self.authorised_client.get(
+                    view, {'page': last_page}
+                )
                 self.assertEqual(
-                    len(response.context['page_obj']),
-                    int(self.posts_quantity - self.posts_per_page)
+                    len(response.context['page_obj']), left_posts
                 )
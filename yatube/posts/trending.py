@@ -0,0 +1,90 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+GLOBAL = 'global'
+
+
+def trending_key(group_id=None):
+    return f'trending:{GLOBAL if group_id is None else group_id}'
+
+
+def log_weight(weight, now=None):
+    # Scores decay by half every TRENDING_HALF_LIFE seconds. Instead of
+    # decaying every stored score, new activity is weighted by 2 ** (t / h)
+    # and kept in log2 form, so old and new scores compare directly.
+    now = time.time() if now is None else now
+    return math.log2(weight) + now / settings.TRENDING_HALF_LIFE
+
+
+def log_add(a, b):
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def add_score(top, post_id, score, capacity):
+    # Space-Saving: a post that is not tracked replaces the lowest one and
+    # inherits its score, so the structure never exceeds capacity and a
+    # post that is really trending cannot be pushed out by the rest.
+    if post_id in top:
+        top[post_id] = log_add(top[post_id], score)
+    elif len(top) < capacity:
+        top[post_id] = score
+    else:
+        lowest = min(top, key=top.get)
+        top[post_id] = log_add(top.pop(lowest), score)
+
+
+def record_activity(activity, now=None):
+    # activity: (post id, group id, weight) triples. Every affected top-K
+    # is read and written once in the shared cache. The read and write are
+    # not atomic across workers; an occasional lost update only makes a
+    # score slightly lower.
+    if not settings.TRENDING_ENABLED or not activity:
+        return
+    keys = {trending_key()}
+    keys.update(trending_key(group_id) for _, group_id, _ in activity
+                if group_id is not None)
+    tops = cache.get_many(list(keys))
+    for post_id, group_id, weight in activity:
+        score = log_weight(weight, now)
+        for key in {trending_key(), trending_key(group_id)}:
+            add_score(tops.setdefault(key, {}), post_id, score,
+                      settings.TRENDING_CAPACITY)
+    cache.set_many(tops, None)
+
+
+def forget_posts(posts):
+    # posts: (post id, group id) pairs of posts that left the feeds; they
+    # give their top-K slots back.
+    keys = {trending_key()}
+    keys.update(trending_key(group_id) for _, group_id in posts
+                if group_id is not None)
+    ids = {post_id for post_id, _ in posts}
+    changed = {}
+    for key, top in cache.get_many(list(keys)).items():
+        kept = {post_id: score for post_id, score in top.items()
+                if post_id not in ids}
+        if len(kept) != len(top):
+            changed[key] = kept
+    cache.set_many(changed, None)
+
+
+def record_comment(post_id, group_id):
+    record_activity([(post_id, group_id, settings.TRENDING_COMMENT_WEIGHT)])
+
+
+def record_views(views):
+    # views: (post id, group id, number of views) triples.
+    record_activity([
+        (post_id, group_id, count * settings.TRENDING_VIEW_WEIGHT)
+        for post_id, group_id, count in views
+    ])
+
+
+def trending_ids(group_id=None, limit=None):
+    top = cache.get(trending_key(group_id)) or {}
+    limit = limit or settings.TRENDING_SIZE
+    return sorted(top, key=top.get, reverse=True)[:limit]
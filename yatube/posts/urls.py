@@ -1,23 +1,78 @@
 from django.contrib.auth import views
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'posts'
 
 urlpatterns = [
+    path('group/', views.group_index, name='group_index'),
     path('group/<slug:slug>/', views.group_posts, name='group_list'),
     path('', views.index, name='index'),
+    path('trending/', views.trending, name='trending'),
+    path(
+        'group/<slug:slug>/trending/',
+        views.group_trending,
+        name='group_trending'
+    ),
     path('profile/<str:username>/', views.profile, name='profile'),
     path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
     path('create/', views.post_create, name='post_create'),
     path('posts/<int:post_id>/edit/', views.post_edit, name='post_edit'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.post_comments,
+        name='post_comments'
+    ),
     path(
         'posts/<int:post_id>/comment/',
         views.add_comment,
         name='add_comment'
     ),
     path('follow/', views.follow_index, name='follow_index'),
+    path('export/<str:name>/', views.export_data, name='export_data'),
+    path(
+        'feed/',
+        feeds.cached_feed(feeds.PostsFeed(), 'feed:index'),
+        name='feed'
+    ),
+    path(
+        'feed/atom/',
+        feeds.cached_feed(feeds.AtomPostsFeed(), 'feed:index'),
+        name='feed_atom'
+    ),
+    path(
+        'group/<slug:slug>/feed/',
+        feeds.cached_feed(feeds.GroupFeed(), feeds.GROUP_SCOPE),
+        name='group_feed'
+    ),
+    path(
+        'group/<slug:slug>/feed/atom/',
+        feeds.cached_feed(feeds.AtomGroupFeed(), feeds.GROUP_SCOPE),
+        name='group_feed_atom'
+    ),
+    path(
+        'profile/<str:username>/feed/',
+        feeds.cached_feed(feeds.AuthorFeed(), feeds.AUTHOR_SCOPE),
+        name='profile_feed'
+    ),
+    path(
+        'profile/<str:username>/feed/atom/',
+        feeds.cached_feed(feeds.AtomAuthorFeed(), feeds.AUTHOR_SCOPE),
+        name='profile_feed_atom'
+    ),
+    path('sitemap.xml', views.sitemap, name='sitemap'),
+    path('sitemaps/<str:name>', views.sitemap, name='sitemap_file'),
+    path('api/posts/', api.index, name='api_index'),
+    path('api/posts/<int:post_id>/', api.post_detail, name='api_post_detail'),
+    path(
+        'api/posts/<int:post_id>/comments/',
+        api.post_comments,
+        name='api_post_comments'
+    ),
+    path('api/group/<slug:slug>/', api.group_posts, name='api_group_list'),
+    path('api/profile/<str:username>/', api.profile, name='api_profile'),
+    path('api/follow/', api.follow_index, name='api_follow_index'),
     path(
         'profile/<str:username>/follow/',
         views.profile_follow,
@@ -1,23 +1,102 @@
+from core.ratelimit import ratelimit
 from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.http import (Http404, HttpResponse, JsonResponse,
+                         StreamingHttpResponse)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
+from django.utils import timezone
 
-from .forms import CommentForm, PostForm
+from .archive import get_post_or_archived
+from .counters import view_counter
+from .forms import CommentForm, PostForm, PublishingForm
 from .models import Follow, Group, Post, User
+from .pagination import (CachedCountPaginator, ChainedSequence,
+                         KeysetPaginator)
+from .publishing import notify_new_post
+from .sitemaps import PUBLIC_NAME
+from .tasks import generate_thumbnails, notify_post_author
+from .trending import record_comment, trending_ids
 
 
-def get_page_context(request, posts):
-    paginator = Paginator(posts, settings.ITEMS_PER_PAGE)
+def get_page_context(request, posts, estimate=None):
+    paginator = CachedCountPaginator(
+        posts, settings.ITEMS_PER_PAGE, estimate=estimate
+    )
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     return page_obj
 
 
+def get_comments_page(request, post):
+    comments = post.comments.select_related('author')
+    paginator = KeysetPaginator(
+        comments, ('-created', '-id'), settings.COMMENTS_PER_PAGE
+    )
+    return paginator.get_page(request.GET.get('cursor'))
+
+
+def schedule_thumbnails(post):
+    if post.image:
+        generate_thumbnails.enqueue(
+            args=[post.id],
+            idempotency_key=f'thumbnails:{post.id}:{post.image.name}',
+        )
+
+
+# Feeds show Post.excerpt; the full text is loaded only on the post page.
+FEED_DEFERRED = ('text', 'text_html')
+
+
+def index_posts():
+    return Post.objects.published().select_related('group', 'author').defer(
+        *FEED_DEFERRED
+    )
+
+
+def group_posts_for(group):
+    return group.posts.published().select_related('group', 'author').defer(
+        *FEED_DEFERRED
+    )
+
+
+def profile_posts_for(user):
+    return (
+        user.posts.published().select_related('group', 'author').defer(
+            *FEED_DEFERRED
+        ),
+        user.archived_posts.select_related('group', 'author').defer(
+            *FEED_DEFERRED
+        ),
+    )
+
+
+def follow_posts_for(user):
+    return Post.objects.published().select_related('author').filter(
+        author__following__user=user).defer(*FEED_DEFERRED)
+
+
+def trending_posts_for(group=None):
+    # The ranking is one cache read; the posts are then loaded by id.
+    # Deleted or archived posts and posts moved to another group drop out.
+    ids = trending_ids(group.id if group is not None else None)
+    posts = Post.objects.published().select_related(
+        'group', 'author'
+    ).defer(*FEED_DEFERRED).in_bulk(ids)
+    return [
+        posts[post_id] for post_id in ids
+        if post_id in posts
+        and (group is None or posts[post_id].group_id == group.id)
+    ]
+
+
 def index(request):
-    posts = Post.objects.select_related('group', 'author').all()
+    posts = index_posts()
     context = {
-        'page_obj': get_page_context(request, posts),
+        'page_obj': get_page_context(
+            request, posts, estimate=Post.objects.estimate_published
+        ),
     }
     template = 'posts/index.html'
     return render(request, template, context)
@@ -25,7 +104,7 @@ def index(request):
 
 def group_posts(request, slug):
     group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.all().select_related('group', 'author')
+    posts = group_posts_for(group)
     context = {
         'group': group,
         'title': group.title,
@@ -35,19 +114,53 @@ def group_posts(request, slug):
     return render(request, template, context)
 
 
+def trending(request):
+    context = {
+        'posts': trending_posts_for(),
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+def group_trending(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    context = {
+        'group': group,
+        'posts': trending_posts_for(group),
+    }
+    return render(request, 'posts/trending.html', context)
+
+
+def group_index(request):
+    # Counts come from GroupStats in the same query as the groups; groups
+    # without stats yet show no numbers.
+    groups = Group.objects.select_related('stats').order_by('title', 'id')
+    context = {
+        'page_obj': get_page_context(request, groups),
+    }
+    return render(request, 'posts/group_index.html', context)
+
+
 def profile(request, username):
     user_profile = get_object_or_404(User, username=username)
-    posts = user_profile.posts.all().select_related('group', 'author')
-    count_posts = posts.count()
+    # Archived posts are all older than the hot ones, so the profile feed
+    # simply continues into the archive after the last hot post.
+    posts = ChainedSequence(*profile_posts_for(user_profile))
+    page_obj = get_page_context(request, posts)
     following = request.user.is_authenticated and Follow.objects.filter(
         user=request.user,
         author=user_profile,
     ).exists()
+    drafts = None
+    if request.user == user_profile:
+        drafts = user_profile.posts.exclude(status=Post.PUBLISHED).only(
+            'id', 'excerpt', 'status', 'publish_at'
+        )
     context = {
         'user_profile': user_profile,
-        'page_obj': get_page_context(request, posts),
-        'count_posts': count_posts,
-        'following': following
+        'page_obj': page_obj,
+        'count_posts': page_obj.paginator.count,
+        'following': following,
+        'drafts': drafts,
     }
     template = 'posts/profile.html'
 
@@ -55,30 +168,78 @@ def profile(request, username):
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+    post = get_post_or_archived(post_id, viewer=request.user)
+    # The loaded count plus the views that were pending when it was read,
+    # even if this view flushed them in the meantime.
+    pending = 0 if post.is_archived else view_counter.incr(post.id)
     user_profile = post.author
     form = CommentForm()
-    comments = post.comments.all().select_related('post', 'author')
+    comments_page = get_comments_page(request, post)
     context = {
         'post': post,
         'user_profile': user_profile,
         'form': form,
-        'comments': comments,
+        'comments': comments_page.object_list,
+        'comments_page': comments_page,
+        'view_count': post.view_count + pending,
     }
     template = 'posts/post_detail.html'
     return render(request, template, context)
 
 
+def post_comments(request, post_id):
+    post = get_post_or_archived(
+        post_id, fields=('id', 'comment_count'), related=(),
+        viewer=request.user,
+    )
+    comments_page = get_comments_page(request, post)
+    html = render_to_string(
+        'posts/includes/view_comments.html',
+        {
+            'post': post,
+            'comments': comments_page.object_list,
+            'comments_page': comments_page,
+        },
+        request,
+    )
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'html': html,
+            'next_cursor': comments_page.next_cursor,
+            'count': post.comment_count,
+        })
+    return HttpResponse(html)
+
+
+def save_post(post, was_published):
+    # A draft or scheduled post published by hand counts as new: it moves
+    # to the top of the feeds and followers are notified.
+    newly_published = post.is_published and not was_published
+    if newly_published and post.pk is not None:
+        post.pub_date = timezone.now()
+    post.save()
+    schedule_thumbnails(post)
+    if newly_published:
+        notify_new_post(post)
+
+
 @login_required
+@ratelimit('post_create')
 def post_create(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
+    publishing_form = PublishingForm(
+        request.POST or None, instance=form.instance
+    )
 
-    if not form.is_valid():
-        return render(request, 'posts/create_post.html', {'form': form})
+    if not (form.is_valid() and publishing_form.is_valid()):
+        return render(request, 'posts/create_post.html', {
+            'form': form,
+            'publishing_form': publishing_form,
+        })
 
     post = form.save(commit=False)
     post.author = request.user
-    post.save()
+    save_post(post, was_published=False)
     return redirect('posts:profile', username=request.user.username)
 
 
@@ -89,38 +250,49 @@ def post_edit(request, post_id):
     if changing_post.author != request.user:
         return redirect('posts:post_detail', post_id=post_id)
 
+    was_published = changing_post.is_published
     form = PostForm(
         request.POST or None,
         files=request.FILES or None,
         instance=changing_post
     )
+    publishing_form = PublishingForm(
+        request.POST or None, instance=changing_post
+    )
 
-    if form.is_valid():
-        form.save()
+    if form.is_valid() and publishing_form.is_valid():
+        save_post(form.save(commit=False), was_published)
         return redirect('posts:post_detail', post_id=post_id)
     context = {
         'form': form,
+        'publishing_form': publishing_form,
         'is_edit': True,
     }
     return render(request, 'posts/create_post.html', context)
 
 
 @login_required
+@ratelimit('add_comment')
 def add_comment(request, post_id):
     form = CommentForm(request.POST or None)
-    if form.is_valid():
+    # Archived posts are read-only.
+    post = Post.objects.published().filter(id=post_id).only(
+        'id', 'group'
+    ).first()
+    if form.is_valid() and post is not None:
         comment = form.save(commit=False)
         comment.author = request.user
         comment.post_id = post_id
         comment.save()
+        record_comment(post.id, post.group_id)
+        notify_post_author.enqueue(args=[comment.id])
     return redirect('posts:post_detail', post_id=post_id)
 
 
 @login_required
 def follow_index(request):
     template = 'posts/follow.html'
-    posts = Post.objects.select_related('author').filter(
-        author__following__user=request.user)
+    posts = follow_posts_for(request.user)
     context = {
         'page_obj': get_page_context(request, posts)
     }
@@ -128,6 +300,7 @@ def follow_index(request):
 
 
 @login_required
+@ratelimit('profile_follow', methods=('GET', 'POST'))
 def profile_follow(request, username):
     author = get_object_or_404(User, username=username)
     follower_user = request.user
@@ -142,3 +315,41 @@ def profile_unfollow(request, username):
     follower_user = request.user
     Follow.objects.filter(user=follower_user, author=author).delete()
     return redirect('posts:profile', username=username)
+
+
+def parse_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+@staff_member_required
+def export_data(request, name):
+    # Imported here: only staff downloads need the export machinery.
+    from .exports import CONTENT_TYPES, EXPORTS, export_lines
+
+    fmt = request.GET.get('format', 'ndjson')
+    if name not in EXPORTS or fmt not in CONTENT_TYPES:
+        raise Http404
+    response = StreamingHttpResponse(
+        export_lines(
+            name,
+            fmt,
+            parse_id(request.GET.get('from_id')),
+            parse_id(request.GET.get('to_id')),
+        ),
+        content_type=CONTENT_TYPES[fmt],
+    )
+    response['Content-Disposition'] = f'attachment; filename="{name}.{fmt}"'
+    return response
+
+
+def sitemap(request, name='sitemap.xml'):
+    from django.views.static import serve
+
+    # Files are written by the build_sitemaps command; serve() answers
+    # If-Modified-Since from the file mtime.
+    if not PUBLIC_NAME.fullmatch(name):
+        raise Http404
+    return serve(request, name, document_root=settings.SITEMAP_ROOT)
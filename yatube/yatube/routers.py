@@ -0,0 +1,86 @@
+import random
+import threading
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+PIN_COOKIE = 'pin_primary'
+# DatabaseCache entries; see settings.CACHES.
+CACHE_APP_LABEL = 'django_cache'
+
+_state = threading.local()
+
+
+def pin_to_primary():
+    _state.pinned = True
+
+
+def is_pinned():
+    return getattr(_state, 'pinned', False)
+
+
+def replica_reads_allowed():
+    # Only requests marked by ReplicaPinningMiddleware read replicas.
+    # Commands, the worker and transactions read the primary: replicas
+    # only change when sync_replicas runs.
+    return (
+        getattr(_state, 'in_request', False)
+        and not is_pinned()
+        and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+    )
+
+
+def reset():
+    _state.in_request = False
+    _state.pinned = False
+    _state.wrote = False
+
+
+class PrimaryReplicaRouter:
+    # Request reads go to a random replica from DATABASE_REPLICAS unless
+    # the request has written to the primary, which keeps read-your-writes.
+    # The cache table is always read and written on the primary: replicas
+    # would serve old versions, and cache writes are not request writes.
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        if not settings.DATABASE_REPLICAS or not replica_reads_allowed():
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.DATABASE_REPLICAS)
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label == CACHE_APP_LABEL:
+            return DEFAULT_DB_ALIAS
+        if getattr(_state, 'in_request', False):
+            _state.wrote = True
+            pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaPinningMiddleware:
+    # A request that writes sets a short-lived cookie, so the redirect that
+    # follows (and anything else in REPLICA_PIN_SECONDS) reads the primary.
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reset()
+        _state.in_request = True
+        _state.pinned = PIN_COOKIE in request.COOKIES
+        try:
+            response = self.get_response(request)
+            if _state.wrote and settings.DATABASE_REPLICAS:
+                response.set_cookie(
+                    PIN_COOKIE, '1',
+                    max_age=settings.REPLICA_PIN_SECONDS,
+                    httponly=True,
+                )
+            return response
+        finally:
+            reset()
@@ -0,0 +1,11 @@
+# DJANGO_SETTINGS_MODULE stays "yatube.settings"; YATUBE_ENV picks the
+# environment module on top of base: "dev" (default), "prod" or "test".
+import os
+
+_env = os.environ.get('YATUBE_ENV', 'dev')
+if _env == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif _env == 'test':
+    from .test import *  # noqa: F401,F403
+else:
+    from .dev import *  # noqa: F401,F403
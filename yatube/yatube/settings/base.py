@@ -0,0 +1,307 @@
+"""
+Django settings for yatube project shared by every environment.
+
+Generated by 'django-admin startproject' using Django 2.2.19.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/2.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/2.2/ref/settings/
+"""
+
+import os
+
+# Build paths inside the project like this: os.path.join(BASE_DIR, ...)
+BASE_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/2.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = 'dbwmeq6=ke@0x^_s(w9b4e(rqb#&jj=d=m$ch*$(8y7mu1mv4j'
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = False
+
+ALLOWED_HOSTS = [
+    'localhost',
+    '127.0.0.1',
+    '[::1]',
+    'testserver',
+]
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'posts.apps.PostsConfig',
+    'users.apps.UsersConfig',
+    'core.apps.CoreConfig',
+    'about',
+    # Admin modules are discovered by yatube.urls, so commands and workers
+    # that never load the URLconf do not import them.
+    'django.contrib.admin.apps.SimpleAdminConfig',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'sorl.thumbnail',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    'core.querylog.QueryLogMiddleware',
+    'yatube.routers.ReplicaPinningMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.profiling.SamplingProfilerMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'yatube.urls'
+
+TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [TEMPLATES_DIR],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+                'core.context_processors.year.year',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'yatube.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/2.2/ref/settings/#databases
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 60,
+        'OPTIONS': {
+            'timeout': 20,
+        },
+    }
+}
+
+# Read replicas are aliases from DATABASES. YATUBE_SQLITE_REPLICAS=N adds
+# N local copies of the SQLite file (refresh them with sync_replicas).
+DATABASE_REPLICAS = []
+for number in range(1, int(os.environ.get('YATUBE_SQLITE_REPLICAS', 0)) + 1):
+    alias = f'replica{number}'
+    DATABASES[alias] = dict(
+        DATABASES['default'],
+        NAME=os.path.join(BASE_DIR, f'db.{alias}.sqlite3'),
+        TEST={'MIRROR': 'default'},
+    )
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ['yatube.routers.PrimaryReplicaRouter']
+REPLICA_PIN_SECONDS = 10
+
+# Applied to every new SQLite connection by core.db.configure_sqlite.
+# WAL lets readers run alongside the single writer.
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'temp_store': 'MEMORY',
+}
+
+
+# Password validation
+# https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/2.2/topics/i18n/
+
+LANGUAGE_CODE = 'ru'
+
+TIME_ZONE = 'UTC'
+
+USE_I18N = True
+
+USE_L10N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/2.2/howto/static-files/
+
+STATIC_URL = '/static/'
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+STATICFILES_DIRS = [os.path.join(BASE_DIR, "static")]
+# Serve STATIC_ROOT from the WSGI application when there is no proxy.
+SERVE_STATIC = False
+
+LOGIN_URL = 'users:login'
+LOGIN_REDIRECT_URL = 'posts:index'
+# LOGOUT_REDIRECT_URL = 'posts:index'
+
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_DELIVERY_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+EMAIL_BATCH_SIZE = 100
+EMAIL_BATCH_WINDOW = 5
+EMAIL_MAX_ATTEMPTS = 5
+# The worker reschedules delivery of messages left in the outbox this
+# often, in case the task of their batch window gave up.
+EMAIL_SWEEP_INTERVAL = 5 * 60
+
+CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+
+# Web workers, the worker command and cron commands (publish_scheduled,
+# archive_posts, import_posts) are separate processes; cache versions,
+# trending rankings, rate-limit buckets and the profiler sample rate must
+# be seen by all of them, so the cache lives in the database. The table is
+# created by the core migrations.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'yatube_cache',
+        'OPTIONS': {
+            'MAX_ENTRIES': 100000,
+        },
+    }
+}
+
+ITEMS_PER_PAGE = 10
+# Feeds show this many characters of a post, stored as Post.excerpt.
+POST_EXCERPT_LENGTH = 300
+# Feed counts are cached; whole-table counts above the threshold come
+# from the database statistics (ANALYZE) instead of COUNT(*).
+COUNT_CACHE_TIMEOUT = 60 * 60
+COUNT_ESTIMATE_THRESHOLD = 100000
+
+COMMENTS_PER_PAGE = 20
+
+FEED_ITEMS = 20
+# Upper bound only: feeds are invalidated by post changes.
+FEED_CACHE_TIMEOUT = 60 * 60
+
+API_PAGE_SIZE = 20
+API_MAX_PAGE_SIZE = 100
+
+VIEW_COUNT_FLUSH_INTERVAL = 30
+VIEW_COUNT_FLUSH_THRESHOLD = 500
+
+TASKS_ALWAYS_EAGER = False
+TASKS_MAX_ATTEMPTS = 5
+TASKS_RETRY_BACKOFF = 10
+TASKS_RETRY_BACKOFF_MAX = 3600
+TASKS_LOCK_TIMEOUT = 300
+
+# Posts older than this are moved to the archive tables by archive_posts.
+ARCHIVE_AFTER_DAYS = 365
+ARCHIVE_BATCH_SIZE = 500
+
+# Absolute URLs in sitemaps are built from this address.
+SITE_URL = 'http://localhost:8000'
+SITEMAP_ROOT = os.path.join(BASE_DIR, 'sitemaps')
+# The protocol allows up to 50 000 URLs per file.
+SITEMAP_SHARD_SIZE = 10000
+
+# Token buckets for write endpoints: "<requests>/<s|m|h|d>" per user, or
+# per client address for anonymous requests. The "cache" backend keeps the
+# buckets in the default cache, which all processes share (see CACHES);
+# with a per-process cache, or with "local", every worker has buckets of
+# its own and the effective limit is the rate times the worker count.
+RATELIMIT_ENABLED = True
+RATELIMIT_BACKEND = 'cache'
+# Only behind a proxy that sets X-Forwarded-For itself.
+RATELIMIT_TRUST_FORWARDED_FOR = False
+RATE_LIMITS = {
+    'post_create': '10/m',
+    'add_comment': '20/m',
+    'profile_follow': '30/m',
+    'signup': '5/h',
+}
+
+# yatube.wsgi imports the apps, compiles templates, resolves URLs and
+# requests these pages once before the worker accepts traffic.
+WARMUP_ON_START = True
+WARMUP_URLS = ['/', '/feed/', '/api/posts/']
+
+# Sampling profiler: staff requests with an X-Profile header and a random
+# share of all requests are sampled every PROFILING_INTERVAL seconds;
+# stacks are collected per URL name in PROFILING_ROOT as collapsed-stack
+# files for flame graphs. The share can be changed at /profiling/ without
+# a restart: it is kept in the shared cache, and every worker picks it up
+# within core.profiling.RATE_REFRESH seconds.
+PROFILING_ENABLED = True
+PROFILING_SAMPLE_RATE = 0
+PROFILING_INTERVAL = 0.005
+PROFILING_ROOT = os.path.join(BASE_DIR, 'profiles')
+
+# Query timings are aggregated per SQL fingerprint and URL name and added
+# to the QueryStat table every QUERYLOG_FLUSH_INTERVAL seconds or
+# QUERYLOG_FLUSH_THRESHOLD queries; see the query_report command. Queries
+# slower than QUERYLOG_SLOW_MS are logged with their plan.
+QUERYLOG_ENABLED = True
+QUERYLOG_SLOW_MS = 100
+QUERYLOG_FLUSH_INTERVAL = 60
+QUERYLOG_FLUSH_THRESHOLD = 1000
+
+# Trending posts: comments and views add weight to a post's score, which
+# halves every TRENDING_HALF_LIFE seconds. The top TRENDING_CAPACITY posts
+# overall and per group are kept in the cache; pages show TRENDING_SIZE.
+# Every worker adds the views and comments it handles to the same top-K,
+# so the cache must be shared by all processes (see CACHES); a per-process
+# cache would give every worker its own ranking, lost on restart.
+TRENDING_ENABLED = True
+TRENDING_HALF_LIFE = 6 * 60 * 60
+TRENDING_SIZE = 20
+TRENDING_CAPACITY = 100
+TRENDING_COMMENT_WEIGHT = 5
+TRENDING_VIEW_WEIGHT = 1
+
+# Scheduled posts are published by the publish_scheduled command, which
+# with --loop checks for due posts every PUBLISH_INTERVAL seconds.
+PUBLISH_BATCH_SIZE = 500
+PUBLISH_INTERVAL = 30
+
+# The group directory reads post counts, the last post date and the
+# GROUP_TOP_AUTHORS most active authors from GroupStats rows. Post changes
+# keep the counts and dates current; the refresh_group_stats command
+# rebuilds everything, top authors included.
+GROUP_TOP_AUTHORS = 3
@@ -0,0 +1,18 @@
+from importlib.util import find_spec
+
+from .base import *  # noqa: F401,F403
+from .base import INSTALLED_APPS, MIDDLEWARE
+
+DEBUG = True
+
+# The toolbar is a development dependency only; without it installed the
+# dev settings still work.
+if find_spec('debug_toolbar') is not None:
+    INSTALLED_APPS = INSTALLED_APPS + ['debug_toolbar']
+    MIDDLEWARE = MIDDLEWARE + [
+        'debug_toolbar.middleware.DebugToolbarMiddleware',
+    ]
+
+INTERNAL_IPS = [
+    '127.0.0.1',
+]
@@ -0,0 +1,19 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .base import *  # noqa: F401,F403
+from .base import ALLOWED_HOSTS
+
+DEBUG = False
+
+# The key in base.py is public; production must not start with it.
+try:
+    SECRET_KEY = os.environ['YATUBE_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set the YATUBE_SECRET_KEY variable.')
+ALLOWED_HOSTS = os.environ.get(
+    'YATUBE_ALLOWED_HOSTS', ','.join(ALLOWED_HOSTS)
+).split(',')
+
+STATICFILES_STORAGE = 'core.staticfiles.CompressedManifestStaticFilesStorage'
@@ -0,0 +1,52 @@
+import atexit
+import os
+import shutil
+import tempfile
+from importlib.util import find_spec
+
+from .base import *  # noqa: F401,F403
+from .base import DATABASES
+
+# Test databases are in-memory SQLite; no test uses serialized_rollback, so
+# the initial data is not serialized either.
+DATABASES = {
+    alias: dict(database, TEST=dict(database.get('TEST', {}), SERIALIZE=False))
+    for alias, database in DATABASES.items()
+}
+
+# Uploaded images go to a directory of their own, removed after the run,
+# instead of the project's media folder.
+MEDIA_ROOT = tempfile.mkdtemp(prefix='yatube-test-media-')
+atexit.register(shutil.rmtree, MEDIA_ROOT, True)
+
+# Every test process has a cache of its own, so cache.clear() in one test
+# does not reach tests running in parallel, and query counts stay free of
+# cache queries.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+# Views are written at once inside the test transaction, so nothing is
+# left for the flush at exit to write into the development database.
+VIEW_COUNT_FLUSH_THRESHOLD = 1
+
+WARMUP_ON_START = False
+PROFILING_ENABLED = False
+QUERYLOG_ENABLED = False
+
+# Errors that tests provoke on purpose are not printed.
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'null': {'class': 'logging.NullHandler'}},
+    'root': {'handlers': ['null']},
+}
+
+TEST_RUNNER = 'core.testing.SnapshotTestRunner'
+# Failures in worker processes can only be reported with tblib installed.
+TEST_PARALLEL = os.cpu_count() if find_spec('tblib') is not None else 1
+TEST_SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), 'yatube-test-snapshots')
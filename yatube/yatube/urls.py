@@ -3,11 +3,14 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+admin.autodiscover()
+
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('auth/', include('users.urls', namespace='users')),
     path('auth/', include('django.contrib.auth.urls')),
     path('about/', include('about.urls', namespace='about')),
+    path('profiling/', include('core.urls', namespace='core')),
     path('', include('posts.urls', namespace='posts')),
 ]
 
@@ -16,8 +19,11 @@ handler403 = 'core.views.csrf_failure'
 handler500 = 'core.views.server_error'
 
 if settings.DEBUG:
-    import debug_toolbar
     urlpatterns += static(
         settings.MEDIA_URL, document_root=settings.MEDIA_ROOT
     )
+
+if 'debug_toolbar' in settings.INSTALLED_APPS:
+    import debug_toolbar
+
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
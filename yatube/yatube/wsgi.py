@@ -7,10 +7,29 @@ For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
 """
 
+import logging
 import os
 
+from django.conf import settings
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
 
+logger = logging.getLogger(__name__)
+
 application = get_wsgi_application()
+
+if settings.WARMUP_ON_START:
+    from core.warmup import warm_up
+
+    # Runs before the server hands the application any request. A failed
+    # warm-up only makes the first requests slower, so the worker boots.
+    try:
+        warm_up(application)
+    except Exception:
+        logger.exception('Warm-up failed')
+
+if settings.SERVE_STATIC:
+    from core.staticfiles import StaticFilesApplication
+
+    application = StaticFilesApplication(application)